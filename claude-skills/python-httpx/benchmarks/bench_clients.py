@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Client benchmark for HttpxSkill: sync vs async, HTTP/1.1 vs HTTP/2, pool sizes, payload sizes.
+
+A stand-in server runs in a subprocess (so CPU per request is the client's alone) with a fixed
+simulated latency; the response size is chosen per request with ``?size=N``. Servers:
+
+- builtin:   asyncio HTTP/1.1 keep-alive server, no dependencies (default)
+- uvicorn:   the same behaviour as an ASGI app under uvicorn (``pip install uvicorn``)
+- hypercorn: ASGI app under hypercorn, which also speaks cleartext HTTP/2 (``pip install hypercorn``)
+
+HTTP/2 cases use prior-knowledge h2c and need ``h2`` (``pip install httpx[http2]``) and the
+hypercorn server; otherwise they are reported as skipped. Every case reports requests/s,
+latency percentiles, CPU ms per request and the HTTP versions actually negotiated.
+
+Usage (from the skill root):
+    python -m benchmarks.bench_clients
+    python -m benchmarks.bench_clients --clients sync,async --pools 10,100 --payloads 1024,262144 --json
+    python -m benchmarks.bench_clients --server hypercorn --http 1.1,2 --output report.json
+    python -m benchmarks.bench_clients --url http://127.0.0.1:8000/  # an already running server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+from scripts.httpx_skill import HttpxSkill
+
+
+# ---------- stand-in server ----------
+def _size(query: str, default: int) -> int:
+    values = parse_qs(query).get("size")
+    return int(values[0]) if values and values[0].isdigit() else default
+
+
+async def _serve_builtin(host: str, port: int, latency_s: float, default_size: int) -> None:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.split(b"\r\n")
+                target = lines[0].split(b" ")[1].decode()
+                length = 0
+                for line in lines[1:]:
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                if length:
+                    await reader.readexactly(length)
+                if latency_s:
+                    await asyncio.sleep(latency_s)
+                size = _size(urlsplit(target).query, default_size)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\n"
+                    + f"Content-Length: {size}\r\n\r\n".encode()
+                    + b"x" * size
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port, backlog=2048)
+    async with server:
+        await server.serve_forever()
+
+
+def make_app(latency_s: float, default_size: int):
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        more = True
+        while more:
+            more = (await receive()).get("more_body", False)
+        if latency_s:
+            await asyncio.sleep(latency_s)
+        size = _size(scope.get("query_string", b"").decode(), default_size)
+        headers = [(b"content-type", b"application/octet-stream"), (b"content-length", str(size).encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"x" * size})
+
+    return app
+
+
+def serve(kind: str, host: str, port: int, latency_s: float, default_size: int) -> None:
+    if kind == "builtin":
+        asyncio.run(_serve_builtin(host, port, latency_s, default_size))
+    elif kind == "uvicorn":
+        import uvicorn
+
+        uvicorn.run(make_app(latency_s, default_size), host=host, port=port, log_level="warning", lifespan="off")
+    elif kind == "hypercorn":
+        from hypercorn.asyncio import serve as hypercorn_serve
+        from hypercorn.config import Config
+
+        config = Config()
+        config.bind = [f"{host}:{port}"]
+        config.loglevel = "WARNING"
+        asyncio.run(hypercorn_serve(make_app(latency_s, default_size), config))
+    else:
+        raise ValueError(f"Unknown server: {kind}")
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    host = "127.0.0.1"
+    port = _free_port(host)
+    cmd = [
+        sys.executable, "-m", "benchmarks.bench_clients", "--serve", args.server,
+        "--port", str(port), "--latency-ms", str(args.latency_ms), "--payloads", str(args.payloads[0]),
+    ]  # fmt: skip
+    proc = subprocess.Popen(cmd, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{args.server} server exited with {proc.returncode}")
+        try:
+            socket.create_connection((host, port), timeout=0.2).close()
+            return proc, f"http://{host}:{port}/"
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"{args.server} server did not start")
+
+
+# ---------- client runs ----------
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _skill(client: str, http: str, pool: int) -> HttpxSkill:
+    limits = httpx.Limits(max_connections=pool, max_keepalive_connections=pool)
+    if http == "2":
+        # Prior-knowledge HTTP/2 over cleartext (h2c); plain http:// URLs would otherwise stay on HTTP/1.1
+        transport_cls = httpx.AsyncHTTPTransport if client == "async" else httpx.HTTPTransport
+        transport = transport_cls(http1=False, http2=True, limits=limits)
+        return HttpxSkill(async_mode=client == "async", limits=limits, transport=transport)
+    return HttpxSkill(async_mode=client == "async", limits=limits)
+
+
+def _run_sync(url: str, http: str, pool: int, total: int, concurrency: int, warmup: int) -> Tuple[List[float], int, Dict[str, int]]:
+    skill = _skill("sync", http, pool)
+    latencies: List[float] = []
+    versions: Dict[str, int] = {}
+    errors = 0
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def worker() -> None:
+        nonlocal errors
+        for _ in counter:  # shared iterator: workers pull until all requests are sent
+            start = time.perf_counter()
+            try:
+                resp = skill.get(url)
+                resp.raise_for_status()
+                version = resp.http_version
+            except httpx.HTTPError:
+                with lock:
+                    errors += 1
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                versions[version] = versions.get(version, 0) + 1
+
+    try:
+        for _ in range(warmup):
+            skill.get(url)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool_:
+            for fut in [pool_.submit(worker) for _ in range(concurrency)]:
+                fut.result()
+    finally:
+        skill.close()
+    return latencies, errors, versions
+
+
+async def _run_async(url: str, http: str, pool: int, total: int, concurrency: int, warmup: int) -> Tuple[List[float], int, Dict[str, int]]:
+    skill = _skill("async", http, pool)
+    latencies: List[float] = []
+    versions: Dict[str, int] = {}
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in counter:
+            start = time.perf_counter()
+            try:
+                resp = await skill.aget(url)
+                resp.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            versions[resp.http_version] = versions.get(resp.http_version, 0) + 1
+
+    try:
+        for _ in range(warmup):
+            await skill.aget(url)
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        await skill.aclose()
+    return latencies, errors, versions
+
+
+def _skip_reason(http: str, args: argparse.Namespace) -> Optional[str]:
+    if http != "2":
+        return None
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return "HTTP/2 needs the h2 package (pip install httpx[http2])"
+    if not args.url and args.server != "hypercorn":
+        return f"the {args.server} server does not speak HTTP/2; use --server hypercorn"
+    return None
+
+
+def run_case(base_url: str, client: str, http: str, pool: int, payload: int, args: argparse.Namespace) -> Dict[str, object]:
+    case: Dict[str, object] = {"client": client, "http": http, "pool": pool, "payload_bytes": payload}
+    reason = _skip_reason(http, args)
+    if reason:
+        return {**case, "status": "skipped", "reason": reason}
+    url = f"{base_url}?size={payload}"
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    if client == "sync":
+        latencies, errors, versions = _run_sync(url, http, pool, args.requests, args.concurrency, args.warmup)
+    else:
+        latencies, errors, versions = asyncio.run(_run_async(url, http, pool, args.requests, args.concurrency, args.warmup))
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    latencies.sort()
+    ms = [v * 1000.0 for v in latencies]
+    return {
+        **case,
+        "status": "ok",
+        "requests": args.requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ms) / len(ms), 3) if ms else 0.0,
+            "p50": round(_percentile(ms, 50), 3),
+            "p90": round(_percentile(ms, 90), 3),
+            "p99": round(_percentile(ms, 99), 3),
+            "max": round(ms[-1], 3) if ms else 0.0,
+        },
+        # Includes warm-up requests; small next to ``requests`` by default
+        "cpu_ms_per_request": round(cpu / max(1, args.requests + args.warmup) * 1000.0, 3),
+        "http_versions": versions,
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    proc: Optional[subprocess.Popen] = None
+    base_url = args.url
+    if not base_url:
+        proc, base_url = start_server(args)
+    try:
+        rows = [
+            run_case(base_url, client, http, pool, payload, args)
+            for payload in args.payloads
+            for http in args.http
+            for client in args.clients
+            for pool in args.pools
+        ]
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "httpx": httpx.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {
+            "server": "external" if args.url else args.server,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+        },
+        "results": rows,
+    }
+
+
+def _print_report(report: Dict[str, object]) -> None:
+    config = report["config"]
+    print(
+        f"{config['requests']} requests per case, concurrency {config['concurrency']}, "
+        f"{config['latency_ms']} ms server latency, server={config['server']}"
+    )
+    for row in report["results"]:
+        label = f"  {row['client']:<5} HTTP/{row['http']:<3} pool {row['pool']:<4} {row['payload_bytes']:>8} B"
+        if row["status"] != "ok":
+            print(f"{label}  skipped: {row['reason']}")
+            continue
+        lat = row["latency_ms"]
+        print(
+            f"{label}  {row['requests_per_s']:>9.1f} req/s  p50 {lat['p50']:.2f}  p90 {lat['p90']:.2f}  "
+            f"p99 {lat['p99']:.2f} ms  cpu {row['cpu_ms_per_request']:.3f} ms/req  errors {row['errors']}"
+        )
+
+
+def _csv(cast):
+    return lambda v: [cast(x.strip()) for x in v.split(",") if x.strip()]
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark HttpxSkill client configurations against a local stand-in server.")
+    parser.add_argument("--clients", type=_csv(str), default=["sync", "async"], help="Comma-separated: sync,async")
+    parser.add_argument("--http", type=_csv(str), default=["1.1", "2"], help="Comma-separated: 1.1,2")
+    parser.add_argument("--pools", type=_csv(int), default=[10, 100], help="Comma-separated max_connections values")
+    parser.add_argument("--payloads", type=_csv(int), default=[1024], help="Comma-separated response sizes in bytes")
+    parser.add_argument("--requests", type=int, default=2000, help="Measured requests per case")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=50, help="Worker threads (sync) or tasks (async)")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Simulated server latency per request")
+    parser.add_argument("--server", choices=["builtin", "uvicorn", "hypercorn"], default="builtin")
+    parser.add_argument("--url", default="", help="Base URL of a running server (skips starting one)")
+    parser.add_argument("--json", action="store_true", help="Print a machine-readable report")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--serve", choices=["builtin", "uvicorn", "hypercorn"], help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = _parse_args(argv)
+    if args.serve:
+        serve(args.serve, "127.0.0.1", args.port, args.latency_ms / 1000.0, args.payloads[0])
+        return 0
+    report = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Fan-out benchmark for HttpxSkill.amap / afetch_many.
+
+Compares three ways of fetching N URLs against a local ASGI stand-in server (served
+in-process through httpx.ASGITransport, so no network or extra dependencies):
+
+- sequential: ``await skill.aget(url)`` in a loop
+- gather:     ``asyncio.gather`` over every URL at once (unbounded)
+- amap:       ``skill.afetch_many`` with global and per-host limits
+
+Usage (from the skill root):
+    python -m benchmarks.bench_fetch_many
+    python -m benchmarks.bench_fetch_many --count 10000 --latency-ms 20 --concurrency 100 --json
+    python -m benchmarks.bench_fetch_many --url http://127.0.0.1:8000  # a real local server instead
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from scripts.httpx_skill import HttpxSkill
+
+
+def make_app(latency_s: float, payload: bytes):
+    """Minimal ASGI app: sleeps ``latency_s`` then returns ``payload``; tracks peak concurrency."""
+    state = {"active": 0, "peak": 0}
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            await asyncio.sleep(latency_s)
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"application/octet-stream")],
+                }
+            )
+            await send({"type": "http.response.body", "body": payload})
+        finally:
+            state["active"] -= 1
+
+    app.state = state  # type: ignore[attr-defined]
+    return app
+
+
+def _urls(base: str, count: int, hosts: int) -> List[str]:
+    if base:
+        return [f"{base.rstrip('/')}/item/{i}" for i in range(count)]
+    return [f"http://host{i % hosts}.test/item/{i}" for i in range(count)]
+
+
+async def _run_mode(mode: str, args: argparse.Namespace) -> Dict[str, object]:
+    app = make_app(args.latency_ms / 1000.0, b"x" * args.payload)
+    transport: Optional[httpx.AsyncBaseTransport] = None if args.url else httpx.ASGITransport(app=app)
+    skill = HttpxSkill(async_mode=True, transport=transport)
+    urls = _urls(args.url, args.count, args.hosts)
+    failures = 0
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        if mode == "sequential":
+            for url in urls:
+                try:
+                    (await skill.aget(url)).raise_for_status()
+                except httpx.HTTPError:
+                    failures += 1
+        elif mode == "gather":
+            results = await asyncio.gather(*(skill.aget(url) for url in urls), return_exceptions=True)
+            failures = sum(1 for r in results if isinstance(r, BaseException) or r.is_error)
+        else:
+            results = await skill.afetch_many(
+                urls, concurrency=args.concurrency, per_host=args.per_host, raise_for_status=True
+            )
+            failures = sum(1 for r in results if not r.ok)
+    finally:
+        await skill.aclose()
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    return {
+        "mode": mode,
+        "requests": len(urls),
+        "failures": failures,
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(len(urls) / elapsed, 1),
+        "cpu_ms_per_request": round(cpu / len(urls) * 1000.0, 3),
+        "peak_server_concurrency": None if args.url else app.state["peak"],
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    rows = [asyncio.run(_run_mode(mode, args)) for mode in args.modes]
+    return {
+        "count": args.count,
+        "latency_ms": args.latency_ms,
+        "payload_bytes": args.payload,
+        "hosts": args.hosts,
+        "concurrency": args.concurrency,
+        "per_host": args.per_host,
+        "results": rows,
+    }
+
+
+def _print_report(report: Dict[str, object]) -> None:
+    print(
+        f"{report['count']} requests, {report['latency_ms']} ms latency, {report['payload_bytes']} B payload, "
+        f"{report['hosts']} hosts, amap concurrency={report['concurrency']} per_host={report['per_host']}"
+    )
+    for row in report["results"]:
+        print(
+            f"  {row['mode']:<11} {row['seconds']:>8.3f}s  {row['requests_per_s']:>9.1f} req/s  "
+            f"cpu {row['cpu_ms_per_request']:.3f} ms/req  peak {row['peak_server_concurrency']}  "
+            f"failures {row['failures']}"
+        )
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark HttpxSkill fan-out against a local ASGI stand-in.")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Simulated server latency per request")
+    parser.add_argument("--payload", type=int, default=1024, help="Response body size in bytes")
+    parser.add_argument("--hosts", type=int, default=4, help="Number of distinct hostnames to spread URLs over")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--per-host", type=int, default=16)
+    parser.add_argument(
+        "--modes",
+        type=lambda v: [m.strip() for m in v.split(",") if m.strip()],
+        default=["sequential", "gather", "amap"],
+        help="Comma-separated subset of sequential,gather,amap",
+    )
+    parser.add_argument("--url", default="", help="Base URL of a real local server (skips the in-process app)")
+    parser.add_argument("--json", action="store_true", help="Print a machine-readable report")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = _parse_args(argv)
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,252 @@
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import httpx
+
+# A request is a URL (GET), a (method, url) tuple, or a dict of request kwargs with "url" and optional "method"
+RequestLike = Union[str, httpx.URL, Tuple[str, str], Dict[str, Any]]
+
+DEFAULT_PER_HOST = 10
+# In ordered mode, how many results may be held back (waiting for an earlier one) per running request
+_WINDOW_FACTOR = 4
+# Requests read ahead of the input while their host is at its per_host limit
+_MAX_PARKED = 10_000
+
+
+@dataclass
+class RequestSpec:
+    method: str
+    url: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def coerce(cls, item: RequestLike) -> "RequestSpec":
+        if isinstance(item, RequestSpec):
+            return item
+        if isinstance(item, (str, httpx.URL)):
+            return cls("GET", str(item))
+        if isinstance(item, tuple):
+            method, url = item
+            return cls(method.upper(), str(url))
+        if isinstance(item, dict):
+            kwargs = dict(item)
+            url = kwargs.pop("url")
+            return cls(kwargs.pop("method", "GET").upper(), str(url), kwargs)
+        raise TypeError(f"Unsupported request item: {item!r}")
+
+    def host(self, base_url: Optional[httpx.URL] = None) -> str:
+        url = httpx.URL(self.url)
+        if not url.is_absolute_url and base_url is not None:
+            url = base_url.join(url)
+        return url.netloc.decode("ascii")
+
+
+@dataclass
+class FetchResult:
+    index: int
+    request: RequestSpec
+    response: Optional[httpx.Response] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _check(resp: httpx.Response, raise_for_status: bool) -> httpx.Response:
+    if raise_for_status:
+        resp.raise_for_status()
+    return resp
+
+
+class _Dispatcher:
+    """
+    Decides which requests to start: at most ``concurrency`` running overall and ``per_host``
+    per host. A request for a host that is at its limit is parked (it takes no slot), and the
+    input is read further so other hosts keep the overall limit busy; parked requests start
+    as their host frees up. Shared by the async and thread runners.
+    """
+
+    def __init__(
+        self, requests: Iterable[RequestLike], concurrency: int, per_host: int, base_url: Optional[httpx.URL]
+    ) -> None:
+        if concurrency < 1 or per_host < 1:
+            raise ValueError("concurrency and per_host must be >= 1")
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.base_url = base_url
+        self.window = concurrency * _WINDOW_FACTOR
+        self.running = 0
+        self._items = enumerate(requests)
+        self._exhausted = False
+        self._busy: Dict[str, int] = {}
+        self._parked: Dict[str, Deque[Tuple[int, RequestSpec]]] = {}
+        self._parked_count = 0
+
+    def _start(self, index: int, spec: RequestSpec, host: str) -> Tuple[int, RequestSpec, str]:
+        self._busy[host] = self._busy.get(host, 0) + 1
+        self.running += 1
+        return index, spec, host
+
+    def finished(self, host: str) -> None:
+        self.running -= 1
+        self._busy[host] -= 1
+        if not self._busy[host]:
+            del self._busy[host]
+
+    def take(self, held_back: int) -> Tuple[List[Tuple[int, RequestSpec, str]], List[FetchResult]]:
+        """
+        ``(index, spec, host)`` of the requests to start now, and failed results for input
+        items that are not valid requests. ``held_back`` is the number of finished results
+        waiting for an earlier one (ordered mode); it limits how far the input is read.
+        """
+        start: List[Tuple[int, RequestSpec, str]] = []
+        failed: List[FetchResult] = []
+        for host in list(self._parked):
+            queue = self._parked[host]
+            while queue and self.running < self.concurrency and self._busy.get(host, 0) < self.per_host:
+                start.append(self._start(*queue.popleft(), host))
+                self._parked_count -= 1
+            if not queue:
+                del self._parked[host]
+        while (
+            not self._exhausted
+            and self.running < self.concurrency
+            and self.running + held_back < self.window
+            and self._parked_count < _MAX_PARKED
+        ):
+            try:
+                index, item = next(self._items)
+            except StopIteration:
+                self._exhausted = True
+                break
+            try:
+                spec = RequestSpec.coerce(item)
+                host = spec.host(self.base_url)
+            except Exception as exc:  # noqa: BLE001 - reported on the result like a failed request
+                failed.append(FetchResult(index, RequestSpec("", str(item)), error=exc))
+                continue
+            if self._busy.get(host, 0) < self.per_host:
+                start.append(self._start(index, spec, host))
+            else:
+                self._parked.setdefault(host, deque()).append((index, spec))
+                self._parked_count += 1
+        return start, failed
+
+
+class _Reorder:
+    """Releases results as they complete, or in input order when ``ordered``."""
+
+    def __init__(self, ordered: bool) -> None:
+        self.ordered = ordered
+        self.held_back: Dict[int, FetchResult] = {}
+        self._next_index = 0
+
+    def release(self, results: List[FetchResult]) -> List[FetchResult]:
+        if not self.ordered:
+            return results
+        for result in results:
+            self.held_back[result.index] = result
+        out = []
+        while self._next_index in self.held_back:
+            out.append(self.held_back.pop(self._next_index))
+            self._next_index += 1
+        return out
+
+
+# ---------- async ----------
+async def amap_requests(
+    send: Callable[..., Awaitable[httpx.Response]],
+    requests: Iterable[RequestLike],
+    *,
+    concurrency: int,
+    per_host: int = DEFAULT_PER_HOST,
+    ordered: bool = False,
+    raise_for_status: bool = False,
+    base_url: Optional[httpx.URL] = None,
+) -> AsyncIterator[FetchResult]:
+    """
+    Run ``send(method, url, **kwargs)`` for every request with at most ``concurrency`` in
+    flight overall and ``per_host`` per host, yielding results as they complete (or in input
+    order with ``ordered=True``). Errors are returned on the result instead of raised.
+    """
+    dispatcher = _Dispatcher(requests, concurrency, per_host, base_url)
+    reorder = _Reorder(ordered)
+
+    async def run(index: int, spec: RequestSpec) -> FetchResult:
+        result = FetchResult(index, spec)
+        try:
+            result.response = _check(await send(spec.method, spec.url, **spec.kwargs), raise_for_status)
+        except Exception as exc:  # noqa: BLE001 - collected per item, cancellation still propagates
+            result.error = exc
+        return result
+
+    pending: Dict["asyncio.Task[FetchResult]", str] = {}
+    try:
+        while True:
+            start, results = dispatcher.take(len(reorder.held_back))
+            for index, spec, host in start:
+                pending[asyncio.ensure_future(run(index, spec))] = host
+            if not pending and not results:
+                break
+            if pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    dispatcher.finished(pending.pop(task))
+                    results.append(task.result())
+            for result in reorder.release(results):
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+# ---------- sync (threads) ----------
+def map_requests(
+    send: Callable[..., httpx.Response],
+    requests: Iterable[RequestLike],
+    *,
+    concurrency: int,
+    per_host: int = DEFAULT_PER_HOST,
+    ordered: bool = False,
+    raise_for_status: bool = False,
+    base_url: Optional[httpx.URL] = None,
+) -> Iterator[FetchResult]:
+    """
+    Thread-pool counterpart of ``amap_requests`` for a sync ``httpx.Client``; ``concurrency``
+    is the number of worker threads.
+    """
+    dispatcher = _Dispatcher(requests, concurrency, per_host, base_url)
+    reorder = _Reorder(ordered)
+
+    def run(index: int, spec: RequestSpec) -> FetchResult:
+        result = FetchResult(index, spec)
+        try:
+            result.response = _check(send(spec.method, spec.url, **spec.kwargs), raise_for_status)
+        except Exception as exc:  # noqa: BLE001
+            result.error = exc
+        return result
+
+    pending: Dict["Future[FetchResult]", str] = {}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="httpx-fetch") as pool:
+        try:
+            while True:
+                start, results = dispatcher.take(len(reorder.held_back))
+                for index, spec, host in start:
+                    pending[pool.submit(run, index, spec)] = host
+                if not pending and not results:
+                    break
+                if pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        dispatcher.finished(pending.pop(fut))
+                        results.append(fut.result())
+                yield from reorder.release(results)
+        finally:
+            for fut in pending:
+                fut.cancel()
@@ -0,0 +1,574 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+# Status codes a cache may store without explicit freshness info (RFC 9110 §15.1)
+CACHEABLE_BY_DEFAULT = {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRY_BYTES = 8 * 1024 * 1024
+
+# Headers from a 304 that must not overwrite the stored ones
+_NOT_UPDATED_ON_304 = {"content-length", "content-encoding", "transfer-encoding", "content-range"}
+
+
+def _parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') if arg else None
+    return directives
+
+
+def _seconds(directives: Dict[str, Optional[str]], name: str) -> Optional[int]:
+    try:
+        return max(0, int(directives[name] or ""))
+    except (KeyError, ValueError):
+        return None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------- cache entries ----------
+@dataclass
+class CacheEntry:
+    status_code: int
+    headers: List[Tuple[str, str]]
+    content: bytes
+    request_time: float
+    response_time: float
+    # Request header values named by the response's Vary header
+    vary: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + sum(len(k) + len(v) for k, v in self.headers)
+
+    def header(self, name: str) -> Optional[str]:
+        name = name.lower()
+        for k, v in self.headers:
+            if k.lower() == name:
+                return v
+        return None
+
+    def freshness_lifetime(self) -> float:
+        cc = _parse_cache_control(self.header("cache-control"))
+        max_age = _seconds(cc, "max-age")
+        if max_age is not None:
+            return max_age
+        date = _http_date(self.header("date")) or self.response_time
+        expires = self.header("expires")
+        if expires is not None:
+            # An invalid Expires (e.g. "0") means already expired
+            expires_at = _http_date(expires)
+            return max(0.0, expires_at - date) if expires_at is not None else 0.0
+        last_modified = _http_date(self.header("last-modified"))
+        if last_modified is not None and self.status_code in CACHEABLE_BY_DEFAULT:
+            # Heuristic freshness: 10% of the time since last modification (RFC 9111 §4.2.2)
+            return max(0.0, (date - last_modified) * 0.1)
+        return 0.0
+
+    def current_age(self, now: float) -> float:
+        try:
+            age_header = float(self.header("age") or 0)
+        except ValueError:
+            age_header = 0.0
+        date = _http_date(self.header("date"))
+        apparent = max(0.0, self.response_time - date) if date is not None else 0.0
+        response_delay = self.response_time - self.request_time
+        corrected_initial = max(apparent, age_header + response_delay)
+        return corrected_initial + (now - self.response_time)
+
+    def is_fresh(self, now: float, request_cc: Dict[str, Optional[str]]) -> bool:
+        if "no-cache" in _parse_cache_control(self.header("cache-control")):
+            return False
+        age = self.current_age(now)
+        lifetime = self.freshness_lifetime()
+        max_age = _seconds(request_cc, "max-age")
+        if max_age is not None and age > max_age:
+            return False
+        min_fresh = _seconds(request_cc, "min-fresh")
+        if min_fresh is not None:
+            age += min_fresh
+        return age < lifetime
+
+    def matches(self, request: httpx.Request) -> bool:
+        return all(request.headers.get(name, "") == value for name, value in self.vary.items())
+
+    def to_response(self, request: httpx.Request, status: str) -> httpx.Response:
+        headers = [(k, v) for k, v in self.headers if k.lower() != "age"]
+        headers.append(("Age", str(int(self.current_age(time.time())))))
+        return httpx.Response(
+            self.status_code,
+            headers=headers,
+            stream=httpx.ByteStream(self.content),
+            request=request,
+            extensions={"cache_status": status},
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "status_code": self.status_code,
+                "headers": self.headers,
+                "request_time": self.request_time,
+                "response_time": self.response_time,
+                "vary": self.vary,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, meta: str, content: bytes) -> "CacheEntry":
+        data = json.loads(meta)
+        data["headers"] = [tuple(h) for h in data["headers"]]
+        return cls(content=content, **data)
+
+
+# ---------- storage backends ----------
+class CacheStorage(ABC):
+    """Key -> CacheEntry store with size-bounded LRU eviction. Implementations must be thread-safe."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]: ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> int:
+        """Store an entry and return the number of entries evicted to make room."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryCacheStorage(CacheStorage):
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> int:
+        evicted = 0
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.size
+            self._entries[key] = entry
+            self.total_bytes += entry.size
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, dropped = self._entries.popitem(last=False)
+                self.total_bytes -= dropped.size
+                evicted += 1
+        return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+class SQLiteCacheStorage(CacheStorage):
+    """File-backed cache shared across runs (and processes) via a single SQLite database."""
+
+    def __init__(self, path: str = "httpx_cache.sqlite", max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, meta TEXT NOT NULL, content BLOB NOT NULL,"
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._db.execute("SELECT meta, content FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        return CacheEntry.from_json(row[0], bytes(row[1]))
+
+    def set(self, key: str, entry: CacheEntry) -> int:
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, meta, content, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (key, entry.to_json(), entry.content, entry.size, time.time()),
+                )
+                evicted = self._evict(keep=key)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return evicted
+
+    def _evict(self, keep: str) -> int:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        evicted = 0
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses WHERE key != ? ORDER BY last_access", (keep,)
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# ---------- metrics ----------
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    stores: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        served = self.hits + self.revalidations
+        total = served + self.misses
+        return served / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+# ---------- cache policy ----------
+class ResponseCache:
+    """
+    Private HTTP cache (RFC 9111) shared by the sync and async cache transports.
+
+    - Only GET responses are stored; unsafe methods invalidate the stored URL.
+    - Fresh entries (Cache-Control max-age, Expires, or heuristic from Last-Modified) are
+      served without touching the network.
+    - Stale entries with an ETag or Last-Modified are revalidated with If-None-Match /
+      If-Modified-Since; a 304 refreshes the entry and serves the stored body.
+    - Honours no-store, no-cache, private/Authorization rules and Vary.
+    - Partial content is not supported: Range requests bypass the cache and 206 responses
+      are never stored.
+    """
+
+    def __init__(self, storage: Optional[CacheStorage] = None, max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES) -> None:
+        self.storage = storage if storage is not None else MemoryCacheStorage()
+        self.max_entry_bytes = max_entry_bytes
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str, n: int = 1) -> None:
+        if n:
+            with self._stats_lock:
+                setattr(self.stats, name, getattr(self.stats, name) + n)
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        return str(request.url)
+
+    def lookup(self, request: httpx.Request) -> Tuple[Optional[httpx.Response], Optional[CacheEntry], httpx.Request]:
+        """
+        Returns ``(response, stale_entry, request_to_send)``. A response means a cache hit;
+        otherwise send ``request_to_send`` (conditional when ``stale_entry`` is set).
+        """
+        if request.method != "GET" or "range" in request.headers:
+            return None, None, request
+        request_cc = _parse_cache_control(request.headers.get("cache-control"))
+        if "no-store" in request_cc:
+            return None, None, request
+        entry = self.storage.get(self.key(request))
+        if entry is not None and not entry.matches(request):
+            entry = None
+        if entry is not None and "no-cache" not in request_cc and entry.is_fresh(time.time(), request_cc):
+            self._count("hits")
+            return entry.to_response(request, "HIT"), None, request
+        if entry is None:
+            self._count("misses")
+            if "only-if-cached" in request_cc:
+                return httpx.Response(504, request=request, extensions={"cache_status": "MISS"}), None, request
+            return None, None, request
+
+        etag, last_modified = entry.header("etag"), entry.header("last-modified")
+        if etag is None and last_modified is None:
+            self._count("misses")
+            return None, None, request
+        headers = request.headers.copy()
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+        conditional = httpx.Request(
+            request.method, request.url, headers=headers, extensions=request.extensions
+        )
+        return None, entry, conditional
+
+    def revalidated(self, request: httpx.Request, entry: CacheEntry, not_modified: httpx.Response, request_time: float) -> httpx.Response:
+        updates = {k.lower(): v for k, v in not_modified.headers.multi_items() if k.lower() not in _NOT_UPDATED_ON_304}
+        headers = [(k, v) for k, v in entry.headers if k.lower() not in updates]
+        headers.extend((k, v) for k, v in not_modified.headers.multi_items() if k.lower() in updates)
+        refreshed = CacheEntry(
+            status_code=entry.status_code,
+            headers=headers,
+            content=entry.content,
+            request_time=request_time,
+            response_time=time.time(),
+            vary=entry.vary,
+        )
+        self._count("revalidations")
+        self._count("evictions", self.storage.set(self.key(request), refreshed))
+        return refreshed.to_response(request, "REVALIDATED")
+
+    def invalidate(self, request: httpx.Request, response: httpx.Response) -> None:
+        # Unsafe methods with a non-error response invalidate the target URI (RFC 9111 §4.4)
+        if request.method in ("GET", "HEAD", "OPTIONS", "TRACE") or not 200 <= response.status_code < 400:
+            return
+        self.storage.delete(self.key(request))
+        location = response.headers.get("location") or response.headers.get("content-location")
+        if location:
+            self.storage.delete(str(request.url.join(location)))
+        self._count("invalidations")
+
+    def storable(self, request: httpx.Request, response: httpx.Response) -> bool:
+        if request.method != "GET" or "range" in request.headers or response.status_code == 206:
+            return False
+        if "no-store" in _parse_cache_control(request.headers.get("cache-control")):
+            return False
+        cc = _parse_cache_control(response.headers.get("cache-control"))
+        if "no-store" in cc or response.headers.get("vary", "").strip() == "*":
+            return False
+        if "authorization" in request.headers and not ({"public", "must-revalidate", "s-maxage"} & cc.keys()):
+            return False
+        length = response.headers.get("content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_entry_bytes:
+            return False
+        explicit = "max-age" in cc or "public" in cc or "expires" in response.headers
+        return response.status_code in CACHEABLE_BY_DEFAULT or explicit
+
+    def store(self, request: httpx.Request, response: httpx.Response, content: bytes, request_time: float) -> None:
+        if len(content) > self.max_entry_bytes:
+            return
+        headers = list(response.headers.multi_items())
+        if not any(k.lower() == "date" for k, _ in headers):
+            headers.append(("Date", format_datetime(datetime.now(timezone.utc), usegmt=True)))
+        vary = {
+            name.strip().lower(): request.headers.get(name.strip(), "")
+            for name in response.headers.get("vary", "").split(",")
+            if name.strip()
+        }
+        entry = CacheEntry(
+            status_code=response.status_code,
+            headers=headers,
+            content=content,
+            request_time=request_time,
+            response_time=time.time(),
+            vary=vary,
+        )
+        self._count("stores")
+        self._count("evictions", self.storage.set(self.key(request), entry))
+
+    def clear(self) -> None:
+        self.storage.clear()
+
+    def close(self) -> None:
+        self.storage.close()
+
+
+# ---------- transports ----------
+class _BodyCollector:
+    """Collects a streamed body and stores it once fully read, unless it grows past ``limit``."""
+
+    def __init__(self, limit: int, store: Callable[[bytes], None]) -> None:
+        self._limit = limit
+        self._store = store
+        self._chunks: Optional[List[bytes]] = []
+        self._size = 0
+
+    def add(self, chunk: bytes) -> None:
+        if self._chunks is None:
+            return
+        self._size += len(chunk)
+        if self._size > self._limit:
+            self._chunks = None  # too large: stream through without caching
+        else:
+            self._chunks.append(chunk)
+
+    def finish(self) -> None:
+        if self._chunks is not None:
+            self._store(b"".join(self._chunks))
+            self._chunks = None
+
+
+class _CachingStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, collector: _BodyCollector) -> None:
+        self._stream = stream
+        self._collector = collector
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._collector.add(chunk)
+            yield chunk
+        self._collector.finish()
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+class _AsyncCachingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, collector: _BodyCollector) -> None:
+        self._stream = stream
+        self._collector = collector
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._collector.add(chunk)
+            yield chunk
+        self._collector.finish()
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+def _wrap_for_store(
+    cache: ResponseCache, request: httpx.Request, response: httpx.Response, request_time: float, stream_type: type
+) -> httpx.Response:
+    collector = _BodyCollector(cache.max_entry_bytes, lambda body: cache.store(request, response, body, request_time))
+    return httpx.Response(
+        response.status_code,
+        headers=response.headers,
+        stream=stream_type(response.stream, collector),
+        request=request,
+        extensions={**response.extensions, "cache_status": "MISS"},
+    )
+
+
+class CacheTransport(httpx.BaseTransport):
+    """
+    Sync transport that serves and stores responses through a ResponseCache.
+
+        client = httpx.Client(transport=CacheTransport(httpx.HTTPTransport()))
+    """
+
+    def __init__(self, transport: Optional[httpx.BaseTransport] = None, cache: Optional[ResponseCache] = None) -> None:
+        self.transport = transport or httpx.HTTPTransport()
+        self.cache = cache or ResponseCache()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        cached, stale, to_send = self.cache.lookup(request)
+        if cached is not None:
+            return cached
+        request_time = time.time()
+        response = self.transport.handle_request(to_send)
+        if stale is not None:
+            if response.status_code == 304:
+                response.close()
+                return self.cache.revalidated(request, stale, response, request_time)
+            self.cache._count("misses")
+        self.cache.invalidate(request, response)
+        if self.cache.storable(request, response):
+            return _wrap_for_store(self.cache, request, response, request_time, _CachingStream)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCacheTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of CacheTransport; storage calls are short and lock-protected."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, cache: Optional[ResponseCache] = None) -> None:
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.cache = cache or ResponseCache()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        cached, stale, to_send = self.cache.lookup(request)
+        if cached is not None:
+            return cached
+        request_time = time.time()
+        response = await self.transport.handle_async_request(to_send)
+        if stale is not None:
+            if response.status_code == 304:
+                await response.aclose()
+                return self.cache.revalidated(request, stale, response, request_time)
+            self.cache._count("misses")
+        self.cache.invalidate(request, response)
+        if self.cache.storable(request, response):
+            return _wrap_for_store(self.cache, request, response, request_time, _AsyncCachingStream)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
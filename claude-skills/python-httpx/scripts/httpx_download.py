@@ -0,0 +1,305 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+# Segment end used while the total size is unknown
+_UNBOUNDED = 1 << 62
+# Progress is written to the sidecar at most this often
+SAVE_INTERVAL = 1.0
+
+
+class DownloadError(Exception):
+    pass
+
+
+@dataclass
+class RemoteFile:
+    size: Optional[int]
+    accept_ranges: bool
+    # ETag or Last-Modified, sent as If-Range so a changed file is not stitched together
+    validator: Optional[str]
+
+
+def _remote_file(resp: httpx.Response) -> RemoteFile:
+    size: Optional[int] = None
+    content_range = resp.headers.get("content-range", "")
+    if resp.status_code in (206, 416):
+        # 206: "bytes 0-0/N"; 416 (e.g. an empty file): "bytes */N". The Content-Length of
+        # a 416 describes its error body, not the file.
+        total = content_range.rsplit("/", 1)[1] if "/" in content_range else ""
+        size = int(total) if total.isdigit() else None
+    elif resp.headers.get("content-length", "").isdigit():
+        size = int(resp.headers["content-length"])
+    accept_ranges = resp.status_code in (206, 416) or resp.headers.get("accept-ranges", "").lower() == "bytes"
+    validator = resp.headers.get("etag") or resp.headers.get("last-modified")
+    if validator and validator.startswith("W/"):
+        validator = None  # weak ETags cannot be used with If-Range
+    return RemoteFile(size, accept_ranges, validator)
+
+
+# Ranges address the stored bytes, so ask for them unencoded
+_PROBE_HEADERS = {"Range": "bytes=0-0", "Accept-Encoding": "identity"}
+
+
+def _pwrite(fd: int, data: bytes, offset: int, lock: threading.Lock) -> None:
+    if hasattr(os, "pwrite"):
+        os.pwrite(fd, data, offset)
+        return
+    with lock:  # Windows: no pwrite, serialize seek + write on the shared descriptor
+        os.lseek(fd, offset, os.SEEK_SET)
+        os.write(fd, data)
+
+
+def _split(size: int, segments: int) -> List[List[int]]:
+    segments = max(1, min(segments, -(-size // MIN_SEGMENT_SIZE) if size else 1))
+    step = -(-size // segments) if size else 0
+    # [start, end (exclusive), next offset to fetch]
+    return [[i * step, min(size, (i + 1) * step), i * step] for i in range(segments)]
+
+
+def verify_checksum(path: str, checksum: str, chunk_size: int = 1024 * 1024) -> None:
+    """``checksum`` is ``"<algorithm>:<hexdigest>"``, e.g. ``"sha256:9f86d0..."``."""
+    algorithm, _, expected = checksum.partition(":")
+    digest = hashlib.new(algorithm.lower())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    if digest.hexdigest().lower() != expected.lower():
+        raise DownloadError(f"Checksum mismatch for {path}: {algorithm} {digest.hexdigest()} != {expected}")
+
+
+class SegmentedDownload:
+    """
+    State for one ranged download: the preallocated ``<path>.part`` file and the
+    ``<path>.part.json`` sidecar recording how far each segment got, so an interrupted
+    download resumes where it stopped. Shared by the sync (threads) and async runners.
+    """
+
+    def __init__(self, url: str, path: str, remote: RemoteFile, segments: int) -> None:
+        self.url = url
+        self.path = path
+        self.part_path = path + ".part"
+        self.sidecar_path = path + ".part.json"
+        self.remote = remote
+        self.ranged = remote.accept_ranges and remote.size is not None
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        if self.ranged:
+            self.segments = self._load() or _split(remote.size or 0, segments)
+        else:
+            # No range support: one stream that restarts from zero on failure
+            self.segments = [[0, _UNBOUNDED if remote.size is None else remote.size, 0]]
+        mode = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        self.fd = os.open(self.part_path, mode, 0o644)
+        if remote.size is not None and os.fstat(self.fd).st_size != remote.size:
+            os.ftruncate(self.fd, remote.size)  # preallocate (sparse where supported)
+
+    def _load(self) -> Optional[List[List[int]]]:
+        try:
+            with open(self.sidecar_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        same = (
+            state.get("url") == self.url
+            and state.get("size") == self.remote.size
+            and state.get("validator") == self.remote.validator
+            and self.remote.validator is not None
+            and os.path.exists(self.part_path)
+        )
+        return state["segments"] if same else None
+
+    def save(self, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_save < SAVE_INTERVAL:
+                return
+            self._last_save = now
+            state = {"url": self.url, "size": self.remote.size, "validator": self.remote.validator, "segments": self.segments}
+            os.fsync(self.fd)  # never record progress for bytes that may not be on disk
+            tmp = self.sidecar_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.sidecar_path)
+
+    @property
+    def downloaded(self) -> int:
+        return sum(seg[2] - seg[0] for seg in self.segments)
+
+    def pending(self) -> List[List[int]]:
+        return [seg for seg in self.segments if seg[2] < seg[1]]
+
+    def range_headers(self, seg: List[int]) -> Dict[str, str]:
+        if not self.ranged:
+            seg[2] = seg[0]
+            return {"Accept-Encoding": "identity"}
+        headers = {"Range": f"bytes={seg[2]}-{seg[1] - 1}", "Accept-Encoding": "identity"}
+        if self.remote.validator:
+            headers["If-Range"] = self.remote.validator
+        return headers
+
+    def check_response(self, resp: httpx.Response, seg: List[int]) -> None:
+        if resp.status_code == (206 if self.ranged else 200):
+            return
+        if resp.status_code == 200 and seg[2] == 0 and seg[1] == self.remote.size:
+            return  # server ignored the range but we wanted the whole file anyway
+        if resp.status_code == 200:
+            raise DownloadError(f"{self.url} changed or ignored the byte range (HTTP 200 to a Range request)")
+        resp.raise_for_status()
+        raise DownloadError(f"Unexpected HTTP {resp.status_code} for range of {self.url}")
+
+    def write(self, seg: List[int], data: bytes) -> None:
+        room = seg[1] - seg[2]
+        if len(data) > room:
+            data = data[:room]
+        _pwrite(self.fd, data, seg[2], self._lock)
+        seg[2] += len(data)
+        self.save()
+
+    def stream_ended(self, seg: List[int]) -> bool:
+        """Called when a response body ends; False if the segment still needs bytes (retry)."""
+        if self.remote.size is None:
+            seg[1] = seg[2]
+        return seg[2] >= seg[1]
+
+    def finish(self, checksum: Optional[str]) -> None:
+        if self.remote.size is None:
+            os.ftruncate(self.fd, self.downloaded)
+        self.save(force=True)
+        size = os.fstat(self.fd).st_size
+        os.close(self.fd)
+        if self.pending():
+            raise DownloadError(f"Download of {self.url} incomplete: {self.downloaded} bytes")
+        if self.remote.size is not None and size != self.remote.size:
+            raise DownloadError(f"Size mismatch for {self.url}: got {size} bytes, expected {self.remote.size}")
+        if checksum:
+            try:
+                verify_checksum(self.part_path, checksum)
+            except DownloadError:
+                # A corrupt file must not be resumed
+                os.remove(self.part_path)
+                os.remove(self.sidecar_path)
+                raise
+        os.replace(self.part_path, self.path)
+        os.remove(self.sidecar_path)
+
+    def abort(self) -> None:
+        try:
+            self.save(force=True)
+        finally:
+            os.close(self.fd)
+
+
+def download(
+    client: httpx.Client,
+    url: str,
+    path: str,
+    segments: int = 4,
+    checksum: Optional[str] = None,
+    chunk_size: int = 65536,
+    retries: int = 3,
+) -> int:
+    """Download ``url`` to ``path`` over up to ``segments`` parallel range requests. Returns the size."""
+    with client.stream("GET", url, headers=_PROBE_HEADERS) as probe:
+        if probe.status_code >= 400 and probe.status_code != 416:
+            probe.raise_for_status()
+        remote = _remote_file(probe)
+    state = SegmentedDownload(url, path, remote, segments)
+    stop = threading.Event()
+
+    def fetch(seg: List[int]) -> None:
+        attempt = 0
+        while True:
+            headers = state.range_headers(seg)
+            try:
+                with client.stream("GET", url, headers=headers) as resp:
+                    state.check_response(resp, seg)
+                    for chunk in resp.iter_bytes(chunk_size):
+                        if stop.is_set():
+                            return
+                        state.write(seg, chunk)
+                if state.stream_ended(seg):
+                    return
+                error: Exception = DownloadError(f"Range of {url} ended early at byte {seg[2]}")
+            except httpx.TransportError as exc:
+                error = exc
+            attempt += 1
+            if attempt > retries:
+                raise error
+            time.sleep(min(8.0, 0.5 * 2 ** (attempt - 1)))
+
+    try:
+        pending = state.pending()
+        with ThreadPoolExecutor(max_workers=max(1, len(pending)), thread_name_prefix="httpx-range") as pool:
+            try:
+                for fut in [pool.submit(fetch, seg) for seg in pending]:
+                    fut.result()
+            except BaseException:
+                stop.set()  # let the other segments wind down before the file is closed
+                raise
+    except BaseException:
+        state.abort()
+        raise
+    state.finish(checksum)
+    return os.path.getsize(path)
+
+
+async def adownload(
+    client: httpx.AsyncClient,
+    url: str,
+    path: str,
+    segments: int = 4,
+    checksum: Optional[str] = None,
+    chunk_size: int = 65536,
+    retries: int = 3,
+) -> int:
+    """
+    Async ``download``: one task per segment on the shared AsyncClient. File writes and
+    fsyncs run in worker threads so a slow disk does not stall the event loop.
+    """
+    async with client.stream("GET", url, headers=_PROBE_HEADERS) as probe:
+        if probe.status_code >= 400 and probe.status_code != 416:
+            probe.raise_for_status()
+        remote = _remote_file(probe)
+    state = await asyncio.to_thread(SegmentedDownload, url, path, remote, segments)
+
+    async def fetch(seg: List[int]) -> None:
+        attempt = 0
+        while True:
+            headers = state.range_headers(seg)
+            try:
+                async with client.stream("GET", url, headers=headers) as resp:
+                    state.check_response(resp, seg)
+                    async for chunk in resp.aiter_bytes(chunk_size):
+                        await asyncio.to_thread(state.write, seg, chunk)
+                if state.stream_ended(seg):
+                    return
+                error: Exception = DownloadError(f"Range of {url} ended early at byte {seg[2]}")
+            except httpx.TransportError as exc:
+                error = exc
+            attempt += 1
+            if attempt > retries:
+                raise error
+            await asyncio.sleep(min(8.0, 0.5 * 2 ** (attempt - 1)))
+
+    tasks = [asyncio.ensure_future(fetch(seg)) for seg in state.pending()]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop the other segments before closing the file they write to
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.to_thread(state.abort)
+        raise
+    await asyncio.to_thread(state.finish, checksum)
+    return os.path.getsize(path)
@@ -0,0 +1,396 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# pool:    waiting for a pooled connection (time before the first transport event)
+# connect: DNS resolution + TCP connect (httpcore resolves inside connect_tcp)
+# tls:     TLS handshake
+# send:    writing request headers and body
+# server:  request sent -> response headers received (time to first byte)
+# receive: response headers -> body fully read or closed
+PHASES = ("pool", "connect", "tls", "send", "server", "receive")
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Set by HttpxSkill's retry loop so each attempt is recorded with its retry number
+ATTEMPT_EXTENSION = "httpx_skill.retry_attempt"
+
+
+@dataclass
+class RequestTiming:
+    method: str
+    host: str
+    path: str
+    status: Optional[int] = None
+    error: Optional[str] = None
+    retry_attempt: int = 0
+    total: float = 0.0
+    phases: Dict[str, float] = field(default_factory=dict)
+    bytes_out: int = 0
+    bytes_in: int = 0
+    # In-flight requests and open pool connections when this request started
+    in_flight: int = 0
+    pool_connections: Optional[int] = None
+    cache_status: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data["total"] = round(self.total, 6)
+        data["phases"] = {k: round(v, 6) for k, v in self.phases.items()}
+        return data
+
+    def log_line(self) -> str:
+        return json.dumps(self.as_dict(), separators=(",", ":"))
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
+class HttpMetrics:
+    """
+    Aggregated request metrics (thread-safe). ``keep`` most recent RequestTimings are retained
+    in ``timings``; counters and histograms cover everything recorded.
+    """
+
+    def __init__(self, keep: Optional[int] = 1000) -> None:
+        self.timings: Deque[RequestTiming] = deque(maxlen=keep)
+        self.requests: Dict[Tuple[str, str], int] = {}
+        self.errors: Dict[str, int] = {}
+        self.phases: Dict[str, _Histogram] = {}
+        self.duration = _Histogram()
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.retries = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.pool_connections: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def started(self) -> int:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return self.in_flight
+
+    def record(self, timing: RequestTiming) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.timings.append(timing)
+            outcome = str(timing.status) if timing.status is not None else "error"
+            key = (timing.method, outcome)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if timing.error:
+                self.errors[timing.error] = self.errors.get(timing.error, 0) + 1
+            self.duration.observe(timing.total)
+            for phase, seconds in timing.phases.items():
+                self.phases.setdefault(phase, _Histogram()).observe(seconds)
+            self.bytes_out += timing.bytes_out
+            self.bytes_in += timing.bytes_in
+            self.retries += 1 if timing.retry_attempt else 0
+            if timing.pool_connections is not None:
+                self.pool_connections = timing.pool_connections
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "requests": sum(self.requests.values()),
+                "errors": sum(self.errors.values()),
+                "retries": self.retries,
+                "bytes_out": self.bytes_out,
+                "bytes_in": self.bytes_in,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "pool_connections": self.pool_connections,
+                "seconds": round(self.duration.sum, 6),
+                "phase_seconds": {p: round(h.sum, 6) for p, h in self.phases.items()},
+            }
+
+    def to_prometheus(self, prefix: str = "httpx_skill") -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def histogram(name: str, hist: _Histogram, **labels: str) -> None:
+            for bound, count in zip(BUCKETS, hist.counts):
+                lines.append(f"{prefix}_{name}_bucket{_labels(**labels, le=str(bound))} {count}")
+            lines.append(f"{prefix}_{name}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+            suffix = _labels(**labels) if labels else ""
+            lines.append(f"{prefix}_{name}_sum{suffix} {hist.sum}")
+            lines.append(f"{prefix}_{name}_count{suffix} {hist.count}")
+
+        with self._lock:
+            header("requests_total", "counter", "Requests by method and status (status=error for transport errors).")
+            for (method, status), count in sorted(self.requests.items()):
+                lines.append(f"{prefix}_requests_total{_labels(method=method, status=status)} {count}")
+            header("errors_total", "counter", "Requests that failed with an exception, by type.")
+            for error, count in sorted(self.errors.items()):
+                lines.append(f"{prefix}_errors_total{_labels(error=error)} {count}")
+            header("retries_total", "counter", "Requests that were a retry of an earlier attempt.")
+            lines.append(f"{prefix}_retries_total {self.retries}")
+            header("sent_bytes_total", "counter", "Request body bytes sent.")
+            lines.append(f"{prefix}_sent_bytes_total {self.bytes_out}")
+            header("received_bytes_total", "counter", "Response body bytes received (before decoding).")
+            lines.append(f"{prefix}_received_bytes_total {self.bytes_in}")
+            header("in_flight", "gauge", "Requests currently in flight.")
+            lines.append(f"{prefix}_in_flight {self.in_flight}")
+            header("in_flight_peak", "gauge", "Highest number of requests in flight at once.")
+            lines.append(f"{prefix}_in_flight_peak {self.peak_in_flight}")
+            if self.pool_connections is not None:
+                header("pool_connections", "gauge", "Open pooled connections at the last request start.")
+                lines.append(f"{prefix}_pool_connections {self.pool_connections}")
+            header("request_duration_seconds", "histogram", "Total request time, including reading the body.")
+            histogram("request_duration_seconds", self.duration)
+            header("phase_duration_seconds", "histogram", "Time spent per request phase.")
+            for phase in PHASES:
+                if phase in self.phases:
+                    histogram("phase_duration_seconds", self.phases[phase], phase=phase)
+        return "\n".join(lines) + "\n"
+
+
+# ---------- context-local collection ----------
+_collector: ContextVar[Optional[HttpMetrics]] = ContextVar("httpx_skill_metrics", default=None)
+
+
+@contextmanager
+def track(keep: Optional[int] = None) -> Iterator[HttpMetrics]:
+    """
+    Collect the requests made in this context (thread / asyncio task) into a fresh HttpMetrics:
+
+        with track() as stats:
+            skill.get(url)
+        stats.timings[-1].phases
+    """
+    metrics = HttpMetrics(keep=keep)
+    token = _collector.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _collector.reset(token)
+
+
+def current_metrics() -> Optional[HttpMetrics]:
+    return _collector.get()
+
+
+# ---------- recording ----------
+def _find_pool(transport: object) -> object:
+    # Walk wrapper transports (``.transport``) down to httpx's HTTPTransport and its httpcore pool
+    for _ in range(8):
+        pool = getattr(transport, "_pool", None)
+        if pool is not None:
+            return pool
+        transport = getattr(transport, "transport", None)
+        if transport is None:
+            return None
+    return None
+
+
+class _Recorder:
+    """Per-request state: httpcore trace events, byte counts, and where to report when done."""
+
+    def __init__(self, metrics: HttpMetrics, request: httpx.Request, pool: object, log_level: Optional[int]) -> None:
+        self.sinks = [metrics] + [m for m in (_collector.get(),) if m is not None and m is not metrics]
+        self.log_level = log_level
+        self.events: Dict[str, float] = {}
+        self.timing = RequestTiming(
+            method=request.method,
+            host=request.url.host,
+            path=request.url.path,
+            retry_attempt=request.extensions.get(ATTEMPT_EXTENSION, 0),
+            pool_connections=len(pool.connections) if pool is not None else None,  # type: ignore[attr-defined]
+        )
+        self.timing.in_flight = self.sinks[0].started()
+        for sink in self.sinks[1:]:
+            sink.started()
+        self.start = time.perf_counter()
+        self._done = False
+
+    def trace(self, name: str, info: Dict[str, object]) -> None:
+        # "http11.send_request_headers.started" -> "send_request_headers.started"
+        self.events.setdefault(name.split(".", 1)[-1], time.perf_counter())
+
+    async def atrace(self, name: str, info: Dict[str, object]) -> None:
+        self.trace(name, info)
+
+    def _span(self, start: str, end: str) -> Optional[float]:
+        if start in self.events and end in self.events:
+            return max(0.0, self.events[end] - self.events[start])
+        return None
+
+    def finish(self, response: Optional[httpx.Response] = None, error: Optional[BaseException] = None) -> None:
+        if self._done:
+            return
+        self._done = True
+        now = time.perf_counter()
+        timing = self.timing
+        timing.total = now - self.start
+        if response is not None:
+            timing.status = response.status_code
+            timing.cache_status = response.extensions.get("cache_status")
+        if error is not None:
+            timing.error = type(error).__name__
+        events = self.events
+        if events:
+            timing.phases["pool"] = max(0.0, min(events.values()) - self.start)
+        spans = {
+            "connect": ("connect_tcp.started", "connect_tcp.complete"),
+            "tls": ("start_tls.started", "start_tls.complete"),
+            "send": ("send_request_headers.started", "send_request_body.complete"),
+            "server": ("send_request_body.complete", "receive_response_headers.complete"),
+        }
+        for phase, (start, end) in spans.items():
+            seconds = self._span(start, end)
+            if seconds is not None:
+                timing.phases[phase] = seconds
+        if "receive_response_headers.complete" in events:
+            timing.phases["receive"] = max(0.0, now - events["receive_response_headers.complete"])
+        for sink in self.sinks:
+            sink.record(timing)
+        if self.log_level is not None and logger.isEnabledFor(self.log_level):
+            logger.log(self.log_level, "http_request %s", timing.log_line())
+
+
+class _CountingStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, recorder: _Recorder, outgoing: bool) -> None:
+        self._stream = stream
+        self._recorder = recorder
+        self._outgoing = outgoing
+        self._response: Optional[httpx.Response] = None
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            if self._outgoing:
+                self._recorder.timing.bytes_out += len(chunk)
+            else:
+                self._recorder.timing.bytes_in += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if not self._outgoing:
+                self._recorder.finish(self._response)
+
+
+class _AsyncCountingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, recorder: _Recorder, outgoing: bool) -> None:
+        self._stream = stream
+        self._recorder = recorder
+        self._outgoing = outgoing
+        self._response: Optional[httpx.Response] = None
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            if self._outgoing:
+                self._recorder.timing.bytes_out += len(chunk)
+            else:
+                self._recorder.timing.bytes_in += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._outgoing:
+                self._recorder.finish(self._response)
+
+
+def _wrap_response(
+    request: httpx.Request, response: httpx.Response, recorder: _Recorder, stream_type: type
+) -> httpx.Response:
+    stream = stream_type(response.stream, recorder, outgoing=False)
+    wrapped = httpx.Response(
+        response.status_code,
+        headers=response.headers,
+        stream=stream,
+        request=request,
+        extensions=response.extensions,
+    )
+    stream._response = wrapped
+    return wrapped
+
+
+class MetricsTransport(httpx.BaseTransport):
+    """
+    Sync transport recording a RequestTiming per request into ``metrics`` (and any active
+    ``track()`` collector). Phase timings come from httpcore's ``trace`` request extension,
+    so they are only available over a real HTTPTransport; the request is recorded once the
+    response body is closed (or the transport raises). ``log_level`` emits one JSON line per
+    request on the ``scripts.httpx_metrics`` logger.
+    """
+
+    def __init__(
+        self, transport: httpx.BaseTransport, metrics: Optional[HttpMetrics] = None, log_level: Optional[int] = None
+    ) -> None:
+        self.transport = transport
+        self.metrics = metrics or HttpMetrics()
+        self.log_level = log_level
+        self._pool = _find_pool(transport)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        recorder = _Recorder(self.metrics, request, self._pool, self.log_level)
+        request.extensions["trace"] = recorder.trace
+        request.stream = _CountingStream(request.stream, recorder, outgoing=True)  # type: ignore[arg-type]
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException as exc:  # cancellation too, or in_flight would never come down
+            recorder.finish(error=exc)
+            raise
+        return _wrap_response(request, response, recorder, _CountingStream)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncMetricsTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of MetricsTransport."""
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, metrics: Optional[HttpMetrics] = None, log_level: Optional[int] = None
+    ) -> None:
+        self.transport = transport
+        self.metrics = metrics or HttpMetrics()
+        self.log_level = log_level
+        self._pool = _find_pool(transport)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        recorder = _Recorder(self.metrics, request, self._pool, self.log_level)
+        request.extensions["trace"] = recorder.atrace
+        request.stream = _AsyncCountingStream(request.stream, recorder, outgoing=True)  # type: ignore[arg-type]
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException as exc:  # cancellation too, or in_flight would never come down
+            recorder.finish(error=exc)
+            raise
+        return _wrap_response(request, response, recorder, _AsyncCountingStream)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
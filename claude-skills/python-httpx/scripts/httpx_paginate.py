@@ -0,0 +1,209 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import httpx
+
+Params = Optional[Dict[str, Any]]
+# (url, params) of the page to fetch
+PageRequest = Tuple[str, Params]
+ItemsSpec = Union[str, Callable[[httpx.Response], List[Any]], None]
+
+
+def _dig(body: Any, path: Optional[str]) -> Any:
+    """``"data.items"`` -> ``body["data"]["items"]``; None for a missing key."""
+    if not path:
+        return body
+    for part in path.split("."):
+        if not isinstance(body, dict):
+            return None
+        body = body.get(part)
+    return body
+
+
+class Pagination(ABC):
+    """
+    Base strategy. ``items`` is the dotted path of the page's list in the JSON body (None: the
+    body itself is the list) or a callable ``response -> list``.
+    """
+
+    def __init__(self, items: ItemsSpec = None) -> None:
+        self.items_spec = items
+
+    def start(self, url: str, params: Params) -> PageRequest:
+        return url, params
+
+    def items(self, response: httpx.Response) -> List[Any]:
+        if callable(self.items_spec):
+            return list(self.items_spec(response))
+        found = _dig(response.json(), self.items_spec)
+        if found is None:
+            return []
+        if not isinstance(found, list):
+            raise ValueError(f"Page items at {self.items_spec!r} are not a list")
+        return found
+
+    @abstractmethod
+    def next_page(self, response: httpx.Response, items: List[Any], request: PageRequest) -> Optional[PageRequest]:
+        """The (url, params) of the page after ``request``, or None when this was the last."""
+
+
+class LinkPagination(Pagination):
+    """Follow the RFC 8288 (ex-5988) ``Link: <...>; rel="next"`` response header."""
+
+    def __init__(self, items: ItemsSpec = None, rel: str = "next") -> None:
+        super().__init__(items)
+        self.rel = rel
+
+    def next_page(self, response: httpx.Response, items: List[Any], request: PageRequest) -> Optional[PageRequest]:
+        link = response.links.get(self.rel, {}).get("url")
+        if not link:
+            return None
+        # The next URL already carries its query string
+        return str(response.url.join(link)), None
+
+
+class CursorPagination(Pagination):
+    """
+    Cursor in the body (``cursor`` dotted path, e.g. ``"meta.next_cursor"``) sent back as the
+    ``param`` query parameter. Stops on an empty cursor, an empty page, or a false ``has_more``.
+    """
+
+    def __init__(
+        self,
+        items: ItemsSpec = "data",
+        cursor: str = "next_cursor",
+        param: str = "cursor",
+        has_more: Optional[str] = None,
+    ) -> None:
+        super().__init__(items)
+        self.cursor = cursor
+        self.param = param
+        self.has_more = has_more
+
+    def next_page(self, response: httpx.Response, items: List[Any], request: PageRequest) -> Optional[PageRequest]:
+        body = response.json()
+        cursor = _dig(body, self.cursor)
+        if not items or cursor in (None, "") or (self.has_more and not _dig(body, self.has_more)):
+            return None
+        url, params = request
+        return url, {**(params or {}), self.param: cursor}
+
+
+class OffsetPagination(Pagination):
+    """
+    ``offset``/``limit`` query parameters. Stops on a short page, or once ``total`` (dotted path
+    of the total count in the body, if the API returns one) is reached.
+    """
+
+    def __init__(
+        self,
+        items: ItemsSpec = "data",
+        limit: int = 100,
+        offset_param: str = "offset",
+        limit_param: str = "limit",
+        total: Optional[str] = None,
+        start: int = 0,
+    ) -> None:
+        super().__init__(items)
+        self.limit = limit
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.total = total
+        self.start_offset = start
+
+    def start(self, url: str, params: Params) -> PageRequest:
+        return url, {**(params or {}), self.offset_param: self.start_offset, self.limit_param: self.limit}
+
+    def next_page(self, response: httpx.Response, items: List[Any], request: PageRequest) -> Optional[PageRequest]:
+        url, params = request
+        offset = int((params or {}).get(self.offset_param, self.start_offset)) + len(items)
+        total = _dig(response.json(), self.total) if self.total else None
+        if len(items) < self.limit or (isinstance(total, int) and offset >= total):
+            return None
+        return url, {**(params or {}), self.offset_param: offset}
+
+
+def paginate(
+    fetch: Callable[[str, Params], httpx.Response],
+    url: str,
+    strategy: Optional[Pagination] = None,
+    params: Params = None,
+    max_items: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    prefetch: bool = True,
+) -> Iterator[Any]:
+    """
+    Yield items across pages. ``fetch(url, params)`` returns a response; with ``prefetch`` the
+    next page is requested on a worker thread while the current page's items are consumed.
+    """
+    strategy = strategy or LinkPagination()
+    request: Optional[PageRequest] = strategy.start(url, params)
+    pending: Optional[Future] = None
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="httpx-page") if prefetch else None
+    yielded = pages = 0
+    try:
+        while request is not None:
+            response = pending.result() if pending is not None else fetch(*request)
+            pending = None
+            response.raise_for_status()
+            pages += 1
+            items = strategy.items(response)
+            following = strategy.next_page(response, items, request)
+            if max_pages is not None and pages >= max_pages:
+                following = None
+            if max_items is not None and yielded + len(items) >= max_items:
+                following = None
+            if following is not None and executor is not None:
+                pending = executor.submit(fetch, *following)
+            for item in items:
+                if max_items is not None and yielded >= max_items:
+                    return
+                yielded += 1
+                yield item
+            request = following
+    finally:
+        if pending is not None:
+            pending.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def apaginate(
+    fetch: Callable[[str, Params], Awaitable[httpx.Response]],
+    url: str,
+    strategy: Optional[Pagination] = None,
+    params: Params = None,
+    max_items: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    prefetch: bool = True,
+) -> AsyncIterator[Any]:
+    """Async ``paginate``; the next page is fetched in a task while items are consumed."""
+    strategy = strategy or LinkPagination()
+    request: Optional[PageRequest] = strategy.start(url, params)
+    pending: Optional["asyncio.Task[httpx.Response]"] = None
+    yielded = pages = 0
+    try:
+        while request is not None:
+            response = await pending if pending is not None else await fetch(*request)
+            pending = None
+            response.raise_for_status()
+            pages += 1
+            items = strategy.items(response)
+            following = strategy.next_page(response, items, request)
+            if max_pages is not None and pages >= max_pages:
+                following = None
+            if max_items is not None and yielded + len(items) >= max_items:
+                following = None
+            if following is not None and prefetch:
+                pending = asyncio.ensure_future(fetch(*following))
+            for item in items:
+                if max_items is not None and yielded >= max_items:
+                    return
+                yielded += 1
+                yield item
+            request = following
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -0,0 +1,224 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+import httpx
+
+# (requests per second, burst)
+RateSpec = Union[float, Tuple[float, int]]
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - (now or time.time()))
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_number(headers: httpx.Headers, *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value.split(",")[0].split(";")[0])
+            except ValueError:
+                return None
+    return None
+
+
+# ---------- buckets ----------
+class TokenBucket:
+    """
+    Thread-safe token bucket: ``rate`` tokens per second, up to ``capacity`` banked for bursts.
+
+    ``reserve()`` takes a token and returns how long the caller must wait before using it,
+    so the same bucket serves ``time.sleep`` and ``asyncio.sleep`` callers.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be > 0 and capacity >= 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every reservation for ``seconds`` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            # Restart from an empty bucket once the pause ends
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, self._paused_until)
+
+
+class LeakyBucket(TokenBucket):
+    """Leaky bucket (as a meter): requests leave evenly spaced at ``rate`` per second, no bursts."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__(rate, capacity=1)
+
+
+class RateLimiter:
+    """
+    Client-side rate limits keyed by host or route.
+
+    ``rules`` maps ``"api.example.com"`` or ``"api.example.com/v1/search"`` (longest path
+    prefix wins) to a rate in requests/second or a ``(rate, burst)`` tuple; ``default``
+    applies to every other host. Responses feed back into the limiter: ``Retry-After`` on
+    429/503 and exhausted ``RateLimit-Remaining``/``X-RateLimit-Remaining`` pause the
+    matching bucket until the advertised reset, for hosts with or without a rule.
+    """
+
+    def __init__(self, rules: Optional[Mapping[str, RateSpec]] = None, default: Optional[RateSpec] = None) -> None:
+        self.rules = {k.rstrip("/"): v for k, v in (rules or {}).items()}
+        self.default = default
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(spec: Optional[RateSpec]) -> TokenBucket:
+        if spec is None:
+            # Unlimited until a server tells us to back off
+            return TokenBucket(rate=1e9, capacity=1_000_000)
+        if isinstance(spec, tuple):
+            return TokenBucket(spec[0], spec[1])
+        return TokenBucket(spec)
+
+    def key(self, url: httpx.URL) -> str:
+        host = url.host
+        path = url.path.rstrip("/")
+        best = ""
+        for rule in self.rules:
+            rule_host, _, rule_path = rule.partition("/")
+            if rule_host != host:
+                continue
+            rule_path = "/" + rule_path if rule_path else ""
+            if (path == rule_path or path.startswith(rule_path + "/") or not rule_path) and len(rule) > len(best):
+                best = rule
+        return best or host
+
+    def bucket_for(self, url: httpx.URL) -> TokenBucket:
+        key = self.key(url)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = self._bucket(self.rules.get(key, self.default))
+            return bucket
+
+    def reserve(self, url: httpx.URL) -> float:
+        return self.bucket_for(url).reserve()
+
+    def acquire(self, url: httpx.URL) -> None:
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, url: httpx.URL) -> None:
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def observe(self, url: httpx.URL, response: httpx.Response) -> None:
+        headers = response.headers
+        pause = None
+        if response.status_code in (429, 503):
+            pause = parse_retry_after(headers.get("retry-after"))
+        remaining = _header_number(headers, "ratelimit-remaining", "x-ratelimit-remaining")
+        if pause is None and remaining is not None and remaining <= 0:
+            reset = _header_number(headers, "ratelimit-reset", "x-ratelimit-reset")
+            if reset is not None:
+                # X-RateLimit-Reset is an epoch timestamp on GitHub & co, RateLimit-Reset a delta
+                pause = max(0.0, reset - time.time()) if reset > 1e9 else reset
+        if pause:
+            self.bucket_for(url).pause(pause)
+
+
+# ---------- circuit breaker ----------
+class CircuitOpenError(httpx.HTTPError):
+    """Raised without touching the network while a host's circuit is open."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"Circuit open for {host}; retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker. After ``failure_threshold`` consecutive failures (transport
+    errors or 5xx) the circuit opens and calls fail fast with CircuitOpenError for
+    ``recovery_timeout`` seconds; then up to ``half_open_max`` trial calls are let through and
+    one success closes it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max: int = 1) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max = half_open_max
+        self._state: Dict[str, Tuple[str, int, float, int]] = {}  # host -> (state, failures, opened_at, trials)
+        self._lock = threading.Lock()
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            return self._state.get(host, (self.CLOSED, 0, 0.0, 0))[0]
+
+    def before(self, host: str) -> bool:
+        """Fail fast on an open circuit; True when the call was let through as a half-open trial."""
+        with self._lock:
+            state, failures, opened_at, trials = self._state.get(host, (self.CLOSED, 0, 0.0, 0))
+            if state == self.CLOSED:
+                return False
+            now = time.monotonic()
+            if state == self.OPEN:
+                if now - opened_at < self.recovery_timeout:
+                    raise CircuitOpenError(host, self.recovery_timeout - (now - opened_at))
+                state, trials = self.HALF_OPEN, 0
+            if trials >= self.half_open_max:
+                raise CircuitOpenError(host, 0.0)
+            self._state[host] = (state, failures, opened_at, trials + 1)
+            return True
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._state.pop(host, None)
+
+    def release(self, host: str) -> None:
+        """Give back a half-open trial slot for an attempt that ended without a verdict."""
+        with self._lock:
+            state, failures, opened_at, trials = self._state.get(host, (self.CLOSED, 0, 0.0, 0))
+            if state == self.HALF_OPEN and trials:
+                self._state[host] = (state, failures, opened_at, trials - 1)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            state, failures, opened_at, trials = self._state.get(host, (self.CLOSED, 0, 0.0, 0))
+            failures += 1
+            if state == self.HALF_OPEN or failures >= self.failure_threshold:
+                self._state[host] = (self.OPEN, failures, time.monotonic(), 0)
+            else:
+                self._state[host] = (state, failures, opened_at, trials)
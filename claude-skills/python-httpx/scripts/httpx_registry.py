@@ -0,0 +1,130 @@
+import asyncio
+import atexit
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+import httpx
+
+AnyClient = Union[httpx.Client, httpx.AsyncClient]
+# (config key, id of the event loop an AsyncClient belongs to, or None)
+Slot = Tuple[Hashable, Optional[int]]
+
+
+@dataclass
+class _Entry:
+    client: AnyClient
+    refs: int = 0
+    idle_since: Optional[float] = None
+    # AsyncClient pools are bound to the loop they were created on
+    loop: Optional["weakref.ReferenceType[asyncio.AbstractEventLoop]"] = None
+
+    def loop_gone(self) -> bool:
+        if self.loop is None:
+            return False
+        loop = self.loop()
+        return loop is None or loop.is_closed()
+
+
+class ClientRegistry:
+    """
+    Process-wide, reference-counted httpx clients keyed by configuration, so short-lived
+    HttpxSkill(shared=True) instances reuse one connection pool (and its TLS sessions).
+
+    - ``acquire`` builds a client on first use of a key and bumps its count; ``release`` drops it.
+    - A client whose count reaches zero stays pooled for ``idle_timeout`` seconds before it is
+      closed, so back-to-back tool calls keep their warm connections.
+    - AsyncClients are shared per event loop; entries for closed loops are discarded.
+    - After ``fork()`` the child forgets every inherited client without closing it (the sockets
+      belong to the parent) and builds fresh ones.
+    """
+
+    def __init__(self, idle_timeout: float = 60.0) -> None:
+        self.idle_timeout = idle_timeout
+        self._entries: Dict[Slot, _Entry] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _after_fork(self) -> None:
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _check_fork(self) -> None:
+        if self._pid != os.getpid():  # fork without os.register_at_fork (or a forked copy)
+            self._after_fork()
+
+    def acquire(self, key: Hashable, factory: Callable[[], AnyClient], async_client: bool = False) -> Tuple[Slot, AnyClient]:
+        self._check_fork()
+        loop = None
+        if async_client:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+        slot: Slot = (key, id(loop) if loop is not None else None)
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry.loop_gone():
+                entry = None
+            if entry is None:
+                entry = self._entries[slot] = _Entry(factory(), loop=weakref.ref(loop) if loop is not None else None)
+            entry.refs += 1
+            entry.idle_since = None
+            return slot, entry.client
+
+    def _release(self, slot: Slot) -> List[_Entry]:
+        """Drop one reference; return the entries now due for closing."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None:
+                entry.refs = max(0, entry.refs - 1)
+                if entry.refs == 0:
+                    entry.idle_since = now
+            expired = [
+                s
+                for s, e in self._entries.items()
+                if e.loop_gone() or (e.refs == 0 and e.idle_since is not None and now - e.idle_since >= self.idle_timeout)
+            ]
+            return [self._entries.pop(s) for s in expired]
+
+    def release(self, slot: Slot) -> None:
+        self._check_fork()
+        for entry in self._release(slot):
+            if isinstance(entry.client, httpx.Client):
+                entry.client.close()
+            # Expired AsyncClients cannot be awaited here; their loop is gone or they are GC'd
+
+    async def arelease(self, slot: Slot) -> None:
+        self._check_fork()
+        for entry in self._release(slot):
+            if isinstance(entry.client, httpx.Client):
+                entry.client.close()
+            elif not entry.loop_gone() and entry.loop is not None and entry.loop() is asyncio.get_running_loop():
+                await entry.client.aclose()
+
+    def close_all(self) -> None:
+        """Close every pooled sync client (registered with atexit for the default registry)."""
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            if isinstance(entry.client, httpx.Client) and self._pid == os.getpid():
+                entry.client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "clients": len(self._entries),
+                "in_use": sum(1 for e in self._entries.values() if e.refs),
+                "refs": sum(e.refs for e in self._entries.values()),
+            }
+
+
+CLIENT_REGISTRY = ClientRegistry()
+atexit.register(CLIENT_REGISTRY.close_all)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=CLIENT_REGISTRY._after_fork)
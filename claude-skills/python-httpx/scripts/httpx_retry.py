@@ -0,0 +1,180 @@
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Deque, Dict, FrozenSet, Mapping, Optional
+
+import httpx
+
+from .httpx_ratelimit import parse_retry_after
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+JITTER_MODES = ("full", "decorrelated", "none")
+
+
+@dataclass
+class RetryStats:
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    # Gave up after the last allowed attempt
+    exhausted: int = 0
+    # Retry skipped because the retry budget was spent
+    budget_denied: int = 0
+    # Retry skipped because the request is not idempotent (no Idempotency-Key)
+    not_idempotent: int = 0
+    # Retry skipped because Retry-After exceeded max_retry_after
+    retry_after_too_long: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+class RetryBudget:
+    """
+    Caps retries at ``ratio`` of the requests seen in the last ``window`` seconds (plus a
+    floor of ``min_retries`` per window), so a struggling upstream is not hit by a retry storm.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window: float = 10.0) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float) -> None:
+        for events in (self._requests, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+    def record_request(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            self._requests.append(now)
+
+    def try_withdraw(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            if len(self._retries) >= max(self.min_retries, self.ratio * len(self._requests)):
+                return False
+            self._retries.append(now)
+            return True
+
+
+class RetryPolicy:
+    """
+    Shared retry rules for sync and async HttpxSkill calls.
+
+    - Retries transport errors (including timeouts) and ``retry_statuses``; never
+      cancellation or other BaseExceptions.
+    - Only idempotent methods are retried, unless the request carries an ``Idempotency-Key``
+      (added automatically to POST/PATCH with ``idempotency_keys=True``).
+    - Backoff is exponential with ``"full"`` or ``"decorrelated"`` jitter (AWS architecture
+      blog), and never shorter than the server's ``Retry-After``.
+    - A RetryBudget (default 20% of recent traffic) bounds retries across all callers.
+    """
+
+    def __init__(
+        self,
+        retries: int = 0,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+        jitter: str = "full",
+        retry_statuses: FrozenSet[int] = RETRY_STATUSES,
+        retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS,
+        idempotency_keys: bool = False,
+        idempotency_header: str = "Idempotency-Key",
+        max_retry_after: float = 60.0,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        if jitter not in JITTER_MODES:
+            raise ValueError(f"jitter must be one of {JITTER_MODES}")
+        self.retries = max(0, retries)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+        self.retry_methods = retry_methods
+        self.idempotency_keys = idempotency_keys
+        self.idempotency_header = idempotency_header
+        self.max_retry_after = max_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+        self.stats = RetryStats()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def prepare_headers(self, method: str, headers: Optional[Mapping[str, str]]) -> Optional[Dict[str, str]]:
+        """Add an Idempotency-Key to unsafe requests (once, so every attempt reuses it)."""
+        if not (self.idempotency_keys and self.retries) or method.upper() in self.retry_methods:
+            return dict(headers) if headers is not None else None
+        prepared = dict(headers or {})
+        if not any(k.lower() == self.idempotency_header.lower() for k in prepared):
+            prepared[self.idempotency_header] = str(uuid.uuid4())
+        return prepared
+
+    def start(self, method: str, headers: Optional[Mapping[str, str]] = None) -> "RetryState":
+        self._count("requests")
+        self.budget.record_request()
+        has_key = any(k.lower() == self.idempotency_header.lower() for k in (headers or {}))
+        return RetryState(self, method.upper() in self.retry_methods or has_key)
+
+    def backoff(self, attempt: int, previous: float) -> float:
+        ceiling = min(self.backoff_cap, self.backoff_base * (2 ** (attempt - 1)))
+        if self.jitter == "full":
+            return random.uniform(0, ceiling)
+        if self.jitter == "decorrelated":
+            return min(self.backoff_cap, random.uniform(self.backoff_base, max(self.backoff_base, previous * 3)))
+        return ceiling
+
+
+class RetryState:
+    """Per-request retry bookkeeping; ``next_delay`` says whether and when to try again."""
+
+    def __init__(self, policy: RetryPolicy, idempotent: bool) -> None:
+        self.policy = policy
+        self.idempotent = idempotent
+        self.attempt = 0
+        self._previous = policy.backoff_base
+
+    def next_delay(
+        self, response: Optional[httpx.Response] = None, exc: Optional[BaseException] = None
+    ) -> Optional[float]:
+        """Record a finished attempt; return the delay before the next one, or None to stop."""
+        policy = self.policy
+        self.attempt += 1
+        policy._count("attempts")
+        if exc is not None:
+            retryable = isinstance(exc, httpx.TransportError)
+        else:
+            retryable = response is not None and response.status_code in policy.retry_statuses
+        if not retryable or not policy.retries:
+            return None
+        if self.attempt > policy.retries:
+            policy._count("exhausted")
+            return None
+        if not self.idempotent:
+            policy._count("not_idempotent")
+            return None
+        delay = self._previous = policy.backoff(self.attempt, self._previous)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None:
+                if retry_after > policy.max_retry_after:
+                    policy._count("retry_after_too_long")
+                    return None
+                delay = max(delay, retry_after)
+        if not policy.budget.try_withdraw():
+            policy._count("budget_denied")
+            return None
+        policy._count("retries")
+        return delay
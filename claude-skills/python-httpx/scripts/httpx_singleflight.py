@@ -0,0 +1,316 @@
+import asyncio
+import threading
+from dataclasses import dataclass, fields
+from typing import AsyncIterator, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+
+KeyFunc = Callable[[httpx.Request], Optional[Hashable]]
+
+# Requests differing in these headers never share a response (credentials, content negotiation)
+DEFAULT_KEY_HEADERS = ("authorization", "cookie", "accept", "accept-encoding", "accept-language", "range")
+COALESCED_METHODS = frozenset({"GET", "HEAD"})
+# Bodies larger than this are not buffered for waiters; they fall back to their own request
+DEFAULT_MAX_SHARED_BYTES = 16 * 1024 * 1024
+# Response extensions that describe the leader's connection rather than the response
+_PRIVATE_EXTENSIONS = ("network_stream",)
+
+
+def key_by_headers(headers: Iterable[str] = DEFAULT_KEY_HEADERS) -> KeyFunc:
+    """Key function: method + full URL + the values of ``headers``. Returning None skips coalescing."""
+    names = tuple(h.lower() for h in headers)
+
+    def key(request: httpx.Request) -> Hashable:
+        return (request.method, str(request.url)) + tuple(tuple(request.headers.get_list(n)) for n in names)
+
+    return key
+
+
+@dataclass
+class SingleFlightStats:
+    # Requests sent upstream on behalf of a group
+    leaders: int = 0
+    # Requests answered from another request's response
+    coalesced: int = 0
+    # Waiters that had to send their own request (leader body too large or abandoned)
+    fallbacks: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+# Status, headers, raw (still content-encoded) body, extensions
+_Shared = Tuple[int, List[Tuple[bytes, bytes]], bytes, Dict[str, object]]
+
+
+class _Flight:
+    """One in-flight leader request; ``result`` is set once, then ``done`` fires."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.chunks: Optional[List[bytes]] = []
+        self.size = 0
+        self.response: Optional[httpx.Response] = None
+        self.result: Optional[_Shared] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+        self.waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._lock = threading.Lock()
+
+    def add(self, chunk: bytes) -> None:
+        if self.chunks is None:
+            return
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.chunks = None
+        else:
+            self.chunks.append(chunk)
+
+    def finish(self, complete: bool) -> None:
+        response = self.response
+        if complete and self.chunks is not None and response is not None:
+            extensions = {k: v for k, v in response.extensions.items() if k not in _PRIVATE_EXTENSIONS}
+            self.result = (response.status_code, response.headers.raw, b"".join(self.chunks), extensions)
+        self.chunks = None
+        self._resolve()
+
+    def fail(self, exc: BaseException) -> None:
+        self.error = exc
+        self._resolve()
+
+    def _resolve(self) -> None:
+        with self._lock:
+            if self.done.is_set():
+                return
+            self.done.set()
+            waiters, self.waiters = self.waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_set_done, future)
+
+    def future(self) -> "asyncio.Future[None]":
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        with self._lock:
+            if self.done.is_set():
+                future.set_result(None)
+            else:
+                self.waiters.append((loop, future))
+        return future
+
+
+def _wait_timeout(request: httpx.Request) -> Optional[float]:
+    """
+    How long a waiter may wait for its leader: the connect + read timeout it would have had on
+    its own (None when unbounded), so a slow or never-closed leader cannot stall it forever.
+    """
+    timeout = request.extensions.get("timeout") or {}
+    values = [v for v in (timeout.get("connect"), timeout.get("read")) if v is not None]
+    return sum(values) if values else None
+
+
+def _set_done(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _SharingStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, flight: _Flight, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._flight = flight
+        self._release = release
+        self._complete = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._flight.add(chunk)
+            yield chunk
+        self._complete = True
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+            self._flight.finish(self._complete)
+
+
+class _AsyncSharingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, flight: _Flight, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._flight = flight
+        self._release = release
+        self._complete = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._flight.add(chunk)
+            yield chunk
+        self._complete = True
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+            self._flight.finish(self._complete)
+
+
+class _SingleFlight:
+    def __init__(self, key: Optional[KeyFunc], methods: Iterable[str], max_shared_bytes: int) -> None:
+        self.key = key or key_by_headers()
+        self.methods = frozenset(m.upper() for m in methods)
+        self.max_shared_bytes = max_shared_bytes
+        self.stats = SingleFlightStats()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def join(self, request: httpx.Request) -> Tuple[Optional[Hashable], _Flight, bool]:
+        """Return (key, flight, is_leader); key is None when the request is not coalesced."""
+        key = self.key(request) if request.method in self.methods else None
+        with self._lock:
+            flight = self._flights.get(key) if key is not None else None
+            if flight is not None:
+                self.stats.coalesced += 1
+                return key, flight, False
+            flight = _Flight(self.max_shared_bytes)
+            if key is not None:
+                self._flights[key] = flight
+                self.stats.leaders += 1
+            return key, flight, True
+
+    def release(self, key: Optional[Hashable], flight: _Flight) -> None:
+        with self._lock:
+            if key is not None and self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def gave_up(self) -> None:
+        """A waiter's own timeout expired before the leader finished."""
+        with self._lock:
+            self.stats.fallbacks += 1
+
+    def replay(self, request: httpx.Request, flight: _Flight) -> Optional[httpx.Response]:
+        if flight.error is not None:
+            raise flight.error
+        if flight.result is None:
+            with self._lock:
+                self.stats.fallbacks += 1
+            return None
+        status, headers, body, extensions = flight.result
+        return httpx.Response(
+            status,
+            headers=headers,
+            stream=httpx.ByteStream(body),
+            request=request,
+            extensions={**extensions, "single_flight": "COALESCED"},
+        )
+
+
+class SingleFlightTransport(httpx.BaseTransport):
+    """
+    Sync transport that coalesces identical in-flight GET/HEAD requests: the first (leader)
+    goes upstream, concurrent duplicates wait and get a copy of its response, decoded
+    independently from the same raw body. ``key`` maps a request to its group (default:
+    method + URL + DEFAULT_KEY_HEADERS; return None to opt a request out). Waiters fall back to
+    their own request if the leader's body exceeds ``max_shared_bytes``, is not fully read, or
+    is not done within the waiter's own connect + read timeout, and re-raise the leader's
+    exception if it fails.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        key: Optional[KeyFunc] = None,
+        methods: Iterable[str] = COALESCED_METHODS,
+        max_shared_bytes: int = DEFAULT_MAX_SHARED_BYTES,
+    ) -> None:
+        self.transport = transport
+        self._group = _SingleFlight(key, methods, max_shared_bytes)
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self._group.stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        group = self._group
+        key, flight, leader = group.join(request)
+        if not leader:
+            if not flight.done.wait(_wait_timeout(request)):
+                group.gave_up()
+                return self.transport.handle_request(request)
+            replayed = group.replay(request, flight)
+            return replayed if replayed is not None else self.transport.handle_request(request)
+        if key is None:
+            return self.transport.handle_request(request)
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException as exc:
+            group.release(key, flight)
+            if isinstance(exc, Exception):
+                flight.fail(exc)
+            else:
+                flight.finish(False)  # leader cancelled: waiters send their own request
+            raise
+        flight.response = response
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_SharingStream(response.stream, flight, lambda: group.release(key, flight)),  # type: ignore[arg-type]
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncSingleFlightTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of SingleFlightTransport; waiters await without blocking the loop."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        key: Optional[KeyFunc] = None,
+        methods: Iterable[str] = COALESCED_METHODS,
+        max_shared_bytes: int = DEFAULT_MAX_SHARED_BYTES,
+    ) -> None:
+        self.transport = transport
+        self._group = _SingleFlight(key, methods, max_shared_bytes)
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self._group.stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        group = self._group
+        key, flight, leader = group.join(request)
+        if not leader:
+            # Shielded: a cancelled (or timed out) waiter must not cancel anything shared
+            try:
+                await asyncio.wait_for(asyncio.shield(flight.future()), _wait_timeout(request))
+            except asyncio.TimeoutError:
+                group.gave_up()
+                return await self.transport.handle_async_request(request)
+            replayed = group.replay(request, flight)
+            return replayed if replayed is not None else await self.transport.handle_async_request(request)
+        if key is None:
+            return await self.transport.handle_async_request(request)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException as exc:
+            group.release(key, flight)
+            if isinstance(exc, Exception):
+                flight.fail(exc)
+            else:
+                flight.finish(False)  # leader cancelled: waiters send their own request
+            raise
+        flight.response = response
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_AsyncSharingStream(response.stream, flight, lambda: group.release(key, flight)),  # type: ignore[arg-type]
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -1,9 +1,42 @@
 import asyncio
+import os
 import time
-from typing import Any, Dict, Optional, Union, Callable, Iterable
+from typing import Any, AsyncIterator, Dict, Hashable, Iterator, List, Optional, Tuple, Union, Callable, Iterable
 
 import httpx
 
+from .httpx_batch import DEFAULT_PER_HOST, FetchResult, RequestLike, amap_requests, map_requests
+from .httpx_cache import AsyncCacheTransport, CacheStats, CacheStorage, CacheTransport, ResponseCache
+from .httpx_download import adownload, download
+from .httpx_metrics import ATTEMPT_EXTENSION, AsyncMetricsTransport, HttpMetrics, MetricsTransport
+from .httpx_paginate import Pagination, apaginate, paginate
+from .httpx_ratelimit import CircuitBreaker, RateLimiter
+from .httpx_registry import CLIENT_REGISTRY, ClientRegistry, Slot
+from .httpx_retry import RetryPolicy, RetryState, RetryStats
+from .httpx_singleflight import AsyncSingleFlightTransport, KeyFunc, SingleFlightStats, SingleFlightTransport
+from .httpx_streaming import (
+    DEFAULT_MAX_ITEM_BYTES,
+    SSEEvent,
+    aiter_json_items,
+    aiter_ndjson,
+    aiter_sse,
+    iter_json_items,
+    iter_ndjson,
+    iter_sse,
+)
+from .httpx_upload import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PART_SIZE,
+    MultipartFileStream,
+    ProgressCallback,
+    atus_upload,
+    aupload_parts,
+    raw_body,
+    stream_request,
+    tus_upload,
+    upload_parts,
+)
+
 JsonType = Union[dict, list, str, int, float, bool, None]
 
 
@@ -15,25 +48,25 @@ def _default_limits() -> httpx.Limits:
     return httpx.Limits(max_connections=100, max_keepalive_connections=20)
 
 
-def _should_retry(exc: BaseException, response: Optional[httpx.Response]) -> bool:
-    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError)):
-        return True
-    if response is not None and 500 <= response.status_code < 600:
-        return True
-    return False
-
-
-def _sleep_backoff(attempt: int, base: float = 0.5, cap: float = 8.0) -> None:
-    delay = min(cap, base * (2 ** (attempt - 1)))
-    time.sleep(delay)
+def _find_transport(client: Union[httpx.Client, httpx.AsyncClient], types: Tuple[type, ...]) -> Any:
+    # Walk the wrapper transports (``.transport``) below the client's own transport
+    transport = getattr(client, "_transport", None)
+    while transport is not None and not isinstance(transport, types):
+        transport = getattr(transport, "transport", None)
+    return transport
 
 
 class HttpxSkill:
     """
     A thin convenience wrapper around httpx for LLM coders.
     - Provides sync + async helpers
-    - Adds optional retry-with-backoff for transient errors
+    - Adds optional retries with jittered backoff, a retry budget and idempotency awareness (RetryPolicy)
     - Centralizes client creation with sane defaults
+    - Optional RFC 9111 response cache (``cache=True`` for memory, or a CacheStorage / ResponseCache)
+    - Optional client-side rate limiting and per-host circuit breaking, shared by sync and async calls
+    - Optional single-flight coalescing of identical concurrent GET/HEAD requests (``single_flight=True``)
+    - Lazily built clients; ``shared=True`` reuses a process-wide pooled client per configuration
+    - Optional per-request phase timings and metrics (``metrics=True``; nothing is installed otherwise)
     """
 
     def __init__(
@@ -48,6 +81,16 @@ class HttpxSkill:
         verify: Union[bool, str] = True,
         retries: int = 0,
         backoff_base: float = 0.5,
+        cache: Union[bool, CacheStorage, ResponseCache, None] = None,
+        transport: Union[httpx.BaseTransport, httpx.AsyncBaseTransport, None] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        max_retry_after: float = 60.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        metrics: Union[bool, HttpMetrics, None] = None,
+        metrics_log_level: Optional[int] = None,
+        single_flight: Union[bool, KeyFunc, None] = None,
+        shared: Union[bool, ClientRegistry] = False,
     ) -> None:
         self.async_mode = async_mode
         self.base_url = base_url
@@ -57,32 +100,221 @@ class HttpxSkill:
         self.http2 = http2
         self.proxies = proxies
         self.verify = verify
-        self.retries = max(0, retries)
-        self.backoff_base = backoff_base
-
-        if async_mode:
-            self._client = httpx.AsyncClient(
-                base_url=base_url,
+        # ``retries``/``backoff_base``/``max_retry_after`` configure the default policy; pass a
+        # RetryPolicy for jitter mode, budget or Idempotency-Key settings (and to share it)
+        self.retry_policy = retry_policy or RetryPolicy(
+            retries=retries, backoff_base=backoff_base, max_retry_after=max_retry_after
+        )
+        self.retries = self.retry_policy.retries
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        if isinstance(cache, ResponseCache):
+            self.cache: Optional[ResponseCache] = cache
+        elif isinstance(cache, CacheStorage):
+            self.cache = ResponseCache(cache)
+        else:
+            self.cache = ResponseCache() if cache else None
+        if isinstance(metrics, HttpMetrics):
+            self.metrics: Optional[HttpMetrics] = metrics
+        else:
+            self.metrics = HttpMetrics() if metrics else None
+
+        self.metrics_log_level = metrics_log_level
+        self.single_flight = single_flight
+        self.transport = transport
+        # Client construction is deferred to first use (see ``_client``)
+        self._registry: Optional[ClientRegistry] = (
+            (shared if isinstance(shared, ClientRegistry) else CLIENT_REGISTRY) if shared else None
+        )
+        self._slot: Optional[Slot] = None
+        self._client_obj: Union[httpx.Client, httpx.AsyncClient, None] = None
+        self._pid = os.getpid()
+        self._single_flight: Union[SingleFlightTransport, AsyncSingleFlightTransport, None] = None
+        # Shared clients are keyed by what was passed in, so ``cache=True`` instances share one cache
+        self._config = (cache, metrics)
+
+    def _wrapped_proxy(self) -> Optional[str]:
+        """
+        The single proxy URL to give the innermost transport when the cache, single-flight or
+        metrics transports are in use. httpx turns ``proxies`` into mounts, which take
+        precedence over ``transport`` and would silently bypass those wrappers.
+        """
+        proxies = self.proxies
+        if proxies is None or isinstance(proxies, str):
+            return proxies
+        urls = set(proxies.values())
+        if len(urls) == 1 and set(proxies) <= {"all://", "http://", "https://"}:
+            return urls.pop()
+        raise ValueError(
+            "per-pattern proxies cannot be combined with cache, metrics or single_flight; pass one proxy URL"
+        )
+
+    def _build_client(self) -> Union[httpx.Client, httpx.AsyncClient]:
+        transport = self.transport
+        verify, http2 = self.verify, self.http2
+        proxies = self.proxies
+        proxy = None
+        if self.cache is not None or self.single_flight or self.metrics is not None:
+            if transport is not None and proxies is not None:
+                raise ValueError("proxies cannot be applied to a custom transport wrapped by cache, metrics or single_flight")
+            proxy, proxies = self._wrapped_proxy(), None
+        transport_cls = httpx.AsyncHTTPTransport if self.async_mode else httpx.HTTPTransport
+
+        def inner() -> Union[httpx.BaseTransport, httpx.AsyncBaseTransport]:
+            if transport is not None:
+                return transport
+            return transport_cls(verify=verify, http2=http2, limits=self.limits, proxy=proxy)
+
+        if self.async_mode:
+            if self.cache is not None:
+                transport = AsyncCacheTransport(inner(), self.cache)
+            if self.single_flight:
+                # Above the cache, so a stampede on a cold key costs one upstream request
+                transport = AsyncSingleFlightTransport(
+                    inner(), key=self.single_flight if callable(self.single_flight) else None
+                )
+            if self.metrics is not None:
+                # Outermost, so cache hits are recorded too (with cache_status and no network phases)
+                transport = AsyncMetricsTransport(inner(), self.metrics, self.metrics_log_level)
+            return httpx.AsyncClient(
+                base_url=self.base_url or "",
                 headers=self.headers,
                 timeout=self.timeout,
                 limits=self.limits,
                 http2=http2,
                 proxies=proxies,
                 verify=verify,
+                transport=transport,
             )
+        if self.cache is not None:
+            transport = CacheTransport(inner(), self.cache)
+        if self.single_flight:
+            transport = SingleFlightTransport(inner(), key=self.single_flight if callable(self.single_flight) else None)
+        if self.metrics is not None:
+            transport = MetricsTransport(inner(), self.metrics, self.metrics_log_level)
+        return httpx.Client(
+            base_url=self.base_url or "",
+            headers=self.headers,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=http2,
+            proxies=proxies,
+            verify=verify,
+            transport=transport,
+        )
+
+    def _registry_key(self) -> Hashable:
+        def ident(value: Any) -> Hashable:
+            if value is None or isinstance(value, (bool, int, float, str)):
+                return value
+            if isinstance(value, dict):
+                return tuple(sorted(value.items()))
+            return ("id", id(value))  # kept alive by the pooled client, so the id is stable
+
+        t, lim = self.timeout, self.limits
+        return (
+            self.async_mode,
+            self.base_url or "",
+            tuple(sorted((k.lower(), v) for k, v in self.headers.items())),
+            (t.connect, t.read, t.write, t.pool),
+            (lim.max_connections, lim.max_keepalive_connections, lim.keepalive_expiry),
+            self.http2,
+            ident(self.proxies),
+            ident(self.verify),
+            ident(self.transport),
+            ident(self._config[0]),
+            ident(self._config[1]),
+            self.metrics_log_level,
+            ident(self.single_flight),
+        )
+
+    @property
+    def _client(self) -> Union[httpx.Client, httpx.AsyncClient]:
+        if self._client_obj is not None and self._pid == os.getpid():
+            return self._client_obj
+        # First use, or first use in a forked child: the parent's sockets must not be reused
+        self._pid = os.getpid()
+        if self._registry is None:
+            self._client_obj = self._build_client()
         else:
-            self._client = httpx.Client(
-                base_url=base_url,
-                headers=self.headers,
-                timeout=self.timeout,
-                limits=self.limits,
-                http2=http2,
-                proxies=proxies,
-                verify=verify,
+            self._slot, self._client_obj = self._registry.acquire(
+                self._registry_key(), self._build_client, async_client=self.async_mode
             )
+        self._single_flight = _find_transport(self._client_obj, (SingleFlightTransport, AsyncSingleFlightTransport))
+        if self._registry is None:
+            return self._client_obj
+        # Adopt the pooled client's cache / metrics objects (another instance may have built it)
+        cache = _find_transport(self._client_obj, (CacheTransport, AsyncCacheTransport))
+        if cache is not None:
+            self.cache = cache.cache
+        metrics = _find_transport(self._client_obj, (MetricsTransport, AsyncMetricsTransport))
+        if metrics is not None:
+            self.metrics = metrics.metrics
+        return self._client_obj
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        self._client  # noqa: B018 - a shared client may carry another instance's cache
+        return self.cache.stats if self.cache is not None else None
+
+    @property
+    def single_flight_stats(self) -> Optional[SingleFlightStats]:
+        if self.single_flight and self._single_flight is None:
+            self._client  # noqa: B018 - built on first use
+        return self._single_flight.stats if self._single_flight is not None else None
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        return self.retry_policy.stats
+
+    def metrics_text(self, prefix: str = "httpx_skill") -> str:
+        """Request metrics plus retry-policy counters in Prometheus text format ("" when metrics are off)."""
+        if self.metrics is None:
+            return ""
+        lines = [self.metrics.to_prometheus(prefix)]
+        for name, value in self.retry_stats.as_dict().items():
+            lines.append(f"# TYPE {prefix}_retry_policy_{name}_total counter\n{prefix}_retry_policy_{name}_total {value}\n")
+        return "".join(lines)
+
+    # ---------- rate limiting / circuit breaking ----------
+    def _target(self, url: str) -> httpx.URL:
+        return self._client.base_url.join(url)
+
+    def _before_attempt(self, target: httpx.URL) -> Tuple[float, bool]:
+        """
+        Fail fast on an open circuit; return how long the rate limiter wants us to wait and
+        whether this attempt holds a half-open trial slot.
+        """
+        trial = self.circuit_breaker.before(target.host) if self.circuit_breaker is not None else False
+        wait = self.rate_limiter.reserve(target) if self.rate_limiter is not None else 0.0
+        return wait, trial
+
+    def _after_attempt(self, target: httpx.URL, resp: Optional[httpx.Response], exc: Optional[BaseException] = None) -> None:
+        if resp is not None and self.rate_limiter is not None:
+            self.rate_limiter.observe(target, resp)
+        if self.circuit_breaker is None:
+            return
+        if isinstance(exc, httpx.TransportError) or (resp is not None and resp.status_code >= 500):
+            self.circuit_breaker.record_failure(target.host)
+        elif resp is not None:
+            self.circuit_breaker.record_success(target.host)
+        else:  # not a verdict on the host (e.g. a hook raised), but the trial slot must be freed
+            self.circuit_breaker.release(target.host)
+
+    def _abort_attempt(self, target: httpx.URL, failed_probe: bool) -> None:
+        """
+        The attempt was cancelled or timed out by the caller. That only says something about
+        the host when it was a half-open probe that reached the network (a probe that hangs
+        past the caller's patience counts as a failure); otherwise just free the slot.
+        """
+        if self.circuit_breaker is None:
+            return
+        if failed_probe:
+            self.circuit_breaker.record_failure(target.host)
+        else:
+            self.circuit_breaker.release(target.host)
 
-    # ---------- internal retry helper ----------
-    def _request_with_retry(
+    def _build_request(
         self,
         method: str,
         url: str,
@@ -93,78 +325,89 @@ class HttpxSkill:
         headers: Optional[Dict[str, str]] = None,
         files: Optional[Dict[str, Any]] = None,
         stream: Optional[Iterable[bytes]] = None,
-    ) -> httpx.Response:
-        attempt = 0
-        last_exc: Optional[BaseException] = None
-        last_resp: Optional[httpx.Response] = None
+    ) -> httpx.Request:
+        if isinstance(stream, (httpx.SyncByteStream, httpx.AsyncByteStream)):
+            # Re-iterable upload bodies (httpx_upload) are sent as-is so retries can resend them
+            request = stream_request(self._client, method, url, stream, headers or {})
+            if params:
+                request.url = request.url.copy_merge_params(params)
+            return request
+        return self._client.build_request(
+            method, url, data=data, json=json, params=params, headers=headers, files=files, content=stream
+        )
+
+    # ---------- internal retry helper ----------
+    def _start_retry(self, method: str, url: str, kwargs: Dict[str, Any]) -> Tuple[httpx.URL, RetryState]:
+        # Headers are fixed up front so an auto-generated Idempotency-Key is reused by every attempt
+        kwargs["headers"] = self.retry_policy.prepare_headers(method, kwargs.get("headers"))
+        return self._target(url), self.retry_policy.start(method, kwargs["headers"])
+
+    def _finish_attempt(
+        self,
+        target: httpx.URL,
+        retry: RetryState,
+        resp: Optional[httpx.Response],
+        exc: Optional[Exception],
+    ) -> Optional[float]:
+        """Feed one attempt to the limiter/breaker and the retry policy; the delay to retry after, or None."""
+        self._after_attempt(target, resp, exc)
+        return retry.next_delay(resp, exc)
+
+    def _request_with_retry(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        target, retry = self._start_retry(method, url, kwargs)
         while True:
-            attempt += 1
+            resp: Optional[httpx.Response] = None
+            exc: Optional[Exception] = None
+            request = self._build_request(method, url, **kwargs)
+            if self.metrics is not None:
+                request.extensions[ATTEMPT_EXTENSION] = retry.attempt
+            wait, trial = self._before_attempt(target)
+            sent = False
             try:
-                resp = self._client.request(
-                    method,
-                    url,
-                    data=data,
-                    json=json,
-                    params=params,
-                    headers=headers,
-                    files=files,
-                    content=stream,
-                )
-                last_resp = resp
-                if self.retries and 500 <= resp.status_code < 600:
-                    if attempt <= self.retries:
-                        _sleep_backoff(attempt, self.backoff_base)
-                        continue
-                return resp
-            except BaseException as exc:  # noqa: BLE001
-                last_exc = exc
-                if self.retries and _should_retry(exc, last_resp):
-                    if attempt <= self.retries:
-                        _sleep_backoff(attempt, self.backoff_base)
-                        continue
+                if wait > 0:
+                    time.sleep(wait)
+                sent = True
+                try:
+                    resp = self._client.send(request)
+                except Exception as e:
+                    exc = e
+            except BaseException:  # KeyboardInterrupt / timeouts raised into the thread
+                self._abort_attempt(target, trial and sent)
                 raise
-
-    async def _arequest_with_retry(
-        self,
-        method: str,
-        url: str,
-        *,
-        data: Optional[Union[bytes, dict]] = None,
-        json: Optional[JsonType] = None,
-        params: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None,
-        files: Optional[Dict[str, Any]] = None,
-        stream: Optional[Iterable[bytes]] = None,
-    ) -> httpx.Response:
-        attempt = 0
-        last_exc: Optional[BaseException] = None
-        last_resp: Optional[httpx.Response] = None
+            delay = self._finish_attempt(target, retry, resp, exc)
+            if delay is None:
+                if exc is not None:
+                    raise exc
+                return resp  # type: ignore[return-value]
+            time.sleep(delay)
+
+    async def _arequest_with_retry(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        target, retry = self._start_retry(method, url, kwargs)
         while True:
-            attempt += 1
+            resp: Optional[httpx.Response] = None
+            exc: Optional[Exception] = None
+            request = self._build_request(method, url, **kwargs)
+            if self.metrics is not None:
+                request.extensions[ATTEMPT_EXTENSION] = retry.attempt
+            wait, trial = self._before_attempt(target)
+            sent = False
             try:
-                resp = await self._client.request(
-                    method,
-                    url,
-                    data=data,
-                    json=json,
-                    params=params,
-                    headers=headers,
-                    files=files,
-                    content=stream,
-                )
-                last_resp = resp
-                if self.retries and 500 <= resp.status_code < 600:
-                    if attempt <= self.retries:
-                        await asyncio.sleep(min(8.0, self.backoff_base * (2 ** (attempt - 1))))
-                        continue
-                return resp
-            except BaseException as exc:  # noqa: BLE001
-                last_exc = exc
-                if self.retries and _should_retry(exc, last_resp):
-                    if attempt <= self.retries:
-                        await asyncio.sleep(min(8.0, self.backoff_base * (2 ** (attempt - 1))))
-                        continue
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                sent = True
+                try:
+                    resp = await self._client.send(request)
+                except Exception as e:
+                    exc = e
+            except BaseException:  # cancellation (e.g. asyncio.wait_for timing out) frees the trial
+                self._abort_attempt(target, trial and sent)
                 raise
+            delay = self._finish_attempt(target, retry, resp, exc)
+            if delay is None:
+                if exc is not None:
+                    raise exc
+                return resp  # type: ignore[return-value]
+            await asyncio.sleep(delay)
 
     # ---------- public sync API ----------
     def get(self, url: str, **kwargs: Any) -> httpx.Response:
@@ -179,7 +422,22 @@ class HttpxSkill:
     def delete(self, url: str, **kwargs: Any) -> httpx.Response:
         return self._request_with_retry("DELETE", url, **kwargs)
 
-    def stream_download(self, url: str, path: str, chunk_size: int = 65536) -> None:
+    def stream_download(
+        self,
+        url: str,
+        path: str,
+        chunk_size: int = 65536,
+        segments: int = 1,
+        checksum: Optional[str] = None,
+    ) -> None:
+        """
+        Stream ``url`` to ``path``. With ``segments > 1`` or a ``checksum`` (``"sha256:<hex>"``)
+        the file is fetched as parallel byte ranges into a preallocated ``<path>.part``, resumes
+        from its ``.part.json`` sidecar after a failure, and is verified before being renamed.
+        """
+        if segments > 1 or checksum:
+            download(self._client, url, path, segments, checksum, chunk_size, retries=max(self.retries, 3))
+            return
         with self._client.stream("GET", url) as r:
             r.raise_for_status()
             with open(path, "wb") as f:
@@ -193,11 +451,44 @@ class HttpxSkill:
         field_name: str = "file",
         content_type: Optional[str] = None,
         extra_fields: Optional[Dict[str, Any]] = None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
     ) -> httpx.Response:
-        extra_fields = extra_fields or {}
-        with open(file_path, "rb") as fp:
-            files = {field_name: (file_path, fp, content_type)}
-            return self.post(url, files=files, data=extra_fields)
+        """Multipart upload streamed from disk in ``chunk_size`` buffers; ``progress(sent, total)``."""
+        body = MultipartFileStream(
+            file_path, field_name, content_type=content_type, fields=extra_fields, chunk_size=chunk_size, progress=progress
+        )
+        return self.post(url, stream=body, headers=body.headers)
+
+    def upload_raw(
+        self,
+        url: str,
+        file_path: str,
+        method: str = "PUT",
+        content_type: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> httpx.Response:
+        """Send a file as the raw request body (e.g. to a presigned URL), streamed from disk."""
+        body, headers = raw_body(file_path, chunk_size, progress)
+        if content_type:
+            headers["Content-Type"] = content_type
+        return self._request_with_retry(method, url, stream=body, headers=headers)
+
+    def tus_upload(self, endpoint: str, file_path: str, upload_url: Optional[str] = None, **kwargs: Any) -> str:
+        """Resumable tus upload; returns the upload URL (pass it back as ``upload_url`` to resume)."""
+        return tus_upload(self._client, endpoint, file_path, upload_url, **kwargs)
+
+    def upload_parts(
+        self,
+        file_path: str,
+        part_urls: List[str],
+        part_size: int = DEFAULT_PART_SIZE,
+        concurrency: int = 4,
+        progress: Optional[ProgressCallback] = None,
+    ) -> List[Tuple[int, str]]:
+        """S3-style multipart: PUT parts to presigned URLs in parallel, return ``[(part_number, etag)]``."""
+        return upload_parts(self._client, file_path, part_urls, part_size, concurrency, progress)
 
     # ---------- public async API ----------
     async def aget(self, url: str, **kwargs: Any) -> httpx.Response:
@@ -212,7 +503,17 @@ class HttpxSkill:
     async def adelete(self, url: str, **kwargs: Any) -> httpx.Response:
         return await self._arequest_with_retry("DELETE", url, **kwargs)
 
-    async def astream_download(self, url: str, path: str, chunk_size: int = 65536) -> None:
+    async def astream_download(
+        self,
+        url: str,
+        path: str,
+        chunk_size: int = 65536,
+        segments: int = 1,
+        checksum: Optional[str] = None,
+    ) -> None:
+        if segments > 1 or checksum:
+            await adownload(self._client, url, path, segments, checksum, chunk_size, retries=max(self.retries, 3))
+            return
         async with self._client.stream("GET", url) as r:
             r.raise_for_status()
             with open(path, "wb") as f:
@@ -226,20 +527,239 @@ class HttpxSkill:
         field_name: str = "file",
         content_type: Optional[str] = None,
         extra_fields: Optional[Dict[str, Any]] = None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> httpx.Response:
+        body = MultipartFileStream(
+            file_path, field_name, content_type=content_type, fields=extra_fields, chunk_size=chunk_size, progress=progress
+        )
+        return await self.apost(url, stream=body, headers=body.headers)
+
+    async def aupload_raw(
+        self,
+        url: str,
+        file_path: str,
+        method: str = "PUT",
+        content_type: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
     ) -> httpx.Response:
-        extra_fields = extra_fields or {}
-        with open(file_path, "rb") as fp:
-            files = {field_name: (file_path, fp, content_type)}
-            return await self.apost(url, files=files, data=extra_fields)
+        body, headers = raw_body(file_path, chunk_size, progress)
+        if content_type:
+            headers["Content-Type"] = content_type
+        return await self._arequest_with_retry(method, url, stream=body, headers=headers)
+
+    async def atus_upload(self, endpoint: str, file_path: str, upload_url: Optional[str] = None, **kwargs: Any) -> str:
+        return await atus_upload(self._client, endpoint, file_path, upload_url, **kwargs)
+
+    async def aupload_parts(
+        self,
+        file_path: str,
+        part_urls: List[str],
+        part_size: int = DEFAULT_PART_SIZE,
+        concurrency: int = 4,
+        progress: Optional[ProgressCallback] = None,
+    ) -> List[Tuple[int, str]]:
+        return await aupload_parts(self._client, file_path, part_urls, part_size, concurrency, progress)
+
+    # ---------- streaming JSON / NDJSON / SSE ----------
+    def _stream_items(
+        self,
+        parse: Callable[..., Iterator[Any]],
+        url: str,
+        method: str,
+        accept: str,
+        limit_kw: Dict[str, Any],
+        kwargs: Dict[str, Any],
+    ) -> Iterator[Any]:
+        headers = {"Accept": accept, **(kwargs.pop("headers", None) or {})}
+        with self._client.stream(method, url, headers=headers, **kwargs) as r:
+            r.raise_for_status()
+            yield from parse(r.iter_bytes(), **limit_kw)
+
+    async def _astream_items(
+        self,
+        parse: Callable[..., AsyncIterator[Any]],
+        url: str,
+        method: str,
+        accept: str,
+        limit_kw: Dict[str, Any],
+        kwargs: Dict[str, Any],
+    ) -> AsyncIterator[Any]:
+        headers = {"Accept": accept, **(kwargs.pop("headers", None) or {})}
+        async with self._client.stream(method, url, headers=headers, **kwargs) as r:
+            r.raise_for_status()
+            async for item in parse(r.aiter_bytes(), **limit_kw):
+                yield item
+
+    def iter_json_items(
+        self, url: str, key: Optional[str] = None, method: str = "GET", max_item_bytes: int = DEFAULT_MAX_ITEM_BYTES, **kwargs: Any
+    ) -> Iterator[Any]:
+        """
+        Yield the items of a JSON array response one at a time (or of the array under ``key`` in
+        a top-level object), buffering only the current item. ``kwargs`` go to ``client.stream``.
+        """
+        limits = {"key": key, "max_item_bytes": max_item_bytes}
+        return self._stream_items(iter_json_items, url, method, "application/json", limits, kwargs)
+
+    def iter_ndjson(self, url: str, method: str = "GET", max_line_bytes: int = DEFAULT_MAX_ITEM_BYTES, **kwargs: Any) -> Iterator[Any]:
+        """Yield one object per line of an NDJSON / JSON Lines response."""
+        limits = {"max_line_bytes": max_line_bytes}
+        return self._stream_items(iter_ndjson, url, method, "application/x-ndjson", limits, kwargs)
+
+    def iter_sse(self, url: str, method: str = "GET", max_event_bytes: int = DEFAULT_MAX_ITEM_BYTES, **kwargs: Any) -> Iterator[SSEEvent]:
+        """Yield SSEEvent objects from a ``text/event-stream`` response (``event.json()`` decodes data)."""
+        limits = {"max_event_bytes": max_event_bytes}
+        return self._stream_items(iter_sse, url, method, "text/event-stream", limits, kwargs)
+
+    def aiter_json_items(
+        self, url: str, key: Optional[str] = None, method: str = "GET", max_item_bytes: int = DEFAULT_MAX_ITEM_BYTES, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        limits = {"key": key, "max_item_bytes": max_item_bytes}
+        return self._astream_items(aiter_json_items, url, method, "application/json", limits, kwargs)
+
+    def aiter_ndjson(self, url: str, method: str = "GET", max_line_bytes: int = DEFAULT_MAX_ITEM_BYTES, **kwargs: Any) -> AsyncIterator[Any]:
+        limits = {"max_line_bytes": max_line_bytes}
+        return self._astream_items(aiter_ndjson, url, method, "application/x-ndjson", limits, kwargs)
+
+    def aiter_sse(self, url: str, method: str = "GET", max_event_bytes: int = DEFAULT_MAX_ITEM_BYTES, **kwargs: Any) -> AsyncIterator[SSEEvent]:
+        limits = {"max_event_bytes": max_event_bytes}
+        return self._astream_items(aiter_sse, url, method, "text/event-stream", limits, kwargs)
+
+    # ---------- pagination ----------
+    def paginate(
+        self,
+        url: str,
+        strategy: Optional[Pagination] = None,
+        params: Optional[Dict[str, Any]] = None,
+        max_items: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        prefetch: bool = True,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        """
+        Lazily yield items across pages (default strategy: ``Link: rel="next"`` with the body as
+        the item list). The next page is fetched while the current one is consumed; ``kwargs``
+        (e.g. ``headers``) are passed to every ``get``.
+        """
+        return paginate(
+            lambda page_url, page_params: self.get(page_url, params=page_params, **kwargs),
+            url, strategy, params, max_items, max_pages, prefetch,
+        )  # fmt: skip
+
+    def apaginate(
+        self,
+        url: str,
+        strategy: Optional[Pagination] = None,
+        params: Optional[Dict[str, Any]] = None,
+        max_items: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        prefetch: bool = True,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        return apaginate(
+            lambda page_url, page_params: self.aget(page_url, params=page_params, **kwargs),
+            url, strategy, params, max_items, max_pages, prefetch,
+        )  # fmt: skip
+
+    # ---------- batch API ----------
+    def _default_concurrency(self) -> int:
+        return self.limits.max_connections or 100
+
+    def fetch_many(
+        self,
+        requests: Iterable[RequestLike],
+        concurrency: Optional[int] = None,
+        per_host: int = DEFAULT_PER_HOST,
+        raise_for_status: bool = False,
+    ) -> List[FetchResult]:
+        """
+        Send many requests on a thread pool (sync mode) and return results in input order.
+        Each request is retried per ``retries``; failures are returned on the result, not raised.
+        """
+        return list(self.map(requests, concurrency, per_host, ordered=True, raise_for_status=raise_for_status))
+
+    def map(
+        self,
+        requests: Iterable[RequestLike],
+        concurrency: Optional[int] = None,
+        per_host: int = DEFAULT_PER_HOST,
+        ordered: bool = False,
+        raise_for_status: bool = False,
+    ) -> Iterator[FetchResult]:
+        if self.async_mode:
+            raise RuntimeError("map/fetch_many need a sync HttpxSkill; use amap/afetch_many in async mode")
+        return map_requests(
+            self._request_with_retry,
+            requests,
+            concurrency=concurrency or self._default_concurrency(),
+            per_host=per_host,
+            ordered=ordered,
+            raise_for_status=raise_for_status,
+            base_url=self._client.base_url,
+        )
+
+    async def afetch_many(
+        self,
+        requests: Iterable[RequestLike],
+        concurrency: Optional[int] = None,
+        per_host: int = DEFAULT_PER_HOST,
+        raise_for_status: bool = False,
+    ) -> List[FetchResult]:
+        """Async ``fetch_many``: bounded globally and per host, results in input order."""
+        return [
+            r
+            async for r in self.amap(requests, concurrency, per_host, ordered=True, raise_for_status=raise_for_status)
+        ]
+
+    def amap(
+        self,
+        requests: Iterable[RequestLike],
+        concurrency: Optional[int] = None,
+        per_host: int = DEFAULT_PER_HOST,
+        ordered: bool = False,
+        raise_for_status: bool = False,
+    ) -> AsyncIterator[FetchResult]:
+        """
+        Stream results for many requests as they complete (or in input order with ``ordered=True``).
+
+            async for result in skill.amap(urls, concurrency=50, per_host=10):
+                if result.ok: ...
+        """
+        if not self.async_mode:
+            raise RuntimeError("amap/afetch_many need HttpxSkill(async_mode=True)")
+        return amap_requests(
+            self._arequest_with_retry,
+            requests,
+            concurrency=concurrency or self._default_concurrency(),
+            per_host=per_host,
+            ordered=ordered,
+            raise_for_status=raise_for_status,
+            base_url=self._client.base_url,
+        )
 
     # ---------- cleanup ----------
     def close(self) -> None:
-        if isinstance(self._client, httpx.Client):
-            self._client.close()
+        client = self._client_obj
+        if not isinstance(client, httpx.Client) or self._pid != os.getpid():
+            return
+        if self._registry is not None and self._slot is not None:
+            # Hand the pooled client back; a later call on this instance acquires it again
+            self._client_obj = None
+            self._registry.release(self._slot)
+        else:
+            client.close()
 
     async def aclose(self) -> None:
-        if isinstance(self._client, httpx.AsyncClient):
-            await self._client.aclose()
+        client = self._client_obj
+        if not isinstance(client, httpx.AsyncClient) or self._pid != os.getpid():
+            return
+        if self._registry is not None and self._slot is not None:
+            # Hand the pooled client back; a later call on this instance acquires it again
+            self._client_obj = None
+            await self._registry.arelease(self._slot)
+        else:
+            await client.aclose()
 
     # Context manager helpers
     def __enter__(self):
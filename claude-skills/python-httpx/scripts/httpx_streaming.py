@@ -0,0 +1,318 @@
+import codecs
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+try:  # optional fast decoder
+    import orjson
+
+    def loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+except ImportError:  # pragma: no cover - depends on the environment
+
+    def loads(data: bytes) -> Any:
+        return json.loads(data)
+
+
+# A single array item / NDJSON line / SSE event larger than this raises ValueError
+DEFAULT_MAX_ITEM_BYTES = 16 * 1024 * 1024
+
+_WS = b" \t\r\n"
+_STRUCTURE = re.compile(rb'["\[\]{},]')
+_STRING_END = re.compile(rb'["\\]')
+
+
+# ---------- parsers (push style: feed chunks, get finished objects) ----------
+class JsonArrayParser:
+    """
+    Incremental parser for a top-level JSON array, or the array under ``key`` of a top-level
+    object (``{"data": [...], ...}``). Only the item being read is buffered; each complete
+    item is decoded on its own.
+    """
+
+    def __init__(self, key: Optional[str] = None, max_item_bytes: int = DEFAULT_MAX_ITEM_BYTES) -> None:
+        self.key = key
+        self.max_item_bytes = max_item_bytes
+        self._buf = bytearray()
+        self._pos = 0
+        self._state = "start"
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+        self._matched = False
+
+    def _skip_ws(self, extra: bytes = b"") -> Optional[int]:
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and (buf[pos] in _WS or buf[pos] in extra):
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _begin_value(self, state: str) -> None:
+        self._state, self._start, self._depth, self._in_string = state, self._pos, 0, False
+
+    def _scan_value(self) -> Optional[bytes]:
+        """Advance through the current value; return its bytes once complete, else None."""
+        buf, pos = self._buf, self._pos
+        while True:
+            if self._in_string:
+                m = _STRING_END.search(buf, pos)
+                if m is None:
+                    pos = len(buf)
+                    break
+                if buf[m.start()] == 0x5C:  # backslash: skip the escaped byte
+                    if m.start() + 1 >= len(buf):
+                        pos = m.start()
+                        break
+                    pos = m.start() + 2
+                    continue
+                pos = m.start() + 1
+                self._in_string = False
+                if self._depth == 0:
+                    return self._end_value(pos, pos)
+                continue
+            m = _STRUCTURE.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                break
+            c, at = buf[m.start()], m.start()
+            if c == 0x22:  # "
+                self._in_string = True
+                pos = at + 1
+            elif c in b"[{":
+                self._depth += 1
+                pos = at + 1
+            elif c in b"]}":
+                if self._depth == 0:
+                    return self._end_value(at, at)  # scalar followed by the closing bracket
+                self._depth -= 1
+                pos = at + 1
+                if self._depth == 0:
+                    return self._end_value(pos, pos)
+            else:  # ,
+                if self._depth == 0:
+                    return self._end_value(at, at)
+                pos = at + 1
+        self._pos = pos
+        if pos - self._start > self.max_item_bytes:
+            raise ValueError(f"JSON item exceeds max_item_bytes ({self.max_item_bytes})")
+        return None
+
+    def _end_value(self, end: int, resume: int) -> bytes:
+        value = bytes(self._buf[self._start:end]).strip()
+        del self._buf[:resume]
+        self._pos = 0
+        return value
+
+    def feed(self, data: bytes) -> List[Any]:
+        self._buf += data
+        items: List[Any] = []
+        while True:
+            state = self._state
+            if state == "start":
+                c = self._skip_ws()
+                if c is None:
+                    break
+                expected = b"{" if self.key is not None else b"["
+                if c != expected[0]:
+                    raise ValueError(f"Expected {expected.decode()!r} at the start of the JSON document")
+                self._pos += 1
+                self._state = "key" if self.key is not None else "items"
+            elif state == "items":
+                c = self._skip_ws(b",")
+                if c is None:
+                    break
+                if c == 0x5D:  # ]
+                    self._pos += 1
+                    self._state = "done"
+                else:
+                    self._begin_value("value")
+            elif state == "key":
+                c = self._skip_ws(b",")
+                if c is None:
+                    break
+                if c == 0x7D:  # } without finding the key
+                    self._pos += 1
+                    self._state = "done"
+                elif c == 0x22:
+                    self._begin_value("key_name")
+                else:
+                    raise ValueError("Expected an object key")
+            elif state == "key_name":
+                name = self._scan_value()
+                if name is None:
+                    break
+                self._state = "colon"
+                self._matched = loads(name) == self.key
+            elif state == "colon":
+                c = self._skip_ws(b":")
+                if c is None:
+                    break
+                if self._matched:
+                    if c != 0x5B:
+                        raise ValueError(f"{self.key!r} is not an array")
+                    self._pos += 1
+                    self._state = "items"
+                else:
+                    self._begin_value("skip")
+            elif state in ("value", "skip"):
+                value = self._scan_value()
+                if value is None:
+                    break
+                if state == "value":
+                    items.append(loads(value))
+                    self._state = "items"
+                else:
+                    self._state = "key"
+            else:  # done: ignore the rest of the document
+                self._buf.clear()
+                self._pos = 0
+                break
+        if self._state in ("start", "items", "key", "colon"):
+            del self._buf[: self._pos]
+            self._pos = 0
+        return items
+
+    def close(self) -> List[Any]:
+        if self._state != "done":
+            raise ValueError("JSON stream ended before the array was closed")
+        return []
+
+
+class NdjsonParser:
+    """Newline-delimited JSON (NDJSON / JSON Lines); blank lines are skipped."""
+
+    def __init__(self, max_line_bytes: int = DEFAULT_MAX_ITEM_BYTES) -> None:
+        self.max_line_bytes = max_line_bytes
+        self._pending = bytearray()
+
+    def feed(self, data: bytes) -> List[Any]:
+        self._pending += data
+        if b"\n" not in data:  # only split when a line may have ended
+            if len(self._pending) > self.max_line_bytes:
+                raise ValueError(f"NDJSON line exceeds max_line_bytes ({self.max_line_bytes})")
+            return []
+        *lines, rest = self._pending.split(b"\n")
+        if len(rest) > self.max_line_bytes:
+            raise ValueError(f"NDJSON line exceeds max_line_bytes ({self.max_line_bytes})")
+        self._pending = bytearray(rest)
+        return [loads(line) for line in lines if line.strip()]
+
+    def close(self) -> List[Any]:
+        rest, self._pending = bytes(self._pending), bytearray()
+        return [loads(rest)] if rest.strip() else []
+
+
+@dataclass
+class SSEEvent:
+    event: str = "message"
+    data: str = ""
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+    def json(self) -> Any:
+        return loads(self.data.encode("utf-8"))
+
+
+class SSEParser:
+    """Server-Sent Events (text/event-stream) per the WHATWG HTML spec."""
+
+    _LINES = re.compile(r"\r\n|\r|\n")
+
+    def __init__(self, max_event_bytes: int = DEFAULT_MAX_ITEM_BYTES) -> None:
+        self.max_event_bytes = max_event_bytes
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+        self._started = False
+        self._event = ""
+        self._data: List[str] = []
+        self._size = 0
+        self.last_event_id: Optional[str] = None
+        self.retry: Optional[int] = None
+
+    def feed(self, data: bytes) -> List[SSEEvent]:
+        text = self._pending + self._decoder.decode(data)
+        if not self._started:
+            self._started = True
+            text = text[1:] if text.startswith("\ufeff") else text
+        # A trailing \r may be the first half of \r\n: wait for the next chunk
+        hold = text.endswith("\r")
+        *lines, self._pending = self._LINES.split(text[:-1] if hold else text)
+        if hold:
+            self._pending += "\r"
+        events = [e for e in (self._line(line) for line in lines) if e is not None]
+        if len(self._pending) + self._size > self.max_event_bytes:
+            raise ValueError(f"SSE event exceeds max_event_bytes ({self.max_event_bytes})")
+        return events
+
+    def _line(self, line: str) -> Optional[SSEEvent]:
+        if not line:
+            event = None
+            if self._data:
+                event = SSEEvent(self._event or "message", "\n".join(self._data), self.last_event_id, self.retry)
+            self._event, self._data, self._size = "", [], 0
+            return event
+        if line.startswith(":"):
+            return None  # comment / keep-alive
+        name, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if name == "data":
+            self._data.append(value)
+            self._size += len(value) + 1
+        elif name == "event":
+            self._event = value
+        elif name == "id" and "\0" not in value:
+            self.last_event_id = value
+        elif name == "retry" and value.isdigit():
+            self.retry = int(value)
+        return None
+
+    def close(self) -> List[SSEEvent]:
+        # An event without its terminating blank line is discarded, as browsers do
+        self._pending = ""
+        return []
+
+
+# ---------- drivers ----------
+def _drive(parser: Any, chunks: Iterable[bytes]) -> Iterator[Any]:
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def _adrive(parser: Any, chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
+
+
+def iter_json_items(chunks: Iterable[bytes], key: Optional[str] = None, max_item_bytes: int = DEFAULT_MAX_ITEM_BYTES) -> Iterator[Any]:
+    """Yield the items of a JSON array from byte chunks, e.g. ``response.iter_bytes()``."""
+    return _drive(JsonArrayParser(key, max_item_bytes), chunks)
+
+
+def aiter_json_items(
+    chunks: AsyncIterable[bytes], key: Optional[str] = None, max_item_bytes: int = DEFAULT_MAX_ITEM_BYTES
+) -> AsyncIterator[Any]:
+    return _adrive(JsonArrayParser(key, max_item_bytes), chunks)
+
+
+def iter_ndjson(chunks: Iterable[bytes], max_line_bytes: int = DEFAULT_MAX_ITEM_BYTES) -> Iterator[Any]:
+    return _drive(NdjsonParser(max_line_bytes), chunks)
+
+
+def aiter_ndjson(chunks: AsyncIterable[bytes], max_line_bytes: int = DEFAULT_MAX_ITEM_BYTES) -> AsyncIterator[Any]:
+    return _adrive(NdjsonParser(max_line_bytes), chunks)
+
+
+def iter_sse(chunks: Iterable[bytes], max_event_bytes: int = DEFAULT_MAX_ITEM_BYTES) -> Iterator[SSEEvent]:
+    return _drive(SSEParser(max_event_bytes), chunks)
+
+
+def aiter_sse(chunks: AsyncIterable[bytes], max_event_bytes: int = DEFAULT_MAX_ITEM_BYTES) -> AsyncIterator[SSEEvent]:
+    return _adrive(SSEParser(max_event_bytes), chunks)
@@ -0,0 +1,351 @@
+import asyncio
+import base64
+import mimetypes
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import httpx
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+TUS_VERSION = "1.0.0"
+
+# progress(bytes_sent, total_bytes)
+ProgressCallback = Callable[[int, int], None]
+
+
+class UploadError(Exception):
+    def __init__(self, message: str, upload_url: Optional[str] = None, offset: int = 0) -> None:
+        super().__init__(message)
+        # For tus uploads: pass upload_url back in to resume from ``offset``
+        self.upload_url = upload_url
+        self.offset = offset
+
+
+class _Progress:
+    def __init__(self, total: int, callback: Optional[ProgressCallback]) -> None:
+        self.total = total
+        self.sent = 0
+        self._callback = callback
+        self._lock = threading.Lock()
+
+    def reset(self, sent: int = 0) -> None:
+        with self._lock:
+            self.sent = sent
+
+    def add(self, n: int) -> None:
+        if self._callback is None:
+            return
+        with self._lock:
+            self.sent += n
+            sent = self.sent
+        self._callback(sent, self.total)
+
+
+class FileStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Request body reading ``length`` bytes of a file from ``offset`` in fixed-size buffers.
+
+    The file is reopened on every iteration, so the body can be resent by retries and
+    redirects; a resend first takes back the progress the previous attempt reported, so
+    progress never exceeds the total. Works with both httpx.Client and httpx.AsyncClient
+    via ``stream_request``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[_Progress] = None,
+    ) -> None:
+        self.path = path
+        self.offset = offset
+        self.length = os.path.getsize(path) - offset if length is None else length
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self._reported = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self.progress is not None and self._reported:
+            self.progress.add(-self._reported)
+        self._reported = 0
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    raise UploadError(f"{self.path} shrank during upload")
+                remaining -= len(chunk)
+                if self.progress is not None:
+                    self._reported += len(chunk)
+                    self.progress.add(len(chunk))
+                yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        # Local disk reads are short; yielding between chunks keeps the loop responsive
+        for chunk in self:
+            yield chunk
+            await asyncio.sleep(0)
+
+
+class MultipartFileStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """multipart/form-data body with one streamed file part and exact Content-Length."""
+
+    def __init__(
+        self,
+        path: str,
+        field_name: str = "file",
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        fields: Optional[Dict[str, Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        self.boundary = uuid.uuid4().hex
+        filename = filename or os.path.basename(path)
+        content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        head = b"".join(
+            self._part_header(name) + str(value).encode("utf-8") + b"\r\n" for name, value in (fields or {}).items()
+        )
+        self.head = head + self._part_header(field_name, filename, content_type)
+        self.tail = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+        size = os.path.getsize(path)
+        self.length = len(self.head) + size + len(self.tail)
+        self._progress = _Progress(self.length, progress)
+        self._file = FileStream(path, chunk_size=chunk_size, progress=self._progress)
+        # Head/tail bytes reported by the current attempt; the file part tracks its own
+        self._framing = 0
+
+    def _part_header(self, name: str, filename: Optional[str] = None, content_type: Optional[str] = None) -> bytes:
+        name = name.replace('"', "%22")
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename.replace(chr(34), "%22")}"'
+        lines = [f"--{self.boundary}", f"Content-Disposition: {disposition}"]
+        if content_type:
+            lines.append(f"Content-Type: {content_type}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {
+            "Content-Type": f"multipart/form-data; boundary={self.boundary}",
+            "Content-Length": str(self.length),
+        }
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self._framing:
+            self._progress.add(-self._framing)
+        self._framing = len(self.head)
+        self._progress.add(len(self.head))
+        yield self.head
+        yield from self._file
+        self._framing += len(self.tail)
+        self._progress.add(len(self.tail))
+        yield self.tail
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self:
+            yield chunk
+            await asyncio.sleep(0)
+
+
+def stream_request(
+    client: Union[httpx.Client, httpx.AsyncClient], method: str, url: str, body: httpx.SyncByteStream, headers: Dict[str, str]
+) -> httpx.Request:
+    """
+    Build a request that sends ``body`` as-is. Passing a stream object through ``content=``
+    would wrap it in a one-shot iterator (sync only), so set it as the request stream instead.
+    """
+    # build_request applies the client's base_url, default headers, cookies and timeout
+    template = client.build_request(method, url, headers=headers)
+    request_headers = template.headers.copy()
+    if not any(k.lower() == "content-length" for k in headers):
+        request_headers.pop("content-length", None)
+        request_headers["Transfer-Encoding"] = "chunked"
+    return httpx.Request(
+        template.method, template.url, headers=request_headers, stream=body, extensions=template.extensions
+    )
+
+
+def raw_body(
+    path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, progress: Optional[ProgressCallback] = None
+) -> Tuple[FileStream, Dict[str, str]]:
+    """Body and headers for sending a file as the raw request body (not chunked: Content-Length is set)."""
+    size = os.path.getsize(path)
+    tracker = _Progress(size, progress)
+    body = FileStream(path, chunk_size=chunk_size, progress=tracker)
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return body, {"Content-Type": content_type, "Content-Length": str(size)}
+
+
+# ---------- tus (resumable) ----------
+def _tus_metadata(metadata: Dict[str, str]) -> str:
+    return ",".join(f"{k} {base64.b64encode(v.encode('utf-8')).decode('ascii')}" for k, v in metadata.items())
+
+
+def _tus_offset(resp: httpx.Response, upload_url: str) -> int:
+    offset = resp.headers.get("upload-offset", "")
+    if not offset.isdigit():
+        raise UploadError(f"tus server sent no Upload-Offset ({resp.status_code})", upload_url)
+    return int(offset)
+
+
+def tus_upload(
+    client: httpx.Client,
+    endpoint: str,
+    path: str,
+    upload_url: Optional[str] = None,
+    chunk_size: int = DEFAULT_PART_SIZE,
+    metadata: Optional[Dict[str, str]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    """
+    Upload ``path`` with the tus 1.0 protocol and return the upload URL. Pass ``upload_url``
+    (from a previous return value or ``UploadError.upload_url``) to resume where it stopped.
+    """
+    size = os.path.getsize(path)
+    base = {"Tus-Resumable": TUS_VERSION}
+    if upload_url is None:
+        meta = {"filename": os.path.basename(path), **(metadata or {})}
+        resp = client.post(endpoint, headers={**base, "Upload-Length": str(size), "Upload-Metadata": _tus_metadata(meta)})
+        resp.raise_for_status()
+        upload_url = str(resp.url.join(resp.headers["location"]))
+        offset = 0
+    else:
+        resp = client.head(upload_url, headers=base)
+        resp.raise_for_status()
+        offset = _tus_offset(resp, upload_url)
+    tracker = _Progress(size, progress)
+    tracker.reset(offset)
+    while offset < size:
+        length = min(chunk_size, size - offset)
+        try:
+            headers = {
+                **base,
+                "Upload-Offset": str(offset),
+                "Content-Type": "application/offset+octet-stream",
+                "Content-Length": str(length),
+            }
+            body = FileStream(path, offset, length, progress=tracker)
+            resp = client.send(stream_request(client, "PATCH", upload_url, body, headers))
+            resp.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise UploadError(f"tus upload interrupted at {offset}/{size}: {exc}", upload_url, offset) from exc
+        offset = _tus_offset(resp, upload_url)
+        tracker.reset(offset)
+    return upload_url
+
+
+async def atus_upload(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    path: str,
+    upload_url: Optional[str] = None,
+    chunk_size: int = DEFAULT_PART_SIZE,
+    metadata: Optional[Dict[str, str]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    size = os.path.getsize(path)
+    base = {"Tus-Resumable": TUS_VERSION}
+    if upload_url is None:
+        meta = {"filename": os.path.basename(path), **(metadata or {})}
+        resp = await client.post(
+            endpoint, headers={**base, "Upload-Length": str(size), "Upload-Metadata": _tus_metadata(meta)}
+        )
+        resp.raise_for_status()
+        upload_url = str(resp.url.join(resp.headers["location"]))
+        offset = 0
+    else:
+        resp = await client.head(upload_url, headers=base)
+        resp.raise_for_status()
+        offset = _tus_offset(resp, upload_url)
+    tracker = _Progress(size, progress)
+    tracker.reset(offset)
+    while offset < size:
+        length = min(chunk_size, size - offset)
+        try:
+            headers = {
+                **base,
+                "Upload-Offset": str(offset),
+                "Content-Type": "application/offset+octet-stream",
+                "Content-Length": str(length),
+            }
+            body = FileStream(path, offset, length, progress=tracker)
+            resp = await client.send(stream_request(client, "PATCH", upload_url, body, headers))
+            resp.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise UploadError(f"tus upload interrupted at {offset}/{size}: {exc}", upload_url, offset) from exc
+        offset = _tus_offset(resp, upload_url)
+        tracker.reset(offset)
+    return upload_url
+
+
+# ---------- S3-style multipart (presigned part URLs) ----------
+def _parts(size: int, part_size: int, count: int) -> List[Tuple[int, int, int]]:
+    if count * part_size < size:
+        raise ValueError(f"{count} part URLs of {part_size} bytes cannot hold {size} bytes")
+    return [(n + 1, n * part_size, min(part_size, size - n * part_size)) for n in range(-(-size // part_size) or 1)]
+
+
+def _part_etag(resp: httpx.Response, part_number: int) -> str:
+    resp.raise_for_status()
+    etag = resp.headers.get("etag")
+    if not etag:
+        raise UploadError(f"Part {part_number} response has no ETag (expose it via CORS if uploading from a browser)")
+    return etag
+
+
+def upload_parts(
+    client: httpx.Client,
+    path: str,
+    part_urls: List[str],
+    part_size: int = DEFAULT_PART_SIZE,
+    concurrency: int = 4,
+    progress: Optional[ProgressCallback] = None,
+) -> List[Tuple[int, str]]:
+    """
+    PUT each ``part_size`` slice of ``path`` to its presigned URL (S3 UploadPart style), up to
+    ``concurrency`` at a time. Returns ``[(part_number, etag), ...]`` for CompleteMultipartUpload.
+    """
+    size = os.path.getsize(path)
+    tracker = _Progress(size, progress)
+
+    def put(part: Tuple[int, int, int]) -> Tuple[int, str]:
+        number, offset, length = part
+        body = FileStream(path, offset, length, progress=tracker)
+        resp = client.send(stream_request(client, "PUT", part_urls[number - 1], body, {"Content-Length": str(length)}))
+        return number, _part_etag(resp, number)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="httpx-part") as pool:
+        return list(pool.map(put, _parts(size, part_size, len(part_urls))))
+
+
+async def aupload_parts(
+    client: httpx.AsyncClient,
+    path: str,
+    part_urls: List[str],
+    part_size: int = DEFAULT_PART_SIZE,
+    concurrency: int = 4,
+    progress: Optional[ProgressCallback] = None,
+) -> List[Tuple[int, str]]:
+    size = os.path.getsize(path)
+    tracker = _Progress(size, progress)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def put(part: Tuple[int, int, int]) -> Tuple[int, str]:
+        number, offset, length = part
+        async with slots:
+            body = FileStream(path, offset, length, progress=tracker)
+            resp = await client.send(
+                stream_request(client, "PUT", part_urls[number - 1], body, {"Content-Length": str(length)})
+            )
+        return number, _part_etag(resp, number)
+
+    return list(await asyncio.gather(*(put(p) for p in _parts(size, part_size, len(part_urls)))))
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import httpx
+
+from scripts.httpx_skill import HttpxSkill
+
+
+def test_fetch_many_input_order_and_failures():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/boom":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, text=request.url.path)
+
+    skill = HttpxSkill(transport=httpx.MockTransport(handler))
+    urls = [f"https://a.test/{i}" for i in range(20)] + ["https://b.test/boom", {"method": "post", "url": "https://a.test/p"}]
+    results = skill.fetch_many(urls, concurrency=4, per_host=2)
+    assert [r.index for r in results] == list(range(22))
+    assert [r.response.text for r in results[:20]] == [f"/{i}" for i in range(20)]
+    assert isinstance(results[20].error, httpx.ConnectError)
+    assert results[21].request.method == "POST" and results[21].ok
+
+
+def test_amap_respects_global_and_per_host_limits():
+    active = {"all": 0, "a.test": 0, "max_all": 0, "max_a.test": 0}
+
+    async def app(scope, receive, send):
+        host = dict(scope["headers"])[b"host"].decode()
+        for key in ("all", host):
+            active[key] = active.get(key, 0) + 1
+            active[f"max_{key}"] = max(active.get(f"max_{key}", 0), active[key])
+        await asyncio.sleep(0.01)
+        for key in ("all", host):
+            active[key] -= 1
+        status = 503 if scope["path"] == "/fail" else 200
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def main():
+        skill = HttpxSkill(async_mode=True, transport=httpx.ASGITransport(app=app), retries=1, backoff_base=0)
+        urls = [f"http://a.test/{i}" for i in range(30)] + [f"http://b.test/{i}" for i in range(30)]
+        urls.append("http://b.test/fail")
+        results = [r async for r in skill.amap(urls, concurrency=8, per_host=3, raise_for_status=True)]
+        await skill.aclose()
+        return results
+
+    results = asyncio.run(main())
+    assert len(results) == 61
+    assert active["max_all"] <= 8 and active["max_a.test"] <= 3
+    failed = [r for r in results if not r.ok]
+    assert len(failed) == 1 and isinstance(failed[0].error, httpx.HTTPStatusError)
+
+
+def test_a_long_run_of_one_host_does_not_starve_the_others():
+    hosts = ["a.test"] * 100 + ["b.test", "c.test", "d.test"] * 10
+    urls = [f"http://{host}/{i}" for i, host in enumerate(hosts)]
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def enter():
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+
+    def leave():
+        with lock:
+            active["now"] -= 1
+
+    async def app(scope, receive, send):
+        enter()
+        await asyncio.sleep(0.01)
+        leave()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def main():
+        skill = HttpxSkill(async_mode=True, transport=httpx.ASGITransport(app=app))
+        results = [r async for r in skill.amap(urls, concurrency=8, per_host=2, ordered=True)]
+        await skill.aclose()
+        return results
+
+    results = asyncio.run(main())
+    assert [r.index for r in results] == list(range(len(urls))) and all(r.ok for r in results)
+    assert active["max"] == 8  # two per host across a, b, c and d
+
+    def handler(request):
+        enter()
+        time.sleep(0.01)
+        leave()
+        return httpx.Response(200)
+
+    active["max"] = 0
+    skill = HttpxSkill(transport=httpx.MockTransport(handler))
+    assert all(r.ok for r in skill.fetch_many(urls, concurrency=8, per_host=2))
+    assert active["max"] == 8
@@ -0,0 +1,168 @@
+import asyncio
+
+import httpx
+import pytest
+
+from scripts.httpx_cache import (
+    AsyncCacheTransport,
+    CacheStorage,
+    CacheTransport,
+    MemoryCacheStorage,
+    ResponseCache,
+    SQLiteCacheStorage,
+)
+from scripts.httpx_skill import HttpxSkill
+
+
+class Origin:
+    """Mock origin server counting the requests that reach the network."""
+
+    def __init__(self, headers=None, body=b"payload", etag=None):
+        self.headers = headers or {}
+        self.body = body
+        self.etag = etag
+        self.calls = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        headers = dict(self.headers)
+        if self.etag:
+            headers["ETag"] = self.etag
+            if request.headers.get("if-none-match") == self.etag:
+                return httpx.Response(304, headers=headers)
+        return httpx.Response(200, headers=headers, content=self.body)
+
+
+def _client(origin, cache=None):
+    cache = cache or ResponseCache()
+    return httpx.Client(transport=CacheTransport(httpx.MockTransport(origin), cache)), cache
+
+
+def test_fresh_response_served_from_cache():
+    origin = Origin(headers={"Cache-Control": "max-age=60"})
+    client, cache = _client(origin)
+    assert client.get("https://api.test/a").content == b"payload"
+    second = client.get("https://api.test/a")
+    assert second.content == b"payload"
+    assert second.extensions["cache_status"] == "HIT"
+    assert len(origin.calls) == 1
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.stores) == (1, 1, 1)
+
+
+def test_etag_revalidation_and_no_store():
+    origin = Origin(headers={"Cache-Control": "no-cache"}, etag='"v1"')
+    client, cache = _client(origin)
+    client.get("https://api.test/a")
+    second = client.get("https://api.test/a")
+    assert second.status_code == 200 and second.content == b"payload"
+    assert second.extensions["cache_status"] == "REVALIDATED"
+    assert origin.calls[1].headers["if-none-match"] == '"v1"'
+    assert cache.stats.revalidations == 1
+
+    no_store = Origin(headers={"Cache-Control": "no-store, max-age=60"})
+    client, cache = _client(no_store)
+    client.get("https://api.test/a")
+    client.get("https://api.test/a")
+    assert len(no_store.calls) == 2 and cache.stats.stores == 0
+
+
+def test_unsafe_method_invalidates():
+    origin = Origin(headers={"Cache-Control": "max-age=60"})
+    client, cache = _client(origin)
+    client.get("https://api.test/a")
+    client.post("https://api.test/a", content=b"x")
+    client.get("https://api.test/a")
+    assert [r.method for r in origin.calls] == ["GET", "POST", "GET"]
+    assert cache.stats.invalidations == 1
+
+
+def test_range_requests_bypass_the_cache():
+    def origin(request):
+        body = b"0123456789abcdefghij"
+        headers = {"Cache-Control": "max-age=60"}
+        if "range" in request.headers:
+            headers["Content-Range"] = f"bytes 0-9/{len(body)}"
+            return httpx.Response(206, headers=headers, content=body[:10])
+        return httpx.Response(200, headers=headers, content=body)
+
+    client, cache = _client(origin)
+    assert client.get("https://api.test/f", headers={"Range": "bytes=0-9"}).status_code == 206
+    full = client.get("https://api.test/f")
+    assert full.status_code == 200 and full.content == b"0123456789abcdefghij"
+    assert full.extensions["cache_status"] != "HIT"
+    # A cached full response is not served for a Range request either
+    assert client.get("https://api.test/f", headers={"Range": "bytes=0-9"}).status_code == 206
+
+
+def test_memory_lru_eviction():
+    storage = MemoryCacheStorage(max_bytes=2500)
+    origin = Origin(headers={"Cache-Control": "max-age=60"}, body=b"x" * 1000)
+    client, cache = _client(origin, ResponseCache(storage))
+    for path in ("a", "b", "a", "c"):
+        client.get(f"https://api.test/{path}")
+    assert len(storage) == 2
+    assert cache.stats.evictions == 1
+    client.get("https://api.test/a")  # most recently used survived
+    assert len(origin.calls) == 3
+
+
+def test_incomplete_storage_fails_at_construction():
+    class GetOnly(CacheStorage):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_sqlite_storage_persists(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    origin = Origin(headers={"Cache-Control": "max-age=60", "Vary": "Accept"})
+    client, cache = _client(origin, ResponseCache(SQLiteCacheStorage(path)))
+    client.get("https://api.test/a", headers={"Accept": "application/json"})
+    cache.close()
+
+    client, cache = _client(origin, ResponseCache(SQLiteCacheStorage(path)))
+    assert client.get("https://api.test/a", headers={"Accept": "application/json"}).content == b"payload"
+    client.get("https://api.test/a", headers={"Accept": "text/csv"})  # different Vary key
+    assert len(origin.calls) == 2
+    cache.close()
+
+
+def test_async_concurrent_requests():
+    origin = Origin(headers={"Cache-Control": "max-age=60"})
+
+    async def main():
+        cache = ResponseCache()
+        async with httpx.AsyncClient(transport=AsyncCacheTransport(httpx.MockTransport(origin), cache)) as client:
+            await client.get("https://api.test/a")
+            responses = await asyncio.gather(*(client.get("https://api.test/a") for _ in range(50)))
+        assert all(r.content == b"payload" for r in responses)
+        return cache
+
+    cache = asyncio.run(main())
+    assert len(origin.calls) == 1
+    assert cache.stats.hits == 50
+
+
+def test_skill_cache_option():
+    origin = Origin(headers={"Cache-Control": "max-age=60"})
+    skill = HttpxSkill(cache=True, transport=httpx.MockTransport(origin))
+    skill.get("https://api.test/a")
+    skill.get("https://api.test/a")
+    assert len(origin.calls) == 1
+    assert skill.cache_stats.hits == 1
+    skill.close()
+
+
+def test_proxy_is_applied_beneath_the_cache_transport():
+    for proxies in ("http://proxy.test:8080", {"http://": "http://proxy.test:8080", "https://": "http://proxy.test:8080"}):
+        skill = HttpxSkill(cache=True, proxies=proxies)
+        transport = skill._client._transport_for_url(httpx.URL("https://api.test/a"))
+        assert isinstance(transport, CacheTransport)
+        assert isinstance(transport.transport, httpx.HTTPTransport)
+        assert transport.transport._pool.__class__.__name__ == "HTTPProxy"
+        skill.close()
+
+    with pytest.raises(ValueError):
+        HttpxSkill(cache=True, proxies={"all://internal.test": "http://proxy.test:8080"})._client
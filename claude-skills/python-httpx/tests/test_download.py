@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+
+import httpx
+import pytest
+
+from scripts.httpx_download import DownloadError, RemoteFile, SegmentedDownload, download
+from scripts.httpx_skill import HttpxSkill
+
+DATA = os.urandom(9 * 1024 * 1024 + 123)
+SHA256 = "sha256:" + hashlib.sha256(DATA).hexdigest()
+
+
+class RangeServer:
+    def __init__(self, data=DATA, ranges=True, fail_after=None):
+        self.data = data
+        self.ranges = ranges
+        self.fail_after = fail_after  # drop the connection once this many range requests were served
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        headers = {"ETag": '"v1"'}
+        match = re.match(r"bytes=(\d+)-(\d*)", request.headers.get("range", ""))
+        if not (self.ranges and match):
+            return httpx.Response(200, headers=headers, content=self.data)
+        if self.fail_after is not None and len(self.requests) > self.fail_after:
+            raise httpx.ReadError("connection reset", request=request)
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(self.data) - 1
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(self.data)}"
+        return httpx.Response(206, headers=headers, content=self.data[start : end + 1])
+
+
+def test_segmented_download_verifies_checksum(tmp_path):
+    server = RangeServer()
+    skill = HttpxSkill(transport=httpx.MockTransport(server))
+    target = tmp_path / "artefact.bin"
+    skill.stream_download("https://files.test/a.bin", str(target), segments=3, checksum=SHA256)
+    assert target.read_bytes() == DATA
+    ranges = sorted(r.headers["range"] for r in server.requests[1:])
+    assert len(ranges) == 3 and all(r.headers["if-range"] == '"v1"' for r in server.requests[1:])
+    assert not (tmp_path / "artefact.bin.part.json").exists()
+
+    with pytest.raises(DownloadError):
+        skill.stream_download("https://files.test/a.bin", str(tmp_path / "bad.bin"), segments=2, checksum="sha256:00")
+    assert not (tmp_path / "bad.bin").exists()
+
+
+def test_resume_from_sidecar(tmp_path):
+    target = str(tmp_path / "artefact.bin")
+    flaky = RangeServer(fail_after=2)  # probe + first segment succeed, the rest fail
+    with httpx.Client(transport=httpx.MockTransport(flaky)) as client:
+        with pytest.raises(httpx.ReadError):
+            download(client, "https://files.test/a.bin", target, segments=2, retries=0)
+    state = json.loads((tmp_path / "artefact.bin.part.json").read_text())
+    done = [seg for seg in state["segments"] if seg[2] == seg[1]]
+    assert len(done) == 1
+
+    server = RangeServer()
+    with httpx.Client(transport=httpx.MockTransport(server)) as client:
+        assert download(client, "https://files.test/a.bin", target, segments=2, checksum=SHA256) == len(DATA)
+    assert len(server.requests) == 2  # probe + the one unfinished segment
+    assert open(target, "rb").read() == DATA
+
+
+def test_async_and_no_range_fallback(tmp_path):
+    async def main():
+        skill = HttpxSkill(async_mode=True, transport=httpx.MockTransport(RangeServer(ranges=False)))
+        await skill.astream_download("https://files.test/a.bin", str(tmp_path / "x.bin"), segments=4)
+        await skill.aclose()
+
+    asyncio.run(main())
+    assert (tmp_path / "x.bin").read_bytes() == DATA
+
+
+def test_empty_file_size_comes_from_the_416_content_range(tmp_path):
+    def handler(request):
+        if request.headers.get("range"):
+            # The error body's Content-Length must not be taken for the file size
+            return httpx.Response(416, headers={"Content-Range": "bytes */0"}, content=b"Range Not Satisfiable")
+        return httpx.Response(200, content=b"")
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        assert download(client, "https://files.test/empty.bin", str(tmp_path / "empty.bin")) == 0
+
+    async def main():
+        skill = HttpxSkill(async_mode=True, transport=httpx.MockTransport(handler))
+        await skill.astream_download("https://files.test/empty.bin", str(tmp_path / "aempty.bin"))
+        await skill.aclose()
+
+    asyncio.run(main())
+    assert (tmp_path / "empty.bin").read_bytes() == b"" == (tmp_path / "aempty.bin").read_bytes()
+
+
+def test_split_respects_minimum_segment_size(tmp_path):
+    state = SegmentedDownload("u", str(tmp_path / "f"), RemoteFile(1000, True, '"v"'), segments=8)
+    assert state.segments == [[0, 1000, 0]]
+    state.abort()
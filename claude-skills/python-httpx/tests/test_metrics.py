@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from scripts.httpx_metrics import HttpMetrics, track
+from scripts.httpx_skill import HttpxSkill
+
+
+@pytest.fixture
+def local_server():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body) * 2))
+            self.end_headers()
+            self.wfile.write(body * 2)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_phases_bytes_and_pool_over_a_real_connection(local_server):
+    skill = HttpxSkill(metrics=True)
+    for _ in range(2):
+        resp = skill.post(local_server + "/echo", json={"x": "y" * 90})
+        assert resp.content == resp.request.content * 2
+    first, second = skill.metrics.timings
+    assert {"pool", "connect", "send", "server", "receive"} <= set(first.phases)
+    assert "connect" not in second.phases  # keep-alive connection reused
+    size = len(resp.request.content)
+    assert (first.bytes_out, first.bytes_in, first.status) == (size, 2 * size, 200)
+    assert second.pool_connections == 1 and skill.metrics.in_flight == 0
+    skill.close()
+
+
+def test_retries_errors_and_prometheus_text():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, content=b"ok")
+
+    skill = HttpxSkill(transport=httpx.MockTransport(handler), retries=1, backoff_base=0, metrics=True)
+    skill.get("https://api.test/x")
+    snapshot = skill.metrics.snapshot()
+    assert snapshot["requests"] == 2 and snapshot["errors"] == 1 and snapshot["retries"] == 1
+    text = skill.metrics_text()
+    assert 'httpx_skill_requests_total{method="GET",status="200"} 1' in text
+    assert 'httpx_skill_errors_total{error="ConnectError"} 1' in text
+    assert "httpx_skill_retry_policy_retries_total 1" in text
+    assert 'httpx_skill_request_duration_seconds_bucket{le="+Inf"} 2' in text
+    assert HttpxSkill().metrics_text() == ""
+
+
+def test_track_is_context_local_and_logs_json(caplog):
+    shared = HttpMetrics()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"hello"))
+
+    async def worker(n):
+        with track() as stats:
+            skill = HttpxSkill(async_mode=True, transport=transport, metrics=shared, metrics_log_level=logging.INFO)
+            for _ in range(n):
+                await skill.aget("https://api.test/x")
+            await skill.aclose()
+        return len(stats.timings)
+
+    async def main():
+        return await asyncio.gather(worker(1), worker(3))
+
+    with caplog.at_level(logging.INFO, logger="scripts.httpx_metrics"):
+        assert asyncio.run(main()) == [1, 3]
+    assert len(shared.timings) == 4
+    assert len(caplog.records) == 4 and '"status":200' in caplog.records[0].getMessage()
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from scripts.httpx_paginate import CursorPagination, OffsetPagination, Pagination
+from scripts.httpx_skill import HttpxSkill
+
+ROWS = list(range(23))
+
+
+def handler(request):
+    params = request.url.params
+    if request.url.path == "/link":
+        page = int(params.get("page", "0"))
+        headers = {"Link": f'</link?page={page + 1}>; rel="next"'} if page < 4 else {}
+        return httpx.Response(200, json=ROWS[page * 5 : page * 5 + 5], headers=headers)
+    if request.url.path == "/cursor":
+        start = int(params.get("cursor", "0"))
+        nxt = start + 10 if start + 10 < len(ROWS) else None
+        return httpx.Response(200, json={"data": ROWS[start : start + 10], "meta": {"next": nxt}})
+    offset, limit = int(params["offset"]), int(params["limit"])
+    return httpx.Response(200, json={"items": ROWS[offset : offset + limit], "total": len(ROWS)})
+
+
+def test_link_cursor_and_offset_strategies():
+    skill = HttpxSkill(base_url="https://api.test", transport=httpx.MockTransport(handler))
+    assert list(skill.paginate("/link")) == ROWS
+    assert list(skill.paginate("/cursor", CursorPagination(cursor="meta.next"))) == ROWS
+    assert list(skill.paginate("/offset", OffsetPagination(items="items", limit=7, total="total"))) == ROWS
+    assert list(skill.paginate("/link", max_items=7)) == ROWS[:7]
+    assert list(skill.paginate("/link", max_pages=2, prefetch=False)) == ROWS[:10]
+
+
+def test_next_page_is_prefetched_while_items_are_consumed():
+    requested = []
+
+    def slow(request):
+        requested.append((request.url.params.get("page", "0"), threading.get_ident()))
+        time.sleep(0.05)
+        return handler(request)
+
+    skill = HttpxSkill(base_url="https://api.test", transport=httpx.MockTransport(slow))
+    pages = skill.paginate("/link")
+    assert next(pages) == 0
+    time.sleep(0.1)
+    assert [page for page, _ in requested] == ["0", "1"]  # page 1 requested before we asked for it
+    assert list(pages) == ROWS[1:]
+
+    async def main():
+        async with HttpxSkill(base_url="https://api.test", async_mode=True, transport=httpx.MockTransport(handler)) as s:
+            return [row async for row in s.apaginate("/cursor", CursorPagination(cursor="meta.next"), max_items=15)]
+
+    assert asyncio.run(main()) == ROWS[:15]
+
+
+def test_strategy_without_next_page_fails_at_construction():
+    class NoNextPage(Pagination):
+        pass
+
+    with pytest.raises(TypeError):
+        NoNextPage()
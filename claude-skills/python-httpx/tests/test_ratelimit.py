@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from scripts.httpx_ratelimit import CircuitBreaker, CircuitOpenError, RateLimiter, TokenBucket, parse_retry_after
+from scripts.httpx_skill import HttpxSkill
+
+
+def test_token_bucket_burst_then_rate():
+    bucket = TokenBucket(rate=10, capacity=3)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.02)
+    assert waits[4] == pytest.approx(0.2, abs=0.02)
+
+
+def test_route_rules_and_retry_after_parsing():
+    limiter = RateLimiter({"api.test": 5, "api.test/search": (1, 1)})
+    assert limiter.key(httpx.URL("https://api.test/search/q")) == "api.test/search"
+    assert limiter.key(httpx.URL("https://api.test/searching")) == "api.test"
+    assert limiter.key(httpx.URL("https://other.test/x")) == "other.test"
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def test_429_retry_after_is_honoured_and_pauses_host():
+    calls = []
+
+    def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.2"})
+        return httpx.Response(200)
+
+    limiter = RateLimiter()
+    skill = HttpxSkill(transport=httpx.MockTransport(handler), retries=2, backoff_base=0, rate_limiter=limiter)
+    assert skill.get("https://api.test/a").status_code == 200
+    assert calls[1] - calls[0] >= 0.19
+
+    # Retry-After beyond max_retry_after is returned rather than waited out
+    calls.clear()
+    skill = HttpxSkill(
+        transport=httpx.MockTransport(lambda r: httpx.Response(429, headers={"Retry-After": "120"})),
+        retries=3,
+        max_retry_after=5,
+    )
+    assert skill.get("https://api.test/a").status_code == 429
+
+
+def test_circuit_breaker_fails_fast_and_recovers():
+    state = {"up": False, "calls": 0}
+
+    def handler(request):
+        state["calls"] += 1
+        if not state["up"]:
+            raise httpx.ConnectError("down", request=request)
+        return httpx.Response(200)
+
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.1)
+    skill = HttpxSkill(async_mode=True, transport=httpx.MockTransport(handler), circuit_breaker=breaker)
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await skill.aget("https://down.test/")
+        with pytest.raises(CircuitOpenError):
+            await skill.aget("https://down.test/")
+        assert state["calls"] == 2
+        await asyncio.sleep(0.12)
+        state["up"] = True
+        assert (await skill.aget("https://down.test/")).status_code == 200
+        assert breaker.state("down.test") == CircuitBreaker.CLOSED
+
+    asyncio.run(main())
+
+
+def test_cancelled_half_open_probe_frees_the_trial():
+    state = {"mode": "down"}
+
+    async def handler(request):
+        if state["mode"] == "down":
+            raise httpx.ConnectError("down", request=request)
+        if state["mode"] == "hang":
+            await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    skill = HttpxSkill(async_mode=True, transport=httpx.MockTransport(handler), circuit_breaker=breaker)
+
+    async def main():
+        with pytest.raises(httpx.ConnectError):
+            await skill.aget("https://flaky.test/")
+        await asyncio.sleep(0.06)
+        state["mode"] = "hang"
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(skill.aget("https://flaky.test/"), 0.05)
+        assert breaker.state("flaky.test") == CircuitBreaker.OPEN  # the timed-out probe counted as a failure
+        await asyncio.sleep(0.06)
+        state["mode"] = "up"
+        assert (await skill.aget("https://flaky.test/")).status_code == 200
+        assert breaker.state("flaky.test") == CircuitBreaker.CLOSED
+
+    asyncio.run(main())
+
+
+def test_cancelled_calls_to_a_healthy_host_keep_the_circuit_closed():
+    async def handler(request):
+        if request.url.path != "/0":
+            await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    breaker = CircuitBreaker(failure_threshold=2)
+    skill = HttpxSkill(async_mode=True, transport=httpx.MockTransport(handler), circuit_breaker=breaker)
+
+    async def main():
+        for _ in range(3):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(skill.aget("https://ok.test/slow"), 0.01)
+        results = skill.amap([f"https://ok.test/{i}" for i in range(10)], concurrency=10)
+        async for result in results:
+            break  # stop early: the pending requests are cancelled
+        await results.aclose()
+        assert breaker.state("ok.test") == CircuitBreaker.CLOSED
+        assert (await skill.aget("https://ok.test/0")).status_code == 200
+
+    asyncio.run(main())
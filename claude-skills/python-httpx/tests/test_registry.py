@@ -0,0 +1,75 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from scripts.httpx_registry import ClientRegistry
+from scripts.httpx_skill import HttpxSkill
+
+transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+
+
+def test_clients_are_lazy_and_shared_by_configuration():
+    registry = ClientRegistry(idle_timeout=0)
+    lazy = HttpxSkill(transport=transport)
+    assert lazy._client_obj is None
+    lazy.get("https://api.test/x")
+    assert isinstance(lazy._client_obj, httpx.Client)
+
+    a = HttpxSkill(transport=transport, shared=registry, cache=True)
+    b = HttpxSkill(transport=transport, shared=registry, cache=True)
+    other = HttpxSkill(transport=transport, shared=registry, headers={"X-Other": "1"})
+    for skill in (a, b, other):
+        assert skill.get("https://api.test/x").json() == {"ok": True}
+    assert a._client is b._client and a._client is not other._client
+    assert a.cache is b.cache  # b adopted the cache of the pooled client
+    assert registry.stats() == {"clients": 2, "in_use": 2, "refs": 3}
+
+    client = a._client
+    a.close()
+    assert not client.is_closed
+    b.close()
+    assert client.is_closed  # last reference gone and idle_timeout=0
+    assert registry.stats()["clients"] == 1
+
+
+def test_idle_clients_survive_until_timeout():
+    registry = ClientRegistry(idle_timeout=60)
+    first = HttpxSkill(transport=transport, shared=registry)
+    client = first._client
+    first.close()
+    second = HttpxSkill(transport=transport, shared=registry)
+    assert second._client is client and not client.is_closed
+    second.close()
+    registry.close_all()
+    assert client.is_closed
+
+
+def test_async_clients_are_per_event_loop():
+    registry = ClientRegistry(idle_timeout=0)
+
+    async def use():
+        async with HttpxSkill(async_mode=True, transport=transport, shared=registry) as skill:
+            await skill.aget("https://api.test/x")
+            return skill._client
+
+    first, second = asyncio.run(use()), asyncio.run(use())
+    assert first is not second and first.is_closed and second.is_closed
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_child_builds_its_own_client():
+    registry = ClientRegistry()
+    skill = HttpxSkill(transport=transport, shared=registry)
+    parent_client = skill._client
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        ok = skill._client is not parent_client and registry.stats()["clients"] == 1
+        os.write(write_fd, b"1" if ok else b"0")
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert os.read(read_fd, 1) == b"1"
+    assert skill._client is parent_client and not parent_client.is_closed
+    registry.close_all()
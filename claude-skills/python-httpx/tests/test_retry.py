@@ -0,0 +1,85 @@
+import asyncio
+
+import httpx
+import pytest
+
+from scripts.httpx_retry import RetryBudget, RetryPolicy
+from scripts.httpx_skill import HttpxSkill
+
+
+def _flaky(failures, status=503):
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if len(seen) <= failures:
+            return httpx.Response(status)
+        return httpx.Response(200)
+
+    return handler, seen
+
+
+def test_jitter_stays_within_bounds():
+    full = RetryPolicy(retries=5, backoff_base=1.0, backoff_cap=4.0, jitter="full")
+    assert all(0 <= full.backoff(attempt, 1.0) <= min(4.0, 2 ** (attempt - 1)) for attempt in range(1, 6))
+    decorrelated = RetryPolicy(retries=5, backoff_base=1.0, backoff_cap=4.0, jitter="decorrelated")
+    assert all(1.0 <= decorrelated.backoff(1, prev) <= 4.0 for prev in (1.0, 2.0, 10.0))
+    with pytest.raises(ValueError):
+        RetryPolicy(jitter="random")
+
+
+def test_post_is_only_retried_with_idempotency_key():
+    handler, seen = _flaky(1)
+    skill = HttpxSkill(transport=httpx.MockTransport(handler), retries=2, backoff_base=0)
+    assert skill.post("https://api.test/orders", json={}).status_code == 503
+    assert len(seen) == 1 and skill.retry_stats.not_idempotent == 1
+
+    handler, seen = _flaky(1)
+    policy = RetryPolicy(retries=2, backoff_base=0, idempotency_keys=True)
+    skill = HttpxSkill(transport=httpx.MockTransport(handler), retry_policy=policy)
+    assert skill.post("https://api.test/orders", json={}).status_code == 200
+    keys = {r.headers["Idempotency-Key"] for r in seen}
+    assert len(seen) == 2 and len(keys) == 1  # the same key on every attempt
+
+
+def test_retry_budget_caps_retries():
+    handler, seen = _flaky(100)
+    policy = RetryPolicy(retries=3, backoff_base=0, budget=RetryBudget(ratio=0.0, min_retries=2))
+    skill = HttpxSkill(transport=httpx.MockTransport(handler), retry_policy=policy)
+    for _ in range(3):
+        skill.get("https://api.test/x")
+    # 2 retries allowed in the window; every later retry is refused
+    assert len(seen) == 5
+    assert skill.retry_stats.retries == 2 and skill.retry_stats.budget_denied == 3
+
+
+def test_async_retries_transport_errors_but_not_cancellation():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("boom", request=request)
+        return httpx.Response(200)
+
+    async def main():
+        skill = HttpxSkill(async_mode=True, transport=httpx.MockTransport(handler), retries=1, backoff_base=0)
+        assert (await skill.aget("https://api.test/x")).status_code == 200
+        await skill.aclose()
+
+    asyncio.run(main())
+    assert len(attempts) == 2
+
+    def cancelled(request):
+        raise asyncio.CancelledError()
+
+    async def cancel():
+        skill = HttpxSkill(async_mode=True, transport=httpx.MockTransport(cancelled), retries=3, backoff_base=0)
+        try:
+            await skill.aget("https://api.test/x")
+        finally:
+            assert skill.retry_stats.attempts == 0
+            await skill.aclose()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel())
@@ -0,0 +1,105 @@
+import asyncio
+import gzip
+import threading
+import time
+
+import httpx
+
+from scripts.httpx_singleflight import AsyncSingleFlightTransport, SingleFlightTransport, key_by_headers
+from scripts.httpx_skill import HttpxSkill
+
+
+def _slow_app(calls, body=b"payload", status=200, headers=()):
+    async def app(scope, receive, send):
+        calls.append(dict(scope["headers"]).get(b"authorization"))
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.start", "status": status, "headers": list(headers)})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def test_concurrent_identical_gets_share_one_upstream_request():
+    calls = []
+    compressed = gzip.compress(b"hello world")
+    app = _slow_app(calls, body=compressed, headers=[(b"content-encoding", b"gzip")])
+
+    async def main():
+        skill = HttpxSkill(async_mode=True, transport=httpx.ASGITransport(app=app), single_flight=True)
+        responses = await asyncio.gather(*(skill.aget("http://api.test/item") for _ in range(20)))
+        other = await asyncio.gather(
+            skill.aget("http://api.test/item", headers={"Authorization": "a"}),
+            skill.aget("http://api.test/item", headers={"Authorization": "b"}),
+        )
+        await skill.aclose()
+        return skill, responses, other
+
+    skill, responses, other = asyncio.run(main())
+    assert all(r.text == "hello world" for r in responses + other)
+    assert sum(r.extensions.get("single_flight") == "COALESCED" for r in responses) == 19
+    # 1 for the shared group, 1 per distinct Authorization header
+    assert len(calls) == 3
+    assert skill.single_flight_stats.as_dict() == {"leaders": 3, "coalesced": 19, "fallbacks": 0}
+
+
+def test_sync_waiters_share_result_and_errors_and_key_function_opt_out():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        time.sleep(0.05)
+        if request.url.path == "/down":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, content=b"ok")
+
+    key = key_by_headers(["authorization"])
+    transport = SingleFlightTransport(
+        httpx.MockTransport(handler), key=lambda r: None if r.url.path == "/fresh" else key(r)
+    )
+    client = httpx.Client(transport=transport)
+    results = {}
+
+    def fetch(i, path):
+        try:
+            results[i] = client.get(f"http://api.test{path}").status_code
+        except httpx.ConnectError:
+            results[i] = "error"
+
+    paths = ("/ok", "/down", "/fresh")
+    threads = [threading.Thread(target=fetch, args=(f"{path}{i}", path)) for path in paths for i in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls.count("/ok") == 1 and calls.count("/down") == 1 and calls.count("/fresh") == 5
+    assert sorted(set(results.values()), key=str) == [200, "error"]
+    assert sum(v == "error" for v in results.values()) == 5
+    client.close()
+
+
+def test_waiters_stop_waiting_for_a_stalled_leader_after_their_timeout():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, content=b"ok")
+
+    transport = SingleFlightTransport(httpx.MockTransport(handler))
+    client = httpx.Client(transport=transport)
+    with client.stream("GET", "http://api.test/slow"):  # leader never reads or closes its body
+        started = time.monotonic()
+        response = client.get("http://api.test/slow", timeout=0.1)
+        assert response.content == b"ok" and time.monotonic() - started < 2
+    assert len(calls) == 2
+    assert transport.stats.as_dict() == {"leaders": 1, "coalesced": 1, "fallbacks": 1}
+
+    async def main():
+        atransport = AsyncSingleFlightTransport(httpx.MockTransport(handler))
+        async with httpx.AsyncClient(transport=atransport) as aclient:
+            async with aclient.stream("GET", "http://api.test/aslow"):
+                response = await aclient.get("http://api.test/aslow", timeout=0.1)
+        return response, atransport.stats.fallbacks
+
+    response, fallbacks = asyncio.run(main())
+    assert response.content == b"ok" and fallbacks == 1
+    client.close()
@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from scripts.httpx_skill import HttpxSkill
+from scripts.httpx_streaming import iter_json_items, iter_ndjson, iter_sse
+
+
+def _chunks(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_json_items_survive_any_chunking():
+    doc = [1, -2.5e3, 'a,]"}\\', {"x": [1, {"y": "]"}]}, [], True, None, "é", [[[]]]]
+    raw = json.dumps(doc).encode()
+    wrapped = json.dumps({"meta": {"a": [1, "]"]}, "data": doc, "after": 1}).encode()
+    for size in (1, 3, 7, len(raw)):
+        assert list(iter_json_items(_chunks(raw, size))) == doc
+        assert list(iter_json_items(_chunks(wrapped, size), key="data")) == doc
+    with pytest.raises(ValueError):
+        list(iter_json_items([b"[1, 2"]))
+    with pytest.raises(ValueError):
+        list(iter_json_items([b'["' + b"x" * 100], max_item_bytes=50))
+
+
+def test_ndjson_and_sse_parsing():
+    nd = b'{"a":1}\n\n{"b":2}\r\n3'
+    assert list(iter_ndjson(_chunks(nd, 2))) == [{"a": 1}, {"b": 2}, 3]
+    sse = b': keep-alive\r\nevent: update\r\ndata: {"n":\r\ndata: 1}\r\nid: 7\r\n\r\ndata: x\n\ndata: unterminated'
+    for size in (1, 4, len(sse)):
+        events = list(iter_sse(_chunks(sse, size)))
+        assert [(e.event, e.data, e.id) for e in events] == [("update", '{"n":\n1}', "7"), ("message", "x", "7")]
+    assert events[0].json() == {"n": 1}
+
+
+def test_skill_streams_items_sync_and_async():
+    rows = [{"i": i} for i in range(50)]
+
+    def handler(request):
+        if request.url.path == "/rows":
+            return httpx.Response(200, content=json.dumps({"items": rows}).encode())
+        if request.url.path == "/events":
+            assert request.headers["accept"] == "text/event-stream"
+            return httpx.Response(200, content=b"data: 1\n\ndata: 2\n\n")
+        return httpx.Response(200, content=b"\n".join(json.dumps(r).encode() for r in rows))
+
+    transport = httpx.MockTransport(handler)
+    skill = HttpxSkill(transport=transport)
+    assert list(skill.iter_json_items("https://api.test/rows", key="items")) == rows
+    assert list(skill.iter_ndjson("https://api.test/lines")) == rows
+    assert [e.data for e in skill.iter_sse("https://api.test/events")] == ["1", "2"]
+
+    async def main():
+        async with HttpxSkill(async_mode=True, transport=transport) as askill:
+            return [item async for item in askill.aiter_json_items("https://api.test/rows", key="items")]
+
+    assert asyncio.run(main()) == rows
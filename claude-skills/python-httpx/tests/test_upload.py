@@ -0,0 +1,106 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from scripts.httpx_skill import HttpxSkill
+from scripts.httpx_upload import UploadError
+
+DATA = os.urandom(3 * 1024 * 1024 + 17)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "payload.bin"
+    path.write_bytes(DATA)
+    return str(path)
+
+
+def test_multipart_upload_streams_with_length_and_progress(source):
+    seen = {}
+
+    def handler(request):
+        body = request.read()
+        seen["length"] = int(request.headers["content-length"])
+        seen["body"] = body
+        return httpx.Response(200)
+
+    progress = []
+    skill = HttpxSkill(transport=httpx.MockTransport(handler))
+    skill.upload_file("https://up.test/", source, extra_fields={"kind": "blob"}, progress=lambda s, t: progress.append((s, t)))
+    assert seen["length"] == len(seen["body"])
+    assert b'name="kind"\r\n\r\nblob\r\n' in seen["body"]
+    assert b'filename="payload.bin"' in seen["body"] and DATA in seen["body"]
+    assert progress[-1] == (seen["length"], seen["length"])
+
+
+def test_raw_upload_body_is_resent_on_retry(source):
+    bodies = []
+
+    def handler(request):
+        bodies.append(request.read())
+        return httpx.Response(503 if len(bodies) == 1 else 200)
+
+    progress = []
+    skill = HttpxSkill(transport=httpx.MockTransport(handler), retries=1, backoff_base=0)
+    response = skill.upload_raw("https://up.test/obj", source, progress=lambda s, t: progress.append((s, t)))
+    assert response.status_code == 200
+    assert bodies == [DATA, DATA]
+    # The resend restarts the count instead of running past the total
+    assert max(sent for sent, _ in progress) == len(DATA)
+    assert progress[-1] == (len(DATA), len(DATA))
+
+
+class TusServer:
+    def __init__(self, fail_patch=None):
+        self.data = bytearray()
+        self.length = None
+        self.fail_patch = fail_patch
+        self.patches = 0
+
+    def __call__(self, request):
+        assert request.headers["tus-resumable"] == "1.0.0"
+        if request.method == "POST":
+            self.length = int(request.headers["upload-length"])
+            return httpx.Response(201, headers={"Location": "/files/1"})
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={"Upload-Offset": str(len(self.data))})
+        self.patches += 1
+        if self.patches == self.fail_patch:
+            raise httpx.WriteError("reset", request=request)
+        assert int(request.headers["upload-offset"]) == len(self.data)
+        self.data += request.read()
+        return httpx.Response(204, headers={"Upload-Offset": str(len(self.data))})
+
+
+def test_tus_upload_resumes(source):
+    server = TusServer(fail_patch=2)
+    skill = HttpxSkill(transport=httpx.MockTransport(server))
+    with pytest.raises(UploadError) as info:
+        skill.tus_upload("https://tus.test/files", source, chunk_size=1024 * 1024)
+    assert info.value.upload_url == "https://tus.test/files/1" and info.value.offset == 1024 * 1024
+
+    url = skill.tus_upload("https://tus.test/files", source, upload_url=info.value.upload_url, chunk_size=1024 * 1024)
+    assert url == "https://tus.test/files/1"
+    assert bytes(server.data) == DATA and server.length == len(DATA)
+
+
+def test_parallel_part_upload(source):
+    parts = {}
+
+    def handler(request):
+        number = int(request.url.params["partNumber"])
+        parts[number] = request.read()
+        return httpx.Response(200, headers={"ETag": f'"etag-{number}"'})
+
+    async def main():
+        skill = HttpxSkill(async_mode=True, transport=httpx.MockTransport(handler))
+        urls = [f"https://s3.test/key?partNumber={n}&uploadId=u" for n in (1, 2, 3, 4)]
+        result = await skill.aupload_parts(source, urls, part_size=1024 * 1024, concurrency=3)
+        await skill.aclose()
+        return result
+
+    result = asyncio.run(main())
+    assert result == [(n, f'"etag-{n}"') for n in (1, 2, 3, 4)]
+    assert b"".join(parts[n] for n in sorted(parts)) == DATA
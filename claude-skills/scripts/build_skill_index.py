@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Skill Index Builder - Writes one compact JSON index of every skill under a root
+
+Usage:
+    build_skill_index.py <root> [--output skills-index.json] [--check]
+
+Examples:
+    build_skill_index.py claude-skills
+    build_skill_index.py ~/.codex/skills --output ~/.codex/skills-index.json
+
+Each entry holds the skill's frontmatter fields (name, description, version, depends-on,
+related-skills, ...), its file list and per-file SHA-256 hashes, so loaders read one small
+file instead of parsing every SKILL.md at startup. The index holds content hashes only, so
+it is identical across clones. Rebuilds are incremental: a local stat cache next to the
+index (.skills-index.cache.json, not meant to be committed) lets files whose size and mtime
+are unchanged skip re-hashing, and frontmatter is only re-parsed when SKILL.md changed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import yaml
+
+from quick_validate import SCHEMA, SKIP_DIRS, discover_skills
+
+INDEX_FILE = "skills-index.json"
+STAT_CACHE_FILE = ".skills-index.cache.json"
+INDEX_VERSION = 1
+INDEX_FIELDS = [key for key in SCHEMA if key != "metadata"]
+
+
+def read_frontmatter(skill_md: Path) -> Dict[str, Any]:
+    """SCHEMA fields from the SKILL.md frontmatter; empty if it is missing or unparsable."""
+    match = re.match(r"^---\n(.*?)\n---", skill_md.read_text(encoding="utf-8"), re.DOTALL)
+    if not match:
+        return {}
+    try:
+        frontmatter = yaml.safe_load(match.group(1))
+    except yaml.YAMLError:
+        return {}
+    if not isinstance(frontmatter, dict):
+        return {}
+    return {key: frontmatter[key] for key in INDEX_FIELDS if key in frontmatter}
+
+
+def _skill_files(skill_dir: Path, nested: set) -> list:
+    """Files of one skill, excluding junk directories and nested skills (indexed separately)."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(skill_dir):
+        current = Path(dirpath)
+        dirnames[:] = sorted(
+            d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".") and current / d not in nested
+        )
+        files.extend(current / name for name in filenames if not name.endswith((".pyc", ".skill", INDEX_FILE, STAT_CACHE_FILE)))
+    return sorted(files)
+
+
+def _file_hash(path: Path, stat_cache: Dict[str, Any]) -> str:
+    """SHA-256 of ``path``, reusing the stat cache entry when size and mtime are unchanged."""
+    stat = path.stat()
+    key = str(path)
+    cached = stat_cache.get(key)
+    if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+        return cached["sha256"]
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    stat_cache[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+    return digest
+
+
+def _stat_cache_path(index_path: Path) -> Path:
+    return index_path.with_name(STAT_CACHE_FILE)
+
+
+def _load_stat_cache(index_path: Optional[Path]) -> Dict[str, Any]:
+    if index_path is None:
+        return {}
+    try:
+        return json.loads(_stat_cache_path(index_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_stat_cache(index_path: Path, stat_cache: Dict[str, Any]) -> None:
+    path = _stat_cache_path(index_path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(stat_cache, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_index(index_path: str) -> Dict[str, Any]:
+    """The skills of an index file keyed by path relative to its root; empty if absent or stale."""
+    try:
+        data = json.loads(Path(index_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != INDEX_VERSION:
+        return {}
+    return data.get("skills", {})
+
+
+def build_index(
+    root: str, index_path: Optional[str] = None, stat_cache: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Build the index for ``root``, reusing frontmatter from ``index_path`` for unchanged SKILL.md
+    files and hashes from ``stat_cache`` (updated in place) for unchanged files.
+    """
+    root_path = Path(root).resolve()
+    previous = load_index(index_path) if index_path else {}
+    stat_cache = {} if stat_cache is None else stat_cache
+    # Entries for deleted files are dropped by rebuilding the cache from what is seen
+    seen: Dict[str, Any] = {}
+    skill_dirs = discover_skills(str(root_path))
+    nested = set(skill_dirs)
+
+    skills: Dict[str, Any] = {}
+    for skill_dir in skill_dirs:
+        rel = skill_dir.relative_to(root_path).as_posix()
+        old = previous.get(rel, {})
+        old_files = old.get("files", {})
+        files = {}
+        for path in _skill_files(skill_dir, nested - {skill_dir}):
+            name = path.relative_to(skill_dir).as_posix()
+            files[name] = _file_hash(path, stat_cache)
+            seen[str(path)] = stat_cache[str(path)]
+
+        if old and old_files.get("SKILL.md") == files.get("SKILL.md"):
+            fields = {key: old[key] for key in INDEX_FIELDS if key in old}
+        else:
+            fields = read_frontmatter(skill_dir / "SKILL.md")
+        fields.setdefault("name", skill_dir.name)
+
+        # One digest over every file: changes whenever the skill's content does
+        combined = hashlib.sha256()
+        for name, digest in files.items():
+            combined.update(f"{name}\0{digest}\n".encode("utf-8"))
+        skills[rel] = {**fields, "hash": combined.hexdigest(), "files": files}
+
+    stat_cache.clear()
+    stat_cache.update(seen)
+    return {"version": INDEX_VERSION, "skills": skills}
+
+
+def write_index(root: str, output: Optional[str] = None) -> bool:
+    """Rebuild the index file; returns True when its content changed."""
+    index_path = Path(output) if output else Path(root) / INDEX_FILE
+    stat_cache = _load_stat_cache(index_path)
+    index = build_index(root, str(index_path), stat_cache)
+    _save_stat_cache(index_path, stat_cache)
+    text = json.dumps(index, indent=1, sort_keys=True, ensure_ascii=False) + "\n"
+    if index_path.exists() and index_path.read_text(encoding="utf-8") == text:
+        return False
+    tmp = index_path.with_name(index_path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, index_path)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a JSON index of every skill under a root.")
+    parser.add_argument("root", help="Directory containing the skills")
+    parser.add_argument("--output", help=f"Index file (default: <root>/{INDEX_FILE})")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the index is out of date (no write)")
+    args = parser.parse_args()
+
+    index_path = Path(args.output) if args.output else Path(args.root) / INDEX_FILE
+    if args.check:
+        current = build_index(args.root, str(index_path), _load_stat_cache(index_path))
+        if load_index(str(index_path)) != current["skills"]:
+            print(f"[ERROR] {index_path} is out of date; run build_skill_index.py {args.root}")
+            sys.exit(1)
+        print(f"[OK] {index_path} is up to date")
+        sys.exit(0)
+
+    changed = write_index(args.root, args.output)
+    count = len(load_index(str(index_path)))
+    print(f"[OK] {'Updated' if changed else 'Unchanged'}: {index_path} ({count} skills)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,33 @@
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
+import json
 import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import urllib.error
 import urllib.parse
 import zipfile
 
-from github_utils import github_request
+from github_utils import github_request, github_request_full
 DEFAULT_REF = "main"
+LOCK_FILE = "skills.lock.json"
+MAX_PARALLEL_REPOS = 4
+CACHE_MAX_BYTES = int(os.environ.get("CODEX_SKILL_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+_SHA_RE = re.compile(r"[0-9a-f]{40}")
+_cache_lock = threading.Lock()
+# Repo roots backed by an archive (nothing is extracted) -> (archive path, top-level directory)
+_repo_archives: dict[str, tuple[str, str]] = {}
+# Archives fetched by this run; never evicted while it is installing from them
+_archives_in_use: set[str] = set()
+COPY_CHUNK = 1024 * 1024
 
 
 @dataclass
@@ -27,6 +42,9 @@ class Args:
     dest: str | None = None
     name: str | None = None
     method: str = "auto"
+    no_deps: bool = False
+    no_cache: bool = False
+    lock: str | None = None
 
 
 @dataclass
@@ -38,6 +56,30 @@ class Source:
     repo_url: str | None = None
 
 
+@dataclass(frozen=True)
+class SkillRef:
+    owner: str
+    repo: str
+    ref: str
+    path: str
+
+    @property
+    def repo_key(self) -> tuple[str, str, str]:
+        return (self.owner, self.repo, self.ref)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path.rstrip("/"))
+
+
+@dataclass
+class PlannedSkill:
+    skill: SkillRef
+    src: str
+    depends_on: list[SkillRef] = field(default_factory=list)
+    explicit: bool = False
+
+
 class InstallError(Exception):
     pass
 
@@ -77,23 +119,138 @@ def _parse_github_url(url: str, default_ref: str) -> tuple[str, str, str, str |
     return owner, repo, ref, subpath or None
 
 
-def _download_repo_zip(owner: str, repo: str, ref: str, dest_dir: str) -> str:
-    zip_url = f"https://codeload.github.com/{owner}/{repo}/zip/{ref}"
-    zip_path = os.path.join(dest_dir, "repo.zip")
+def _cache_root() -> str:
+    return os.path.join(_codex_home(), "cache", "skill-install")
+
+
+def _load_ref_cache() -> dict[str, dict[str, str]]:
+    try:
+        with open(os.path.join(_cache_root(), "refs.json"), encoding="utf-8") as file_handle:
+            return json.load(file_handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def _resolve_commit(owner: str, repo: str, ref: str) -> str:
+    """
+    Commit SHA of ``ref``. The ETag of the last lookup is sent as If-None-Match, and
+    GitHub does not count 304 responses against the rate limit.
+    """
+    if _SHA_RE.fullmatch(ref):
+        return ref
+    key = f"{owner}/{repo}@{ref}"
+    with _cache_lock:
+        cached = _load_ref_cache().get(key, {})
+    headers = {"Accept": "application/vnd.github.sha"}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    url = f"https://api.github.com/repos/{owner}/{repo}/commits/{urllib.parse.quote(ref, safe='')}"
+    status, body, response_headers = github_request_full(url, "codex-skill-install", headers)
+    if status == 304 and cached.get("sha"):
+        return cached["sha"]
+    sha = body.decode("ascii", "ignore").strip()
+    if not _SHA_RE.fullmatch(sha):
+        raise InstallError(f"Could not resolve {ref} to a commit.")
+    with _cache_lock:
+        refs = _load_ref_cache()
+        refs[key] = {"sha": sha, "etag": response_headers.get("ETag", "")}
+        os.makedirs(_cache_root(), exist_ok=True)
+        tmp_path = os.path.join(_cache_root(), f"refs.json.{os.getpid()}.{threading.get_ident()}")
+        with open(tmp_path, "w", encoding="utf-8") as file_handle:
+            json.dump(refs, file_handle, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(_cache_root(), "refs.json"))
+    return sha
+
+
+def _evict_archives(max_bytes: int = CACHE_MAX_BYTES) -> None:
+    """
+    Remove the least recently used archives once the cache exceeds ``max_bytes``.
+    Call with ``_cache_lock`` held.
+    """
+    archives = []
+    for root, _, files in os.walk(os.path.join(_cache_root(), "archives")):
+        for name in files:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            archives.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in archives)
+    for _, size, path in sorted(archives):
+        if total <= max_bytes:
+            break
+        if path in _archives_in_use:
+            continue
+        os.remove(path)
+        total -= size
+
+
+def _fetch_archive(owner: str, repo: str, ref: str, dest_dir: str, use_cache: bool) -> str:
+    """
+    Path of the repo zip. With the cache, archives live under $CODEX_HOME/cache keyed by
+    owner/repo/commit-SHA, so installing from the same commit never downloads twice.
+    """
+    sha = None
+    if use_cache:
+        try:
+            sha = _resolve_commit(owner, repo, ref)
+        except (urllib.error.URLError, InstallError):
+            sha = None  # e.g. private repo without a token: download by ref, uncached
+    if sha is None:
+        zip_path = os.path.join(dest_dir, "repo.zip")
+        zip_url = f"https://codeload.github.com/{owner}/{repo}/zip/{ref}"
+    else:
+        zip_path = os.path.join(_cache_root(), "archives", owner, repo, f"{sha}.zip")
+        zip_url = f"https://codeload.github.com/{owner}/{repo}/zip/{sha}"
+        with _cache_lock:
+            if os.path.isfile(zip_path):
+                os.utime(zip_path)  # mark as recently used for eviction
+                _archives_in_use.add(zip_path)
+                return zip_path
     try:
         payload = _request(zip_url)
     except urllib.error.HTTPError as exc:
         raise InstallError(f"Download failed: HTTP {exc.code}") from exc
-    with open(zip_path, "wb") as file_handle:
+    os.makedirs(os.path.dirname(zip_path), exist_ok=True)
+    tmp_path = f"{zip_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as file_handle:
         file_handle.write(payload)
+    with _cache_lock:
+        os.replace(tmp_path, zip_path)
+        _archives_in_use.add(zip_path)
+        if sha is not None:
+            _evict_archives()
+    return zip_path
+
+
+def _download_repo_zip(
+    owner: str, repo: str, ref: str, dest_dir: str, use_cache: bool = True
+) -> str:
+    """
+    Fetch the repo archive without extracting it. The returned repo root is a virtual path:
+    skills under it are read and installed straight from the archive.
+    """
+    zip_path = _fetch_archive(owner, repo, ref, dest_dir, use_cache)
     with zipfile.ZipFile(zip_path, "r") as zip_file:
-        _safe_extract_zip(zip_file, dest_dir)
         top_levels = {name.split("/")[0] for name in zip_file.namelist() if name}
     if not top_levels:
         raise InstallError("Downloaded archive was empty.")
     if len(top_levels) != 1:
         raise InstallError("Unexpected archive layout.")
-    return os.path.join(dest_dir, next(iter(top_levels)))
+    top_level = next(iter(top_levels))
+    repo_root = os.path.join(dest_dir, top_level)
+    with _cache_lock:
+        _repo_archives[repo_root] = (zip_path, top_level)
+    return repo_root
+
+
+def _archive_member(path: str) -> tuple[str, str] | None:
+    """(archive path, member prefix) when ``path`` lies in an archive-backed repo root."""
+    with _cache_lock:
+        archives = list(_repo_archives.items())
+    for repo_root, (zip_path, top_level) in archives:
+        if path == repo_root or path.startswith(repo_root + os.sep):
+            rel = os.path.relpath(path, repo_root).replace(os.sep, "/")
+            return zip_path, top_level if rel == "." else f"{top_level}/{rel}"
+    return None
 
 
 def _run_git(args: list[str]) -> None:
@@ -102,14 +259,28 @@ def _run_git(args: list[str]) -> None:
         raise InstallError(result.stderr.strip() or "Git command failed.")
 
 
-def _safe_extract_zip(zip_file: zipfile.ZipFile, dest_dir: str) -> None:
+def _safe_extract_zip(zip_file: zipfile.ZipFile, prefix: str, dest_dir: str) -> None:
+    """
+    Stream the members under ``prefix`` into ``dest_dir`` (the prefix itself stripped),
+    validating each path as it goes; other members are never read.
+    """
     dest_root = os.path.realpath(dest_dir)
+    prefix = prefix.strip("/") + "/"
     for info in zip_file.infolist():
-        extracted_path = os.path.realpath(os.path.join(dest_dir, info.filename))
-        if extracted_path == dest_root or extracted_path.startswith(dest_root + os.sep):
+        if not info.filename.startswith(prefix) or info.filename == prefix:
+            continue
+        target = os.path.realpath(os.path.join(dest_dir, info.filename[len(prefix) :]))
+        if not target.startswith(dest_root + os.sep):
+            raise InstallError("Archive contains files outside the destination.")
+        if info.is_dir():
+            os.makedirs(target, exist_ok=True)
             continue
-        raise InstallError("Archive contains files outside the destination.")
-    zip_file.extractall(dest_dir)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with zip_file.open(info) as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, COPY_CHUNK)
+        mode = (info.external_attr >> 16) & 0o777
+        if mode & 0o111:
+            os.chmod(target, 0o755)
 
 
 def _validate_relative_path(path: str) -> None:
@@ -162,6 +333,16 @@ def _git_sparse_checkout(repo_url: str, ref: str, paths: list[str], dest_dir: st
 
 
 def _validate_skill(path: str) -> None:
+    member = _archive_member(path)
+    if member is not None:
+        zip_path, prefix = member
+        with zipfile.ZipFile(zip_path) as zip_file:
+            names = zip_file.namelist()
+        if not any(name.startswith(prefix + "/") for name in names):
+            raise InstallError(f"Skill path not found: {path}")
+        if f"{prefix}/SKILL.md" not in names:
+            raise InstallError("SKILL.md not found in selected skill directory.")
+        return
     if not os.path.isdir(path):
         raise InstallError(f"Skill path not found: {path}")
     skill_md = os.path.join(path, "SKILL.md")
@@ -173,7 +354,18 @@ def _copy_skill(src: str, dest_dir: str) -> None:
     os.makedirs(os.path.dirname(dest_dir), exist_ok=True)
     if os.path.exists(dest_dir):
         raise InstallError(f"Destination already exists: {dest_dir}")
-    shutil.copytree(src, dest_dir)
+    member = _archive_member(src)
+    if member is None:
+        shutil.copytree(src, dest_dir)
+        return
+    zip_path, prefix = member
+    os.makedirs(dest_dir)
+    try:
+        with zipfile.ZipFile(zip_path) as zip_file:
+            _safe_extract_zip(zip_file, prefix, dest_dir)
+    except BaseException:
+        shutil.rmtree(dest_dir, ignore_errors=True)
+        raise
 
 
 def _build_repo_url(owner: str, repo: str) -> str:
@@ -184,10 +376,12 @@ def _build_repo_ssh(owner: str, repo: str) -> str:
     return f"git@github.com:{owner}/{repo}.git"
 
 
-def _prepare_repo(source: Source, method: str, tmp_dir: str) -> str:
+def _prepare_repo(source: Source, method: str, tmp_dir: str, use_cache: bool = True) -> str:
     if method in ("download", "auto"):
         try:
-            return _download_repo_zip(source.owner, source.repo, source.ref, tmp_dir)
+            return _download_repo_zip(
+                source.owner, source.repo, source.ref, tmp_dir, use_cache
+            )
         except InstallError as exc:
             if method == "download":
                 raise
@@ -206,6 +400,202 @@ def _prepare_repo(source: Source, method: str, tmp_dir: str) -> str:
     raise InstallError("Unsupported method.")
 
 
+def _repo_commit(repo_root: str) -> str | None:
+    """Commit SHA of a prepared repo: git HEAD, or the comment GitHub stores in its zip archives."""
+    if os.path.isdir(os.path.join(repo_root, ".git")):
+        result = subprocess.run(
+            ["git", "-C", repo_root, "rev-parse", "HEAD"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+    with _cache_lock:
+        archive = _repo_archives.get(repo_root)
+    if archive is not None:
+        with zipfile.ZipFile(archive[0]) as zip_file:
+            comment = zip_file.comment.decode("ascii", "ignore").strip()
+        if _SHA_RE.fullmatch(comment):
+            return comment
+    return None
+
+
+def _ensure_path(repo_root: str, path: str) -> None:
+    """Sparse checkouts only contain the requested paths; add dependencies discovered later."""
+    if repo_root in _repo_archives or os.path.exists(os.path.join(repo_root, path)):
+        return
+    if os.path.isdir(os.path.join(repo_root, ".git")):
+        _run_git(["git", "-C", repo_root, "sparse-checkout", "add", path])
+
+
+def _read_depends_on(skill_md: str) -> list[str]:
+    """``depends-on`` from SKILL.md frontmatter, as a flow (``[a, b]``) or block (``- a``) list."""
+    member = _archive_member(skill_md)
+    if member is not None:
+        with zipfile.ZipFile(member[0]) as zip_file:
+            text = zip_file.read(member[1]).decode("utf-8")
+    else:
+        with open(skill_md, encoding="utf-8") as file_handle:
+            text = file_handle.read()
+    match = re.match(r"^---\n(.*?)\n---", text, re.DOTALL)
+    if not match:
+        return []
+    lines = match.group(1).splitlines()
+    for idx, line in enumerate(lines):
+        key, _, value = line.partition(":")
+        if key.strip() != "depends-on":
+            continue
+        value = value.strip()
+        if value.startswith("["):
+            items = value.strip("[]").split(",")
+        elif value:
+            items = [value]
+        else:
+            items = []
+            for item in lines[idx + 1 :]:
+                if not item.strip().startswith("-"):
+                    break
+                items.append(item.strip()[1:])
+        return [i.strip().strip("\"'") for i in items if i.strip().strip("\"'")]
+    return []
+
+
+def _parse_dependency(dep: str, parent: SkillRef) -> SkillRef:
+    """
+    A dependency is a GitHub URL, a repo-relative path (``skills/foo``), or a bare skill name
+    resolved as a sibling of the skill that depends on it.
+    """
+    if "://" in dep:
+        owner, repo, ref, path = _parse_github_url(dep, parent.ref)
+        if not path:
+            raise InstallError(f"Dependency URL has no skill path: {dep}")
+        return SkillRef(owner, repo, ref, path.strip("/"))
+    if "/" in dep:
+        path = dep.strip("/")
+    else:
+        path = "/".join(p for p in (os.path.dirname(parent.path.rstrip("/")), dep) if p)
+    _validate_relative_path(path)
+    return SkillRef(parent.owner, parent.repo, parent.ref, path)
+
+
+def _resolve_plan(
+    roots: list[SkillRef],
+    source: Source,
+    method: str,
+    tmp_dir: str,
+    with_deps: bool = True,
+    use_cache: bool = True,
+) -> tuple[list[PlannedSkill], dict[tuple[str, str, str], str]]:
+    """
+    Walk the transitive ``depends-on`` graph breadth first. Each source repo is prepared
+    once (its skills are read from the same archive or checkout) and repos first needed at
+    the same depth are prepared concurrently. Returns skills in install order (dependencies
+    first) and the prepared repo root of each (owner, repo, ref).
+    """
+    repo_roots: dict[tuple[str, str, str], str] = {}
+    planned: dict[SkillRef, PlannedSkill] = {}
+    level = list(dict.fromkeys(roots))
+    while level:
+        missing = list(dict.fromkeys(s.repo_key for s in level if s.repo_key not in repo_roots))
+        sources = []
+        for idx, (owner, repo, ref) in enumerate(missing):
+            repo_dir = os.path.join(tmp_dir, f"repo-{len(repo_roots) + idx}")
+            os.makedirs(repo_dir)
+            same_repo = (owner, repo) == (source.owner, source.repo)
+            paths = [s.path for s in level if s.repo_key == (owner, repo, ref)]
+            repo_url = source.repo_url if same_repo else None
+            sources.append((Source(owner, repo, ref, paths, repo_url), repo_dir))
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_PARALLEL_REPOS, len(sources)))) as pool:
+            prepared = list(
+                pool.map(lambda item: _prepare_repo(item[0], method, item[1], use_cache), sources)
+            )
+        for (src, _), repo_root in zip(sources, prepared):
+            repo_roots[(src.owner, src.repo, src.ref)] = repo_root
+
+        next_level = []
+        for skill in level:
+            if skill in planned:
+                continue
+            repo_root = repo_roots[skill.repo_key]
+            _ensure_path(repo_root, skill.path)
+            skill_src = os.path.join(repo_root, skill.path)
+            _validate_skill(skill_src)
+            deps = []
+            if with_deps:
+                deps = [
+                    _parse_dependency(dep, skill)
+                    for dep in _read_depends_on(os.path.join(skill_src, "SKILL.md"))
+                ]
+            planned[skill] = PlannedSkill(skill, skill_src, deps, skill in roots)
+            next_level.extend(d for d in deps if d not in planned)
+        level = list(dict.fromkeys(next_level))
+
+    return _topological_order(planned), repo_roots
+
+
+def _topological_order(planned: dict[SkillRef, PlannedSkill]) -> list[PlannedSkill]:
+    order: list[PlannedSkill] = []
+    state: dict[SkillRef, str] = {}
+
+    def visit(skill: SkillRef, trail: list[SkillRef]) -> None:
+        if state.get(skill) == "done":
+            return
+        if state.get(skill) == "visiting":
+            cycle = trail[trail.index(skill) :] + [skill]
+            raise InstallError("Dependency cycle: " + " -> ".join(s.name for s in cycle))
+        state[skill] = "visiting"
+        for dep in planned[skill].depends_on:
+            visit(dep, trail + [skill])
+        state[skill] = "done"
+        order.append(planned[skill])
+
+    for skill in planned:
+        visit(skill, [])
+    return order
+
+
+def _tree_hash(path: str) -> str:
+    """SHA-256 over every file's relative path and content, in sorted order."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            rel = os.path.relpath(file_path, path).replace(os.sep, "/")
+            with open(file_path, "rb") as file_handle:
+                content = hashlib.sha256(file_handle.read()).hexdigest()
+            digest.update(f"{rel}\0{content}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _write_lock(lock_path: str, entries: dict[str, dict], replace: bool = True) -> None:
+    """
+    Merge ``entries`` into the lock file, keyed by installed skill name. With
+    ``replace=False`` existing entries are kept and only missing ones are added.
+    """
+    lock = {"version": 1, "skills": {}}
+    if os.path.isfile(lock_path):
+        try:
+            with open(lock_path, encoding="utf-8") as file_handle:
+                lock = json.load(file_handle)
+        except (OSError, ValueError):
+            pass
+    skills = lock.setdefault("skills", {})
+    if replace:
+        skills.update(entries)
+    else:
+        for name, entry in entries.items():
+            skills.setdefault(name, entry)
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    tmp_path = lock_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file_handle:
+        json.dump(lock, file_handle, indent=2, sort_keys=True)
+        file_handle.write("\n")
+    os.replace(tmp_path, lock_path)
+
+
 def _resolve_source(args: Args) -> Source:
     if args.url:
         owner, repo, ref, url_path = _parse_github_url(args.url, args.ref)
@@ -263,6 +653,19 @@ def _parse_args(argv: list[str]) -> Args:
         choices=["auto", "download", "git"],
         default="auto",
     )
+    parser.add_argument(
+        "--no-deps",
+        action="store_true",
+        help="Do not install skills listed in depends-on",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Download the repo archive even if it is cached",
+    )
+    parser.add_argument(
+        "--lock", help=f"Lock file to update (defaults to <dest>/{LOCK_FILE})"
+    )
     return parser.parse_args(argv, namespace=Args())
 
 
@@ -276,26 +679,61 @@ def main(argv: list[str]) -> int:
         for path in source.paths:
             _validate_relative_path(path)
         dest_root = args.dest or _default_dest()
+        roots = [
+            SkillRef(source.owner, source.repo, source.ref, path.strip("/"))
+            for path in source.paths
+        ]
         tmp_dir = tempfile.mkdtemp(prefix="skill-install-", dir=_tmp_root())
         try:
-            repo_root = _prepare_repo(source, args.method, tmp_dir)
-            installed = []
-            for path in source.paths:
-                skill_name = args.name if len(source.paths) == 1 else None
-                skill_name = skill_name or os.path.basename(path.rstrip("/"))
+            plan, repo_roots = _resolve_plan(
+                roots,
+                source,
+                args.method,
+                tmp_dir,
+                with_deps=not args.no_deps,
+                use_cache=not args.no_cache,
+            )
+            names: dict[SkillRef, str] = {}
+            for item in plan:
+                skill_name = args.name if item.explicit and len(roots) == 1 else None
+                skill_name = skill_name or item.skill.name
                 _validate_skill_name(skill_name)
                 if not skill_name:
                     raise InstallError("Unable to derive skill name.")
                 dest_dir = os.path.join(dest_root, skill_name)
-                if os.path.exists(dest_dir):
+                # Explicit skills must not clobber an install; dependencies may already exist
+                if item.explicit and os.path.exists(dest_dir):
                     raise InstallError(f"Destination already exists: {dest_dir}")
-                skill_src = os.path.join(repo_root, path)
-                _validate_skill(skill_src)
-                _copy_skill(skill_src, dest_dir)
-                installed.append((skill_name, dest_dir))
+                names[item.skill] = skill_name
+            installed = []
+            skipped = []
+            lock_path = args.lock or os.path.join(dest_root, LOCK_FILE)
+            commits = {key: _repo_commit(root) for key, root in repo_roots.items()}
+            for item in plan:
+                skill_name = names[item.skill]
+                dest_dir = os.path.join(dest_root, skill_name)
+                exists = os.path.exists(dest_dir)
+                if exists:
+                    skipped.append((skill_name, dest_dir))
+                else:
+                    _copy_skill(item.src, dest_dir)
+                    installed.append((skill_name, dest_dir))
+                entry = {
+                    "repo": f"{item.skill.owner}/{item.skill.repo}",
+                    "ref": item.skill.ref,
+                    "commit": commits.get(item.skill.repo_key),
+                    "path": item.skill.path,
+                    "sha256": _tree_hash(dest_dir),
+                    "depends-on": sorted(names[d] for d in item.depends_on),
+                }
+                # Lock each skill as soon as it is on disk, so a later failure cannot leave
+                # installed skills unpinned; an existing dependency keeps its own pin if it has one
+                _write_lock(lock_path, {skill_name: entry}, replace=not exists)
         finally:
             if os.path.isdir(tmp_dir):
                 shutil.rmtree(tmp_dir, ignore_errors=True)
+        for skill_name, dest_dir in skipped:
+            print(f"Dependency {skill_name} already installed at {dest_dir}")
         for skill_name, dest_dir in installed:
             print(f"Installed {skill_name} to {dest_dir}")
         return 0
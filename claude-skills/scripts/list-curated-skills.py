@@ -6,10 +6,17 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
 import sys
 import urllib.error
+import urllib.parse
 
-from github_utils import github_api_contents_url, github_request
+from github_utils import (
+    github_api_contents_url,
+    github_api_tree_url,
+    github_client,
+    github_request,
+)
 
 DEFAULT_REPO = "openai/skills"
 DEFAULT_PATH = "skills/.curated"
@@ -25,12 +32,17 @@ class Args(argparse.Namespace):
     path: str
     ref: str
     format: str
+    details: bool
 
 
 def _request(url: str) -> bytes:
     return github_request(url, "codex-skill-list")
 
 
+def _client():
+    return github_client("codex-skill-list")
+
+
 def _codex_home() -> str:
     return os.environ.get("CODEX_HOME", os.path.expanduser("~/.codex"))
 
@@ -65,6 +77,129 @@ def _list_curated(repo: str, path: str, ref: str) -> list[str]:
     return sorted(skills)
 
 
+def _parse_frontmatter(text: str) -> dict[str, str]:
+    """Top-level scalar keys of SKILL.md frontmatter, including ``>``/``|`` block scalars."""
+    match = re.match(r"^---\r?\n(.*?)\r?\n---", text, re.DOTALL)
+    if not match:
+        return {}
+    fields: dict[str, str] = {}
+    lines = match.group(1).splitlines()
+    idx = 0
+    while idx < len(lines):
+        key, sep, value = lines[idx].partition(":")
+        idx += 1
+        if not sep or not key or key[0].isspace():
+            continue
+        value = value.strip()
+        if value[:1] in (">", "|"):
+            block = []
+            while idx < len(lines) and (not lines[idx].strip() or lines[idx][0].isspace()):
+                block.append(lines[idx].strip())
+                idx += 1
+            value = ("\n" if value[0] == "|" else " ").join(block).strip()
+        elif len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        fields[key.strip()] = value
+    return fields
+
+
+def _metadata_cache_path(repo: str) -> str:
+    return os.path.join(_codex_home(), "cache", "curated", repo.replace("/", "__") + ".json")
+
+
+def _list_curated_details(repo: str, path: str, ref: str) -> list[dict[str, str]]:
+    """
+    Name, description and version of every curated skill in two round trips: one recursive
+    git tree request, then the SKILL.md files fetched concurrently from raw.githubusercontent
+    (which does not use API quota). Parsed frontmatter is cached by blob SHA, so only
+    changed SKILL.md files are fetched again.
+    """
+    client = _client()
+    prefix = path.strip("/") + "/"
+    try:
+        tree = client.get_json(github_api_tree_url(repo, ref))
+    except urllib.error.HTTPError as exc:
+        if exc.code == 404:
+            raise ListError(
+                "Curated skills path not found: "
+                f"https://github.com/{repo}/tree/{ref}/{path}"
+            ) from exc
+        raise ListError(f"Failed to fetch curated skills: HTTP {exc.code}") from exc
+
+    if tree.get("truncated"):
+        # Too large for one tree response: take names from the contents API instead
+        skill_md = {
+            name: (f"{prefix}{name}/SKILL.md", None)
+            for name in _list_curated(repo, path, ref)
+        }
+    else:
+        skill_md = {}
+        for entry in tree.get("tree", []):
+            rel = entry.get("path", "")
+            if entry.get("type") == "blob" and rel.startswith(prefix):
+                parts = rel[len(prefix) :].split("/")
+                if len(parts) == 2 and parts[1] == "SKILL.md":
+                    skill_md[parts[0]] = (rel, entry.get("sha"))
+        if not any(
+            entry.get("path") == prefix.rstrip("/") for entry in tree.get("tree", [])
+        ):
+            raise ListError(
+                "Curated skills path not found: "
+                f"https://github.com/{repo}/tree/{ref}/{path}"
+            )
+
+    cache_path = _metadata_cache_path(repo)
+    try:
+        with open(cache_path, encoding="utf-8") as file_handle:
+            cache = json.load(file_handle)
+    except (OSError, ValueError):
+        cache = {}
+
+    missing = [name for name, (_, sha) in skill_md.items() if not sha or sha not in cache]
+    raw_ref = urllib.parse.quote(ref, safe="")
+    urls = [
+        f"https://raw.githubusercontent.com/{repo}/{raw_ref}/{urllib.parse.quote(skill_md[name][0])}"
+        for name in missing
+    ]
+    try:
+        bodies = client.fetch_many(urls, missing_ok=True)
+    except urllib.error.HTTPError as exc:
+        raise ListError(f"Failed to fetch SKILL.md: HTTP {exc.code}") from exc
+    fetched = {}
+    for name, body in zip(missing, bodies):
+        if body is None:
+            # Listed by the contents API (truncated tree) but has no SKILL.md: not a skill
+            del skill_md[name]
+            continue
+        fields = _parse_frontmatter(body.decode("utf-8", "replace"))
+        fetched[name] = {key: fields.get(key, "") for key in ("name", "description", "version")}
+        sha = skill_md[name][1]
+        if sha:
+            cache[sha] = fetched[name]
+
+    if missing and not tree.get("truncated"):
+        live = {sha for _, sha in skill_md.values()}
+        cache = {sha: fields for sha, fields in cache.items() if sha in live}
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file_handle:
+            json.dump(cache, file_handle, indent=1, sort_keys=True)
+        os.replace(tmp_path, cache_path)
+
+    skills = []
+    for name in sorted(skill_md):
+        sha = skill_md[name][1]
+        fields = fetched.get(name) or cache.get(sha, {})
+        skills.append(
+            {
+                "name": name,
+                "description": fields.get("description", ""),
+                "version": fields.get("version", ""),
+            }
+        )
+    return skills
+
+
 def _parse_args(argv: list[str]) -> Args:
     parser = argparse.ArgumentParser(description="List curated skills.")
     parser.add_argument("--repo", default=DEFAULT_REPO)
@@ -76,23 +211,36 @@ def _parse_args(argv: list[str]) -> Args:
         default="text",
         help="Output format",
     )
+    parser.add_argument(
+        "--details",
+        action="store_true",
+        help="Include description and version from each SKILL.md",
+    )
     return parser.parse_args(argv, namespace=Args())
 
 
 def main(argv: list[str]) -> int:
     args = _parse_args(argv)
     try:
-        skills = _list_curated(args.repo, args.path, args.ref)
+        if args.details:
+            details = _list_curated_details(args.repo, args.path, args.ref)
+        else:
+            details = [
+                {"name": name} for name in _list_curated(args.repo, args.path, args.ref)
+            ]
         installed = _installed_skills()
         if args.format == "json":
             payload = [
-                {"name": name, "installed": name in installed} for name in skills
+                {**skill, "installed": skill["name"] in installed} for skill in details
             ]
             print(json.dumps(payload))
         else:
-            for idx, name in enumerate(skills, start=1):
+            for idx, skill in enumerate(details, start=1):
+                name = skill["name"]
                 suffix = " (already installed)" if name in installed else ""
-                print(f"{idx}. {name}{suffix}")
+                version = f" v{skill['version']}" if skill.get("version") else ""
+                description = f": {skill['description']}" if skill.get("description") else ""
+                print(f"{idx}. {name}{version}{suffix}{description}")
         return 0
     except ListError as exc:
         print(f"Error: {exc}", file=sys.stderr)
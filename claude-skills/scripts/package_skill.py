@@ -3,27 +3,241 @@
 Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--no-cache] [--jobs N]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+
+Packages are reproducible: entries are sorted, timestamps are fixed (SOURCE_DATE_EPOCH if set,
+else 1980-01-01) and permissions normalized to 644/755, so unchanged sources give a
+byte-identical .skill file. Files matching .skillignore (gitignore-style) or the default
+ignores (__pycache__, .git, ...) are skipped. Compressed entries are cached by content hash,
+so repackaging only recompresses files that changed; compression runs in parallel.
 """
 
+import argparse
+import fnmatch
+import hashlib
+import os
+import struct
 import sys
-import zipfile
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from quick_validate import validate_skill
 
+IGNORE_FILE = ".skillignore"
+DEFAULT_IGNORES = [
+    ".git/",
+    ".hg/",
+    ".svn/",
+    "__pycache__/",
+    "*.py[cod]",
+    ".pytest_cache/",
+    ".mypy_cache/",
+    ".ruff_cache/",
+    ".venv/",
+    "venv/",
+    "node_modules/",
+    ".DS_Store",
+    "Thumbs.db",
+    "*.skill",
+    IGNORE_FILE,
+]
+COMPRESS_LEVEL = 9
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Files smaller than this are stored; deflate rarely helps and costs a cache entry
+MIN_COMPRESS_SIZE = 64
+
+
+# ---------- ignore rules ----------
+def load_ignore_patterns(skill_path):
+    """Default ignores plus the skill's .skillignore (one glob per line, # comments, ! negation)."""
+    patterns = list(DEFAULT_IGNORES)
+    ignore_file = skill_path / IGNORE_FILE
+    if ignore_file.is_file():
+        for line in ignore_file.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                patterns.append(line)
+    return patterns
+
+
+def is_ignored(rel_path, is_dir, patterns):
+    """gitignore-style match of a posix path relative to the skill root; the last match wins."""
+    ignored = False
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        negate = pattern.startswith("!")
+        pattern = pattern[1:] if negate else pattern
+        if pattern.endswith("/"):
+            if not is_dir:
+                continue
+            pattern = pattern[:-1]
+        if "/" in pattern:
+            matched = fnmatch.fnmatchcase(rel_path, pattern.lstrip("/"))
+        else:
+            matched = fnmatch.fnmatchcase(name, pattern)
+        if matched:
+            ignored = not negate
+    return ignored
+
+
+def collect_files(skill_path, patterns):
+    """Sorted (path, relative posix path) pairs; ignored directories are not descended into."""
+    files = []
+    for root, dirs, names in os.walk(skill_path):
+        root_path = Path(root)
+        rel_root = root_path.relative_to(skill_path).as_posix()
+        rel_root = "" if rel_root == "." else rel_root + "/"
+        dirs[:] = sorted(d for d in dirs if not is_ignored(rel_root + d, True, patterns))
+        for name in names:
+            rel = rel_root + name
+            if not is_ignored(rel, False, patterns) and (root_path / name).is_file():
+                files.append((root_path / name, rel))
+    return sorted(files, key=lambda item: item[1])
+
+
+# ---------- compressed entry cache ----------
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "skill-packager"
+
+
+class EntryCache:
+    """Deflated file bodies keyed by sha256 of the content (and compression level)."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest):
+        return self.directory / digest[:2] / f"{digest}-{COMPRESS_LEVEL}.deflate"
+
+    def get(self, digest):
+        if not self.directory:
+            return None
+        path = self._path(digest)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # prune evicts by mtime, so a hit marks the entry as recently used
+        except OSError:
+            return None
+        return data
 
-def package_skill(skill_path, output_dir=None):
+    def put(self, digest, data):
+        """Store an entry; the cache is best effort, so a failed write is ignored."""
+        if not self.directory:
+            return
+        path = self._path(digest)
+        tmp = None
+        try:
+            path.parent.mkdir(exist_ok=True)
+            # Unique per writer: identical files may be compressed by two threads at once
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            if tmp is not None:
+                Path(tmp).unlink(missing_ok=True)
+
+    def prune(self, max_bytes=CACHE_MAX_BYTES):
+        """Drop the least recently used entries once the cache grows past ``max_bytes``."""
+        if not self.directory:
+            return
+        entries = []
+        for path in self.directory.glob("*/*.deflate"):
+            try:
+                stat = path.stat()
+            except OSError:  # removed by a concurrent packager
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+# ---------- deterministic zip writer ----------
+def _dos_datetime(epoch):
+    t = time.gmtime(max(epoch, 315532800))  # zip timestamps start at 1980
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+def _entry(file_path, arcname, cache):
+    """Read one file and return its zip entry fields, compressing (or reusing the cache) as needed."""
+    data = file_path.read_bytes()
+    crc = zlib.crc32(data) & 0xFFFFFFFF
+    executable = os.access(file_path, os.X_OK) and os.name != "nt"
+    method, body, cached = 0, data, False
+    if len(data) >= MIN_COMPRESS_SIZE:
+        digest = hashlib.sha256(data).hexdigest()
+        compressed = cache.get(digest)
+        cached = compressed is not None
+        if compressed is None:
+            compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+            compressed = compressor.compress(data) + compressor.flush()
+            cache.put(digest, compressed)
+        if len(compressed) < len(data):
+            method, body = 8, compressed
+    return {
+        "name": arcname.encode("utf-8"),
+        "method": method,
+        "crc": crc,
+        "size": len(data),
+        "body": body,
+        "mode": 0o100755 if executable else 0o100644,
+        "cached": cached,
+    }
+
+
+def write_zip(out, entries, epoch):
+    """Write ``entries`` as a zip with fixed timestamps and no extra fields (no ZIP64)."""
+    dos_time, dos_date = _dos_datetime(epoch)
+    central = []
+    offset = 0
+    for e in entries:
+        if e["size"] >= 0xFFFFFFFF or offset >= 0xFFFFFFFF:
+            raise ValueError("Skill too large for a non-ZIP64 package")
+        flags = 0x800 if not e["name"].isascii() else 0  # UTF-8 names
+        header = struct.pack(
+            "<IHHHHHIIIHH", 0x04034B50, 20, flags, e["method"], dos_time, dos_date,
+            e["crc"], len(e["body"]), e["size"], len(e["name"]), 0,
+        )  # fmt: skip
+        out.write(header + e["name"])
+        out.write(e["body"])
+        central.append(
+            struct.pack(
+                "<IHHHHHHIIIHHHHHII", 0x02014B50, (3 << 8) | 20, 20, flags, e["method"], dos_time, dos_date,
+                e["crc"], len(e["body"]), e["size"], len(e["name"]), 0, 0, 0, 0, e["mode"] << 16, offset,
+            )  # fmt: skip
+            + e["name"]
+        )
+        offset += len(header) + len(e["name"]) + len(e["body"])
+    directory = b"".join(central)
+    out.write(directory)
+    out.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, len(entries), len(entries), len(directory), offset, 0))
+
+
+def package_skill(skill_path, output_dir=None, use_cache=True, jobs=None):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        use_cache: Reuse compressed entries for unchanged files from the packager cache
+        jobs: Number of files compressed in parallel (defaults to the CPU count)
 
     Returns:
         Path to the created .skill file, or None if error
@@ -66,14 +280,20 @@ def package_skill(skill_path, output_dir=None):
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, "w", zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob("*"):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
+        files = collect_files(skill_path, load_ignore_patterns(skill_path))
+        cache = EntryCache(default_cache_dir() if use_cache else None)
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            # zlib releases the GIL, so threads compress files in parallel
+            entries = list(pool.map(lambda f: _entry(f[0], f"{skill_name}/{f[1]}", cache), files))
+        for e in entries:
+            print(f"  Added: {e['name'].decode('utf-8')}{' (cached)' if e['cached'] else ''}")
+
+        epoch = int(os.environ.get("SOURCE_DATE_EPOCH", "0"))
+        tmp_filename = skill_filename.with_name(skill_filename.name + ".tmp")
+        with open(tmp_filename, "wb") as out:
+            write_zip(out, entries, epoch)
+        os.replace(tmp_filename, skill_filename)
+        cache.prune()
 
         print(f"\n[OK] Successfully packaged skill to: {skill_filename}")
         return skill_filename
@@ -84,22 +304,22 @@ def package_skill(skill_path, output_dir=None):
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
-
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    parser = argparse.ArgumentParser(
+        usage="python utils/package_skill.py <path/to/skill-folder> [output-directory] [--no-cache] [--jobs N]",
+        description="Package a skill folder into a reproducible .skill file.",
+    )
+    parser.add_argument("skill_path")
+    parser.add_argument("output_dir", nargs="?")
+    parser.add_argument("--no-cache", action="store_true", help="Recompress every file")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel compression workers")
+    args = parser.parse_args()
 
-    print(f"Packaging skill: {skill_path}")
-    if output_dir:
-        print(f"   Output directory: {output_dir}")
+    print(f"Packaging skill: {args.skill_path}")
+    if args.output_dir:
+        print(f"   Output directory: {args.output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(args.skill_path, args.output_dir, use_cache=not args.no_cache, jobs=args.jobs)
 
     if result:
         sys.exit(0)
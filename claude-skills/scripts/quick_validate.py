@@ -4,8 +4,14 @@ Quick validation script for skills.
 Enforces strict schema compliance for SKILL.md frontmatter.
 """
 
+import argparse
+import hashlib
+import json
+import os
 import re
 import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Tuple, Optional, Set, List
 
@@ -156,14 +162,131 @@ def validate_skill(skill_path: str) -> Tuple[bool, str]:
     return True, "Skill is valid!"
 
 
+# ---------- batch validation ----------
+CACHE_FILE = ".skill-validate-cache.json"
+SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv", ".pytest_cache"}
+# Results cached under an older schema/validator are invalid
+VALIDATOR_HASH = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+def discover_skills(root: str) -> List[Path]:
+    """Every directory under ``root`` holding a SKILL.md, in sorted order."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith("."))
+        if "SKILL.md" in filenames:
+            found.append(Path(dirpath))
+    return found
+
+
+def _load_cache(cache_path: Optional[Path]) -> Dict[str, Any]:
+    if cache_path is None or not cache_path.exists():
+        return {}
+    try:
+        data = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if data.get("validator") != VALIDATOR_HASH:
+        return {}
+    return data.get("results", {})
+
+
+def _save_cache(cache_path: Optional[Path], results: Dict[str, Any]) -> None:
+    if cache_path is None:
+        return
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    tmp.write_text(json.dumps({"validator": VALIDATOR_HASH, "results": results}, indent=1, sort_keys=True))
+    os.replace(tmp, cache_path)
+
+
+def validate_all(
+    root: str, jobs: Optional[int] = None, cache_path: Optional[str] = CACHE_FILE
+) -> List[Dict[str, Any]]:
+    """
+    Validate every skill under ``root``. Results are cached by the SHA-256 of each SKILL.md
+    (``cache_path`` is relative to ``root``; None disables the cache), so only changed skills
+    are re-validated; those run in a process pool of ``jobs`` workers.
+    Returns one ``{"skill", "valid", "message", "cached"}`` dict per skill.
+    """
+    root_path = Path(root).resolve()
+    cache_file = (root_path / cache_path) if cache_path else None
+    cached = _load_cache(cache_file)
+
+    skills = discover_skills(str(root_path))
+    results: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[str, Path] = {}
+    digests: Dict[str, str] = {}
+    for skill in skills:
+        rel = skill.relative_to(root_path).as_posix()
+        digests[rel] = hashlib.sha256((skill / "SKILL.md").read_bytes()).hexdigest()
+        hit = cached.get(rel)
+        if hit and hit.get("hash") == digests[rel]:
+            results[rel] = {"skill": rel, "valid": hit["valid"], "message": hit["message"], "cached": True}
+        else:
+            pending[rel] = skill
+
+    if len(pending) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            outcomes = list(pool.map(validate_skill, [str(p) for p in pending.values()]))
+    else:
+        outcomes = [validate_skill(str(p)) for p in pending.values()]
+    for rel, (valid, message) in zip(pending, outcomes):
+        results[rel] = {"skill": rel, "valid": valid, "message": message, "cached": False}
+
+    _save_cache(
+        cache_file,
+        {rel: {"hash": digests[rel], "valid": r["valid"], "message": r["message"]} for rel, r in results.items()},
+    )
+    return [results[rel] for rel in sorted(results)]
+
+
+def junit_report(results: List[Dict[str, Any]]) -> str:
+    """JUnit XML with one testcase per skill, for CI test reporters."""
+    failures = sum(1 for r in results if not r["valid"])
+    suite = ET.Element("testsuite", name="skills", tests=str(len(results)), failures=str(failures))
+    for r in results:
+        case = ET.SubElement(suite, "testcase", classname="skills", name=r["skill"])
+        if not r["valid"]:
+            ET.SubElement(case, "failure", message=r["message"]).text = r["message"]
+    return ET.tostring(suite, encoding="unicode")
+
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python quick_validate.py <skill_directory>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        usage="python quick_validate.py <skill_directory> | --all <root> [--jobs N] [--no-cache] [--json FILE] [--junit FILE]",
+        description="Validate a skill, or with --all every skill under a root directory.",
+    )
+    parser.add_argument("path")
+    parser.add_argument("--all", action="store_true", help="Validate every skill under path")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help=f"Ignore and do not write {CACHE_FILE}")
+    parser.add_argument("--json", metavar="FILE", help="Write a JSON report ('-' for stdout)")
+    parser.add_argument("--junit", metavar="FILE", help="Write a JUnit XML report")
+    args = parser.parse_args()
+
+    if not args.all:
+        valid, message = validate_skill(args.path)
+        print(message)
+        sys.exit(0 if valid else 1)
 
-    valid, message = validate_skill(sys.argv[1])
-    print(message)
-    sys.exit(0 if valid else 1)
+    results = validate_all(args.path, jobs=args.jobs, cache_path=None if args.no_cache else CACHE_FILE)
+    failed = [r for r in results if not r["valid"]]
+    if args.json:
+        report = json.dumps(
+            {"total": len(results), "failed": len(failed), "cached": sum(r["cached"] for r in results), "results": results},
+            indent=2,
+        )
+        if args.json == "-":
+            print(report)
+        else:
+            Path(args.json).write_text(report)
+    if args.junit:
+        Path(args.junit).write_text(junit_report(results))
+    if args.json != "-":
+        for r in results:
+            print(f"[{'OK' if r['valid'] else 'ERROR'}] {r['skill']}: {r['message']}")
+        print(f"\n{len(results) - len(failed)}/{len(results)} skills valid")
+    sys.exit(1 if failed else 0)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "build_skill_index.py"
+
+
+def _run(root, *args):
+    return subprocess.run([sys.executable, str(SCRIPT), str(root), *args], capture_output=True, text=True)
+
+
+def test_check_ignores_touch_but_not_content_changes(tmp_path):
+    skill = tmp_path / "demo"
+    skill.mkdir()
+    (skill / "SKILL.md").write_text("---\nname: demo\ndescription: Demo skill\n---\n# Demo\n")
+    (skill / "notes.txt").write_text("v1")
+    assert _run(tmp_path).returncode == 0
+    index = (tmp_path / "skills-index.json").read_text()
+    assert "mtime_ns" not in index and "size" not in index
+    assert (tmp_path / ".skills-index.cache.json").exists()
+
+    stat = (skill / "notes.txt").stat()
+    os.utime(skill / "notes.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert _run(tmp_path, "--check").returncode == 0
+
+    (skill / "notes.txt").write_text("v2")
+    result = _run(tmp_path, "--check")
+    assert result.returncode == 1 and "out of date" in result.stdout
@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quick_validate import validate_all  # noqa: E402
+
+
+def _skill(root, name, description="A test skill"):
+    skill = root / name
+    skill.mkdir(exist_ok=True)
+    (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {description}\n---\n# {name}\n")
+
+
+def test_validate_all_caches_results_until_skill_md_changes(tmp_path):
+    _skill(tmp_path, "alpha")
+    _skill(tmp_path, "beta")
+    first = validate_all(str(tmp_path), jobs=1)
+    assert [(r["skill"], r["valid"], r["cached"]) for r in first] == [("alpha", True, False), ("beta", True, False)]
+
+    assert all(r["cached"] for r in validate_all(str(tmp_path), jobs=1))
+
+    (tmp_path / "beta" / "SKILL.md").write_text("---\nname: beta\n---\n")  # description removed
+    results = {r["skill"]: r for r in validate_all(str(tmp_path), jobs=1)}
+    assert results["alpha"]["cached"] and results["alpha"]["valid"]
+    assert not results["beta"]["cached"] and not results["beta"]["valid"]
+    assert "description" in results["beta"]["message"]
+
+    assert not any(r["cached"] for r in validate_all(str(tmp_path), jobs=1, cache_path=None))
@@ -3,19 +3,299 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import hashlib
+import http.client
+import io
+import json
 import os
+import threading
+import time
+import urllib.error
+import urllib.parse
 import urllib.request
 
+MAX_REDIRECTS = 5
+# Wait at most this long for a rate limit to reset before failing
+MAX_RATE_LIMIT_WAIT = 60.0
+# Only API responses are cached; archives have their own cache in the installer
+CACHEABLE_HOSTS = ("api.github.com",)
+# Hosts that count requests against the API quota; codeload and raw content do not
+RATE_LIMITED_HOSTS = ("api.github.com",)
+RETRYABLE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+def _codex_home() -> str:
+    return os.environ.get("CODEX_HOME", os.path.expanduser("~/.codex"))
+
+
+def _token() -> str | None:
+    return os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+
+
+def _http_error(url: str, code: int, reason: str, headers, body: bytes) -> urllib.error.HTTPError:
+    # Callers handle urllib's HTTPError, so keep raising that type
+    return urllib.error.HTTPError(url, code, reason, headers, io.BytesIO(body))
+
+
+def _decode_body(body: bytes, headers) -> bytes:
+    # Every request asks for gzip; neither http.client nor urllib decodes it
+    if (headers.get("Content-Encoding") or "").lower() == "gzip" and body:
+        return gzip.decompress(body)
+    return body
+
+
+class GitHubClient:
+    """
+    Small GitHub HTTP client shared by the skill scripts.
+
+    - Keep-alive: one HTTPS connection per host and thread, reused across requests.
+    - Conditional cache: API responses are stored on disk with their ETag; later requests
+      send If-None-Match, and a 304 (which does not count against the rate limit) returns
+      the stored body.
+    - Rate limits (API host only): when X-RateLimit-Remaining hits 0, or a 403/429 carries
+      Retry-After, further API requests wait for the reset if it is within
+      ``max_rate_limit_wait`` and otherwise fail; archive and raw downloads are unaffected.
+    - ``fetch_many`` fetches several URLs concurrently.
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        cache_dir: str | None = None,
+        timeout: float = 30.0,
+        max_rate_limit_wait: float = MAX_RATE_LIMIT_WAIT,
+    ) -> None:
+        self.user_agent = user_agent
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self._local = threading.local()
+        self._rate_lock = threading.Lock()
+        # host -> time until which requests to it are held back
+        self._blocked_until: dict[str, float] = {}
+        # http.client ignores proxy settings; go through urllib when one is configured
+        self._use_urllib = "https" in urllib.request.getproxies()
+
+    # ---------- connections ----------
+    def _connection(self, host: str) -> http.client.HTTPSConnection:
+        conns = self._local.__dict__.setdefault("conns", {})
+        conn = conns.get(host)
+        if conn is None:
+            conn = conns[host] = http.client.HTTPSConnection(host, timeout=self.timeout)
+        return conn
+
+    def _drop_connection(self, host: str) -> None:
+        conn = self._local.__dict__.get("conns", {}).pop(host, None)
+        if conn is not None:
+            conn.close()
+
+    def _send(self, url: str, headers: dict[str, str]) -> tuple[int, str, bytes, http.client.HTTPMessage]:
+        if self._use_urllib:
+            req = urllib.request.Request(url, headers=headers)
+            try:
+                with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                    status, reason, body, response_headers = resp.status, resp.reason, resp.read(), resp.headers
+            except urllib.error.HTTPError as exc:
+                status, reason, body, response_headers = exc.code, exc.reason, exc.read(), exc.headers
+            return status, reason, _decode_body(body, response_headers), response_headers
+        parsed = urllib.parse.urlsplit(url)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        for attempt in range(2):
+            conn = self._connection(parsed.netloc)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except RETRYABLE_ERRORS:
+                # The server closed an idle keep-alive connection; reconnect once
+                self._drop_connection(parsed.netloc)
+                if attempt:
+                    raise
+                continue
+            if resp.will_close:
+                self._drop_connection(parsed.netloc)
+            return resp.status, resp.reason, _decode_body(body, resp.headers), resp.headers
+        raise AssertionError("unreachable")
+
+    # ---------- conditional cache ----------
+    def _cache_paths(self, url: str, headers: dict[str, str]) -> tuple[str, str] | None:
+        if not self.cache_dir or urllib.parse.urlsplit(url).netloc not in CACHEABLE_HOSTS:
+            return None
+        # Responses differ per token (private repos) and Accept type
+        token = hashlib.sha256((_token() or "").encode()).hexdigest()[:12]
+        key = hashlib.sha256(f"{url}\0{headers.get('Accept', '')}\0{token}".encode()).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def _cached(self, paths: tuple[str, str]) -> tuple[dict, bytes] | None:
+        try:
+            with open(paths[0], encoding="utf-8") as file_handle:
+                meta = json.load(file_handle)
+            with open(paths[1], "rb") as file_handle:
+                return meta, file_handle.read()
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, paths: tuple[str, str], meta: dict, body: bytes) -> None:
+        os.makedirs(os.path.dirname(paths[0]), exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(paths[1] + suffix, "wb") as file_handle:
+            file_handle.write(body)
+        os.replace(paths[1] + suffix, paths[1])
+        with open(paths[0] + suffix, "w", encoding="utf-8") as file_handle:
+            json.dump(meta, file_handle)
+        os.replace(paths[0] + suffix, paths[0])
+
+    # ---------- rate limits ----------
+    def _wait_for_rate_limit(self, url: str) -> None:
+        host = urllib.parse.urlsplit(url).netloc
+        with self._rate_lock:
+            delay = self._blocked_until.get(host, 0.0) - time.time()
+        if delay > self.max_rate_limit_wait:
+            raise _http_error(url, 403, f"GitHub rate limit exceeded; resets in {int(delay)}s", None, b"")
+        if delay > 0:
+            time.sleep(delay)
+
+    def _note_rate_limit(self, url: str, status: int, headers: http.client.HTTPMessage) -> float | None:
+        """Record the rate-limit state; return how long to wait before retrying, if at all."""
+        host = urllib.parse.urlsplit(url).netloc
+        if host not in RATE_LIMITED_HOSTS:
+            return None
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        retry_after = headers.get("Retry-After")
+        wait = None
+        if retry_after and retry_after.isdigit() and status in (403, 429):
+            wait = float(retry_after)
+        elif remaining == "0" and reset and reset.isdigit():
+            wait = max(0.0, int(reset) - time.time() + 1)
+        if wait is None:
+            return None
+        with self._rate_lock:
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0.0), time.time() + wait)
+        return wait if status in (403, 429) else None
+
+    # ---------- requests ----------
+    def request(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> tuple[int, bytes, http.client.HTTPMessage]:
+        """
+        GET ``url`` and return (status, body, headers); HTTP errors raise urllib's HTTPError.
+        A 304 is returned as is when the caller sent its own If-None-Match; otherwise the
+        client revalidates its cached copy and returns that body with status 200.
+        """
+        request_headers = {
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip",
+            **(headers or {}),
+        }
+        token = _token()
+        caller_conditional = "If-None-Match" in request_headers
+        cache_paths = None if caller_conditional else self._cache_paths(url, request_headers)
+        cached = self._cached(cache_paths) if cache_paths else None
+        if cached and cached[0].get("etag"):
+            request_headers["If-None-Match"] = cached[0]["etag"]
+
+        for _ in range(MAX_REDIRECTS + 1):
+            host = urllib.parse.urlsplit(url).netloc
+            if token and host.endswith(("github.com", "githubusercontent.com")):
+                request_headers["Authorization"] = f"token {token}"
+            else:
+                request_headers.pop("Authorization", None)
+            self._wait_for_rate_limit(url)
+            status, reason, body, response_headers = self._send(url, request_headers)
+            wait = self._note_rate_limit(url, status, response_headers)
+            if wait is not None:
+                if wait > self.max_rate_limit_wait:
+                    raise _http_error(
+                        url, status, f"GitHub rate limit exceeded; retry in {int(wait)}s", response_headers, body
+                    )
+                continue  # _wait_for_rate_limit sleeps (or fails) before the retry
+            if status in (301, 302, 303, 307, 308) and response_headers.get("Location"):
+                url = urllib.parse.urljoin(url, response_headers["Location"])
+                continue
+            if status == 304 and cached is not None:
+                return 200, cached[1], response_headers
+            if status == 304 and caller_conditional:
+                return status, b"", response_headers
+            if status >= 400 or status == 304:
+                raise _http_error(url, status, reason, response_headers, body)
+            if cache_paths and response_headers.get("ETag"):
+                self._store(cache_paths, {"url": url, "etag": response_headers["ETag"]}, body)
+            return status, body, response_headers
+        raise _http_error(url, 310, "Too many redirects", response_headers, body)
+
+    def get(self, url: str, headers: dict[str, str] | None = None) -> bytes:
+        return self.request(url, headers)[1]
+
+    def get_json(self, url: str, headers: dict[str, str] | None = None):
+        return json.loads(self.get(url, headers).decode("utf-8"))
+
+    def fetch_many(
+        self,
+        urls: list[str],
+        headers: dict[str, str] | None = None,
+        max_workers: int = 8,
+        missing_ok: bool = False,
+    ) -> list[bytes | None]:
+        """
+        Bodies of ``urls`` in order, fetched concurrently; the first error is raised. With
+        ``missing_ok`` a 404 gives None for that URL instead.
+        """
+        if not urls:
+            return []
+
+        def fetch(url: str) -> bytes | None:
+            try:
+                return self.get(url, headers)
+            except urllib.error.HTTPError as exc:
+                if missing_ok and exc.code == 404:
+                    return None
+                raise
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+            return list(pool.map(fetch, urls))
+
+
+_clients: dict[str, GitHubClient] = {}
+_clients_lock = threading.Lock()
+
+
+def github_client(user_agent: str) -> GitHubClient:
+    """Shared client per user agent, caching under $CODEX_HOME/cache/github."""
+    with _clients_lock:
+        client = _clients.get(user_agent)
+        if client is None:
+            cache_dir = os.path.join(_codex_home(), "cache", "github")
+            client = _clients[user_agent] = GitHubClient(user_agent, cache_dir)
+        return client
+
 
 def github_request(url: str, user_agent: str) -> bytes:
-    headers = {"User-Agent": user_agent}
-    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
-    if token:
-        headers["Authorization"] = f"token {token}"
-    req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req) as resp:
-        return resp.read()
+    return github_request_full(url, user_agent)[1]
+
+
+def github_request_full(
+    url: str, user_agent: str, headers: dict[str, str] | None = None
+) -> tuple[int, bytes, http.client.HTTPMessage]:
+    """(status, body, response headers); a 304 Not Modified is returned, not raised."""
+    return github_client(user_agent).request(url, headers)
 
 
 def github_api_contents_url(repo: str, path: str, ref: str) -> str:
     return f"https://api.github.com/repos/{repo}/contents/{path}?ref={ref}"
+
+
+def github_api_tree_url(repo: str, ref: str, recursive: bool = True) -> str:
+    suffix = "?recursive=1" if recursive else ""
+    return f"https://api.github.com/repos/{repo}/git/trees/{urllib.parse.quote(ref, safe='')}{suffix}"
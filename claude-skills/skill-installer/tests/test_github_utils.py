@@ -0,0 +1,112 @@
+import gzip
+import http.client
+import http.server
+import os
+import sys
+import threading
+import time
+import urllib.error
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from github_utils import GitHubClient  # noqa: E402
+
+API = "https://api.github.com/repos/o/r/commits/main"
+ARCHIVE = "https://codeload.github.com/o/r/zip/main"
+
+
+def _headers(**values):
+    message = http.client.HTTPMessage()
+    for name, value in values.items():
+        message[name.replace("_", "-")] = value
+    return message
+
+
+class StubbedClient(GitHubClient):
+    """Answers from ``responses`` ({url: [(status, body, headers), ...]}) instead of the network."""
+
+    def __init__(self, tmp_path, responses):
+        super().__init__("test", cache_dir=str(tmp_path / "cache"))
+        self._use_urllib = False
+        self.responses = responses
+        self.sent = []
+
+    def _send(self, url, headers):
+        self.sent.append((url, dict(headers)))
+        status, body, response_headers = self.responses[url].pop(0)
+        return status, "", body, response_headers
+
+
+def test_api_responses_are_revalidated_with_their_etag(tmp_path):
+    client = StubbedClient(
+        tmp_path,
+        {API: [(200, b'{"sha": "1"}', _headers(ETag='"v1"')), (304, b"", _headers(ETag='"v1"'))]},
+    )
+    assert client.get_json(API) == {"sha": "1"}
+    assert client.request(API)[:2] == (200, b'{"sha": "1"}')
+    assert "If-None-Match" not in client.sent[0][1]
+    assert client.sent[1][1]["If-None-Match"] == '"v1"'
+
+
+def test_caller_conditional_requests_get_the_304(tmp_path):
+    client = StubbedClient(tmp_path, {API: [(304, b"", _headers())]})
+    assert client.request(API, {"If-None-Match": '"v1"'})[0] == 304
+
+
+def test_an_exhausted_api_quota_does_not_block_archive_downloads(tmp_path):
+    reset = str(int(time.time()) + 1800)
+    client = StubbedClient(
+        tmp_path,
+        {
+            API: [(200, b"{}", _headers(X_RateLimit_Remaining="0", X_RateLimit_Reset=reset))],
+            ARCHIVE: [(200, b"zip", _headers())],
+        },
+    )
+    client.get(API)
+    with pytest.raises(urllib.error.HTTPError, match="rate limit"):
+        client.get(API)
+    assert client.get(ARCHIVE) == b"zip"
+    assert [url for url, _ in client.sent] == [API, ARCHIVE]
+
+
+def test_short_retry_after_is_waited_out(tmp_path):
+    client = StubbedClient(
+        tmp_path, {API: [(429, b"", _headers(Retry_After="0")), (200, b"ok", _headers())]}
+    )
+    assert client.get(API) == b"ok"
+    assert len(client.sent) == 2
+
+
+@pytest.mark.parametrize("use_urllib", [True, False])
+def test_gzip_bodies_are_decoded(use_urllib):
+    body = b'{"name": "skill"}'
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            payload = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = GitHubClient("test")
+        client._use_urllib = use_urllib
+        url = f"http://127.0.0.1:{server.server_port}/skill.json"
+        if not use_urllib:
+            # Plain HTTP stands in for the HTTPS connection the client normally opens
+            client._connection = lambda host: client._local.__dict__.setdefault(
+                "conn", http.client.HTTPConnection(host, timeout=5)
+            )
+        assert client.get_json(url) == {"name": "skill"}
+    finally:
+        server.shutdown()
+        server.server_close()
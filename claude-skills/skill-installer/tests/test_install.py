@@ -0,0 +1,154 @@
+import importlib.util
+import io
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+sys.path.insert(0, SCRIPTS)
+_spec = importlib.util.spec_from_file_location("install_skill", os.path.join(SCRIPTS, "install-skill-from-github.py"))
+install = importlib.util.module_from_spec(_spec)
+sys.modules["install_skill"] = install  # dataclasses look the module up while it loads
+_spec.loader.exec_module(install)
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+
+
+def _archive(skills):
+    """GitHub-style repo zip: one top-level directory, the commit SHA as the zip comment."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zip_file:
+        for name, deps in skills.items():
+            frontmatter = f"name: {name}\ndescription: test\ndepends-on: [{', '.join(deps)}]"
+            zip_file.writestr(f"repo-{SHA}/skills/{name}/SKILL.md", f"---\n{frontmatter}\n---\n")
+        zip_file.comment = SHA.encode()
+    return buf.getvalue()
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """Serve ``skills`` ({name: [dependency, ...]}) as the o/r repo; returns the install destination."""
+    monkeypatch.setenv("CODEX_HOME", str(tmp_path / "codex"))
+    monkeypatch.setattr(install, "github_request_full", lambda url, ua, headers=None: (200, SHA.encode(), {}))
+    copied = []
+    copy_skill = install._copy_skill
+
+    def record_copy(src, dest_dir):
+        copied.append(os.path.basename(dest_dir))
+        copy_skill(src, dest_dir)
+
+    monkeypatch.setattr(install, "_copy_skill", record_copy)
+
+    def serve(skills):
+        monkeypatch.setattr(install, "_request", lambda url: _archive(skills))
+        return str(tmp_path / "skills"), copied
+
+    return serve
+
+
+def _lock(dest):
+    with open(os.path.join(dest, install.LOCK_FILE), encoding="utf-8") as file_handle:
+        return json.load(file_handle)["skills"]
+
+
+def test_dependencies_install_first_and_are_locked(repo):
+    dest, copied = repo({"app": ["lib"], "lib": ["base"], "base": []})
+    assert install.main(["--repo", "o/r", "--path", "skills/app", "--dest", dest, "--no-cache"]) == 0
+    assert copied == ["base", "lib", "app"]
+    lock = _lock(dest)
+    assert lock["app"]["depends-on"] == ["lib"]
+    assert {entry["commit"] for entry in lock.values()} == {SHA}
+
+
+def test_dependency_cycle_is_an_error(repo, capsys):
+    dest, copied = repo({"a": ["b"], "b": ["a"]})
+    assert install.main(["--repo", "o/r", "--path", "skills/a", "--dest", dest, "--no-cache"]) == 1
+    assert "Dependency cycle: " in capsys.readouterr().err
+    assert copied == []
+
+
+def test_skills_installed_before_a_failure_stay_locked(repo, monkeypatch):
+    dest, copied = repo({"app": ["lib"], "lib": []})
+    copy_skill = install._copy_skill
+
+    def fail_on_app(src, dest_dir):
+        if dest_dir.endswith("app"):
+            raise install.InstallError("disk full")
+        copy_skill(src, dest_dir)
+
+    monkeypatch.setattr(install, "_copy_skill", fail_on_app)
+    assert install.main(["--repo", "o/r", "--path", "skills/app", "--dest", dest, "--no-cache"]) == 1
+    assert os.path.isdir(os.path.join(dest, "lib"))
+    assert set(_lock(dest)) == {"lib"}
+
+
+def test_existing_dependency_is_pinned_without_overwriting_its_entry(repo):
+    dest, copied = repo({"app": ["lib", "util"], "lib": [], "util": []})
+    for name in ("lib", "util"):
+        os.makedirs(os.path.join(dest, name))
+    install._write_lock(os.path.join(dest, install.LOCK_FILE), {"util": {"repo": "other/repo"}})
+    assert install.main(["--repo", "o/r", "--path", "skills/app", "--dest", dest, "--no-cache"]) == 0
+    assert copied == ["app"]
+    lock = _lock(dest)
+    assert lock["lib"]["repo"] == "o/r" and lock["lib"]["sha256"] == install._tree_hash(os.path.join(dest, "lib"))
+    assert lock["util"] == {"repo": "other/repo"}
+
+
+def test_selective_extraction_rejects_paths_outside_the_destination(tmp_path):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zip_file:
+        zip_file.writestr("repo/skills/a/SKILL.md", "---\nname: a\n---\n")
+        zip_file.writestr("repo/skills/a/../../../escaped.txt", "x")
+    dest = tmp_path / "a"
+    dest.mkdir()
+    with zipfile.ZipFile(buf) as zip_file, pytest.raises(install.InstallError):
+        install._safe_extract_zip(zip_file, "repo/skills/a", str(dest))
+    assert not (tmp_path / "escaped.txt").exists()
+
+
+def test_cached_archive_is_reused_by_a_second_install(repo, monkeypatch, tmp_path):
+    dest, _ = repo({"a": []})
+    downloads = []
+    fetch = install._request
+    monkeypatch.setattr(install, "_request", lambda url: downloads.append(url) or fetch(url))
+    assert install.main(["--repo", "o/r", "--path", "skills/a", "--dest", dest]) == 0
+    assert install.main(["--repo", "o/r", "--path", "skills/a", "--dest", str(tmp_path / "other")]) == 0
+    assert downloads == [f"https://codeload.github.com/o/r/zip/{SHA}"]
+    assert os.path.isfile(os.path.join(install._cache_root(), "archives", "o", "r", f"{SHA}.zip"))
+
+
+def test_commit_lookup_revalidates_with_the_stored_etag(tmp_path, monkeypatch):
+    monkeypatch.setenv("CODEX_HOME", str(tmp_path))
+    sent = []
+
+    def lookup(url, ua, headers=None):
+        sent.append(headers.get("If-None-Match"))
+        if headers.get("If-None-Match") == '"e1"':
+            return 304, b"", {}
+        return 200, SHA.encode(), {"ETag": '"e1"'}
+
+    monkeypatch.setattr(install, "github_request_full", lookup)
+    assert install._resolve_commit("o", "r", "main") == SHA
+    assert install._resolve_commit("o", "r", "main") == SHA
+    assert sent == [None, '"e1"']
+
+
+def test_eviction_skips_archives_in_use(tmp_path, monkeypatch):
+    monkeypatch.setenv("CODEX_HOME", str(tmp_path))
+    archives = os.path.join(install._cache_root(), "archives", "o", "r")
+    os.makedirs(archives)
+    paths = []
+    for idx, name in enumerate(("old-in-use", "older", "newest")):
+        path = os.path.join(archives, f"{name}.zip")
+        with open(path, "wb") as file_handle:
+            file_handle.write(b"x" * 100)
+        os.utime(path, (idx, idx))
+        paths.append(path)
+    monkeypatch.setattr(install, "_archives_in_use", {paths[0]})
+    with install._cache_lock:
+        install._evict_archives(max_bytes=250)
+    # The in-use archive is the least recently used, but only the next one goes
+    assert [os.path.exists(p) for p in paths] == [True, False, True]
@@ -0,0 +1,64 @@
+import http.client
+import importlib.util
+import json
+import os
+import sys
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+sys.path.insert(0, SCRIPTS)
+_spec = importlib.util.spec_from_file_location("list_curated", os.path.join(SCRIPTS, "list-curated-skills.py"))
+curated = importlib.util.module_from_spec(_spec)
+sys.modules["list_curated"] = curated
+_spec.loader.exec_module(curated)
+
+from github_utils import GitHubClient  # noqa: E402
+
+RAW = "https://raw.githubusercontent.com/o/r/main/skills/.curated"
+
+
+class StubbedClient(GitHubClient):
+    def __init__(self, responses):
+        super().__init__("test")
+        self._use_urllib = False
+        self.responses = responses
+
+    def _send(self, url, headers):
+        status, body = self.responses.get(url, (404, b"Not Found"))
+        return status, "", body, http.client.HTTPMessage()
+
+
+def test_parse_frontmatter_block_scalars():
+    text = (
+        "---\n"
+        "name: pdf\n"
+        "description: >\n"
+        "  Read and write\n"
+        "  PDF files.\n"
+        "notes: |\n"
+        "  line one\n"
+        "  line two\n"
+        'version: "1.2"\n'
+        "---\n# body\n"
+    )
+    assert curated._parse_frontmatter(text) == {
+        "name": "pdf",
+        "description": "Read and write PDF files.",
+        "notes": "line one\nline two",
+        "version": "1.2",
+    }
+
+
+def test_truncated_tree_lists_skills_and_skips_dirs_without_skill_md(tmp_path, monkeypatch):
+    monkeypatch.setenv("CODEX_HOME", str(tmp_path))
+    client = StubbedClient(
+        {
+            "https://api.github.com/repos/o/r/git/trees/main?recursive=1": (200, b'{"tree": [], "truncated": true}'),
+            f"{RAW}/pdf/SKILL.md": (200, b"---\nname: pdf\ndescription: PDFs\nversion: 2\n---\n"),
+        }
+    )
+    contents = [{"name": "pdf", "type": "dir"}, {"name": "drafts", "type": "dir"}, {"name": "README.md", "type": "file"}]
+    monkeypatch.setattr(curated, "_client", lambda: client)
+    monkeypatch.setattr(curated, "_request", lambda url: json.dumps(contents).encode())
+    assert curated._list_curated_details("o/r", "skills/.curated", "main") == [
+        {"name": "pdf", "description": "PDFs", "version": "2"}
+    ]
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for WindowsShareClient.
+
+Measures small-file ops/sec and large-file MB/s for reads and writes, for one or more
+chunk sizes, with or without session reuse. Runs against a real share (settings from the
+WSK_* environment variables, e.g. a local Samba container) or a local folder / in-memory
+stand-in backend, so it also runs on Linux with no share.
+
+Usage (from the skill root):
+    python -m benchmarks.bench_transfers --backend local
+    python -m benchmarks.bench_transfers --backend memory
+    python -m benchmarks.bench_transfers --backend smbprotocol --chunk-sizes 64K,1M,4M
+    python -m benchmarks.bench_transfers --backend smbprotocol --no-reuse --json
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, Iterator, List
+
+from skill import SkillConfig, WindowsShareClient
+
+_UNITS = {"K": 1024, "M": 1024 * 1024, "G": 1024 * 1024 * 1024}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in _UNITS:
+        return int(float(text[:-1]) * _UNITS[text[-1]])
+    return int(text)
+
+
+def _chunks(total: int, chunk_size: int) -> Iterator[bytes]:
+    block = os.urandom(min(chunk_size, total)) if total else b""
+    sent = 0
+    while sent < total:
+        n = min(chunk_size, total - sent)
+        yield block[:n]
+        sent += n
+
+
+def bench_small_files(client: WindowsShareClient, folder: str, count: int, size: int, reuse: bool) -> Dict[str, float]:
+    payload = os.urandom(size)
+    paths = [f"{folder}/small/{i:05d}.bin" for i in range(count)]
+
+    start = time.perf_counter()
+    for path in paths:
+        client.write_bytes(path, payload)
+        if not reuse:
+            client.close()
+    write_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for path in paths:
+        client.read_bytes(path)
+        if not reuse:
+            client.close()
+    read_s = time.perf_counter() - start
+
+    return {
+        "files": count,
+        "file_bytes": size,
+        "write_ops_per_s": round(count / write_s, 2),
+        "read_ops_per_s": round(count / read_s, 2),
+    }
+
+
+def bench_large_file(client: WindowsShareClient, folder: str, size: int, chunk_size: int) -> Dict[str, float]:
+    path = f"{folder}/large/{chunk_size}.bin"
+    mb = size / (1024 * 1024)
+
+    start = time.perf_counter()
+    client.write_stream(path, _chunks(size, chunk_size))
+    write_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read = sum(len(c) for c in client.iter_bytes(path, chunk_size=chunk_size))
+    read_s = time.perf_counter() - start
+    if read != size:
+        raise RuntimeError(f"Read back {read} bytes, expected {size}")
+
+    return {
+        "chunk_size": chunk_size,
+        "file_bytes": size,
+        "write_mb_per_s": round(mb / write_s, 2),
+        "read_mb_per_s": round(mb / read_s, 2),
+    }
+
+
+def _make_client(args: argparse.Namespace, local_root: str) -> WindowsShareClient:
+    if args.backend in ("local", "memory"):
+        cfg = SkillConfig(domain=None, username="", password="", server="local", share="bench", local_root=local_root)
+    else:
+        cfg = SkillConfig.from_env()
+    cfg = dataclasses.replace(cfg, backend=args.backend, trace=args.trace)
+    return WindowsShareClient(cfg)
+
+
+def _cleanup(client: WindowsShareClient, folder: str) -> None:
+    for sub in ("small", "large"):
+        rel = f"{folder}/{sub}"
+        if not client.exists(rel):
+            continue
+        for name in client.list_dir(rel):
+            client.remove(f"{rel}/{name}")
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    temp_root = args.backend == "local" and not args.root
+    local_root = tempfile.mkdtemp(prefix="wsk-bench-") if temp_root else (args.root or "")
+    client = _make_client(args, local_root)
+    folder = f"_bench/{uuid.uuid4().hex[:8]}"
+    try:
+        small = bench_small_files(client, folder, args.small_count, args.small_size, reuse=not args.no_reuse)
+        large: List[Dict[str, float]] = [
+            bench_large_file(client, folder, args.large_size, chunk_size) for chunk_size in args.chunk_sizes
+        ]
+        phases = client.stats.snapshot()
+        _cleanup(client, folder)
+    finally:
+        client.close()
+        if temp_root:
+            shutil.rmtree(local_root, ignore_errors=True)
+    return {
+        "backend": args.backend,
+        "session_reuse": not args.no_reuse,
+        "small_files": small,
+        "large_file": large,
+        "phases": phases,
+    }
+
+
+def _print_report(report: Dict[str, object]) -> None:
+    small = report["small_files"]
+    print(f"Backend: {report['backend']}  session reuse: {report['session_reuse']}")
+    print(
+        f"Small files ({small['files']} x {small['file_bytes']} B): "
+        f"write {small['write_ops_per_s']} ops/s, read {small['read_ops_per_s']} ops/s"
+    )
+    for row in report["large_file"]:
+        print(
+            f"Large file ({row['file_bytes'] // (1024 * 1024)} MiB, chunk {row['chunk_size']} B): "
+            f"write {row['write_mb_per_s']} MB/s, read {row['read_mb_per_s']} MB/s"
+        )
+    print("\nPer-phase totals:")
+    for name, op in report["phases"].items():
+        print(f"  {name:<12} count={op['count']:<6} avg={op['avg_ms']:.3f}ms max={op['max_ms']:.3f}ms bytes={op['bytes']}")
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark WindowsShareClient transfers.")
+    parser.add_argument("--backend", choices=["local", "memory", "smbprotocol", "win32"], default="local")
+    parser.add_argument("--root", help="Folder used by the local backend (defaults to a temp folder)")
+    parser.add_argument("--small-count", type=int, default=200)
+    parser.add_argument("--small-size", type=parse_size, default=parse_size("4K"))
+    parser.add_argument("--large-size", type=parse_size, default=parse_size("64M"))
+    parser.add_argument(
+        "--chunk-sizes",
+        type=lambda v: [parse_size(x) for x in v.split(",") if x.strip()],
+        default=[parse_size("64K"), parse_size("1M"), parse_size("4M")],
+        help="Comma-separated chunk sizes for the large-file runs, e.g. 64K,1M,4M",
+    )
+    parser.add_argument("--no-reuse", action="store_true", help="Drop the session after every small-file op")
+    parser.add_argument("--trace", action="store_true", help="Log every SMB operation (set logging to DEBUG)")
+    parser.add_argument("--json", action="store_true", help="Print a machine-readable report")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = _parse_args(argv)
+    if args.trace:
+        import logging
+
+        logging.basicConfig(level=logging.DEBUG, format="%(asctime)s %(name)s %(message)s")
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
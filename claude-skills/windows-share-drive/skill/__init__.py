@@ -1,7 +1,29 @@
 from .smb_client import WindowsShareClient
+from .async_client import AsyncWindowsShareClient
+from .backends import (
+    BackendWrapper,
+    FileStat,
+    LocalBackend,
+    MemoryBackend,
+    ShareBackend,
+    SmbProtocolBackend,
+    Win32Backend,
+    create_backend,
+)
 from .config import SkillConfig
+from .metrics import TransferStats
 
 __all__ = [
     "WindowsShareClient",
+    "AsyncWindowsShareClient",
     "SkillConfig",
+    "TransferStats",
+    "ShareBackend",
+    "BackendWrapper",
+    "FileStat",
+    "Win32Backend",
+    "SmbProtocolBackend",
+    "LocalBackend",
+    "MemoryBackend",
+    "create_backend",
 ]
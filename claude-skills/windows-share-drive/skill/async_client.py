@@ -0,0 +1,173 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, List, Optional, TypeVar, Union
+
+from .config import SkillConfig
+from .smb_client import DEFAULT_CHUNK_SIZE, WindowsShareClient, _temp_sibling
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class AsyncWindowsShareClient:
+    """
+    asyncio front-end for WindowsShareClient, for use from FastAPI/Reflex handlers.
+
+    Every blocking SMB call runs on a dedicated, bounded thread pool so the event loop
+    is never blocked. All calls share one WindowsShareClient, so the share session is
+    established once and reused. Each call accepts an optional ``timeout`` (seconds);
+    cancelling the awaiting task releases the caller immediately and stops streaming
+    transfers at the next chunk boundary.
+    """
+
+    def __init__(
+        self,
+        cfg: SkillConfig,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: Optional[float] = None,
+        client: Optional[WindowsShareClient] = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self.cfg = cfg
+        self.timeout = timeout
+        self._client = client or WindowsShareClient(cfg)
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wsk-smb")
+        # Created lazily so it binds to the running loop
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_env(cls, max_workers: int = DEFAULT_MAX_WORKERS, timeout: Optional[float] = None) -> "AsyncWindowsShareClient":
+        return cls(SkillConfig.from_env(), max_workers=max_workers, timeout=timeout)
+
+    @property
+    def sync_client(self) -> WindowsShareClient:
+        return self._client
+
+    async def _run(self, fn: Callable[..., T], *args, timeout: Optional[float] = None) -> T:
+        # Waiting for a slot (rather than queueing inside the executor) keeps
+        # cancelled or timed-out calls from ever reaching a worker thread.
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_workers)
+        timeout = self.timeout if timeout is None else timeout
+
+        async def call() -> T:
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+        if timeout is None:
+            return await call()
+        return await asyncio.wait_for(call(), timeout)
+
+    # Public API
+    async def write_text(self, relative_path: str, text: str, timeout: Optional[float] = None) -> None:
+        await self._run(self._client.write_text, relative_path, text, timeout=timeout)
+
+    async def read_text(self, relative_path: str, timeout: Optional[float] = None) -> str:
+        return await self._run(self._client.read_text, relative_path, timeout=timeout)
+
+    async def write_bytes(
+        self,
+        relative_path: str,
+        data: bytes,
+        atomic: Optional[bool] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        await self._run(self._client.write_bytes, relative_path, data, atomic, timeout=timeout)
+
+    async def read_bytes(self, relative_path: str, timeout: Optional[float] = None) -> bytes:
+        return await self._run(self._client.read_bytes, relative_path, timeout=timeout)
+
+    async def list_dir(self, relative_dir: str = "", timeout: Optional[float] = None) -> List[str]:
+        return await self._run(self._client.list_dir, relative_dir, timeout=timeout)
+
+    async def exists(self, relative_path: str, timeout: Optional[float] = None) -> bool:
+        return await self._run(self._client.exists, relative_path, timeout=timeout)
+
+    async def makedirs(self, relative_dir: str, timeout: Optional[float] = None) -> None:
+        await self._run(self._client.makedirs, relative_dir, timeout=timeout)
+
+    async def copy(self, src_relative_path: str, dst_relative_path: str, timeout: Optional[float] = None) -> None:
+        await self._run(self._client.copy, src_relative_path, dst_relative_path, timeout=timeout)
+
+    async def move(self, src_relative_path: str, dst_relative_path: str, timeout: Optional[float] = None) -> None:
+        await self._run(self._client.move, src_relative_path, dst_relative_path, timeout=timeout)
+
+    async def upload_file(self, local_path: str, relative_path: str, timeout: Optional[float] = None) -> None:
+        await self._run(self._client.upload_file, local_path, relative_path, timeout=timeout)
+
+    async def download_file(self, relative_path: str, local_path: str, timeout: Optional[float] = None) -> None:
+        await self._run(self._client.download_file, relative_path, local_path, timeout=timeout)
+
+    # Streaming API
+    async def iter_bytes(
+        self,
+        relative_path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield the file content in chunks; ``timeout`` applies to each chunk read."""
+        fd = await self._run(self._client.open, relative_path, "rb", timeout=timeout)
+        try:
+            while True:
+                chunk = await self._run(fd.read, chunk_size, timeout=timeout)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await asyncio.shield(self._run(fd.close))
+
+    async def write_stream(
+        self,
+        relative_path: str,
+        chunks: Union[AsyncIterable[bytes], Iterable[bytes]],
+        atomic: Optional[bool] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """Write sync or async byte chunks to a file; ``timeout`` applies to each chunk write."""
+        if atomic is None:
+            atomic = self._client.cfg.atomic_writes
+        target = _temp_sibling(relative_path) if atomic else relative_path
+        written = 0
+        try:
+            fd = await self._run(self._client.open, target, "wb", timeout=timeout)
+            try:
+                if hasattr(chunks, "__aiter__"):
+                    async for chunk in chunks:  # type: ignore[union-attr]
+                        await self._run(fd.write, chunk, timeout=timeout)
+                        written += len(chunk)
+                else:
+                    for chunk in chunks:  # type: ignore[union-attr]
+                        await self._run(fd.write, chunk, timeout=timeout)
+                        written += len(chunk)
+            finally:
+                await asyncio.shield(self._run(fd.close))
+            if atomic:
+                await self._run(self._client.replace, target, relative_path, timeout=timeout)
+        except BaseException:
+            if atomic:
+                try:
+                    await asyncio.shield(self._run(self._client.remove, target))
+                except Exception:
+                    pass
+            raise
+        return written
+
+    # Lifecycle
+    async def aclose(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def close(self) -> None:
+        # Drain in-flight calls first so none of them races the share session teardown
+        self._executor.shutdown(wait=True)
+        self._client.close()
+
+    async def __aenter__(self) -> "AsyncWindowsShareClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
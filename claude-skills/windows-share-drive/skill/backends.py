@@ -0,0 +1,794 @@
+"""
+Storage backends for WindowsShareClient.
+
+A backend implements the primitive operations on one share (open/read/write/stream/list/stat/
+makedirs/rename/remove). Paths are relative to the share root plus ``cfg.base_path`` and use
+``/`` separators. Cross-cutting behaviour (folder memo, instrumentation, ...) is added once by
+wrapping a backend in a ``BackendWrapper`` subclass rather than in every implementation.
+"""
+
+import errno
+import io
+import logging
+import os
+import pathlib
+import shutil
+import stat as stat_mod
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TypeVar
+
+from .config import SkillConfig
+from .metrics import TransferStats
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def _norm_rel(path: str) -> str:
+    p = pathlib.PurePosixPath(str(path).replace("\\", "/"))
+    rel = str(p).lstrip("/")
+    return "" if rel == "." else rel
+
+
+def _join_base(base: str, rel: str) -> str:
+    rel = _norm_rel(rel)
+    base = _norm_rel(base)
+    if base and rel:
+        return f"{base}/{rel}"
+    return base or rel
+
+
+def _parent(rel: str) -> str:
+    return _norm_rel(str(pathlib.PurePosixPath(_norm_rel(rel)).parent))
+
+
+@dataclass(frozen=True)
+class FileStat:
+    size: int
+    mtime: float
+    is_dir: bool
+
+
+class ShareBackend(ABC):
+    """
+    Primitive operations on one share.
+
+    ``connect()`` must be called before any other operation; WindowsShareClient does this
+    once per client. Opening a file for writing does not create missing parent folders.
+    """
+
+    name = "abstract"
+
+    def connect(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def open(self, relative_path: str, mode: str = "rb") -> IO[bytes]:
+        ...
+
+    @abstractmethod
+    def list_dir(self, relative_dir: str = "") -> List[str]:
+        ...
+
+    @abstractmethod
+    def stat(self, relative_path: str) -> FileStat:
+        """Raise FileNotFoundError (or another OSError) when the path does not exist."""
+
+    @abstractmethod
+    def makedirs(self, relative_dir: str) -> None:
+        ...
+
+    @abstractmethod
+    def rename(self, src_relative_path: str, dst_relative_path: str) -> None:
+        """Rename a file, overwriting the destination if it exists."""
+
+    @abstractmethod
+    def remove(self, relative_path: str) -> None:
+        ...
+
+    def exists(self, relative_path: str) -> bool:
+        try:
+            self.stat(relative_path)
+            return True
+        except OSError:
+            return False
+
+    def read_bytes(self, relative_path: str) -> bytes:
+        with self.open(relative_path, "rb") as fd:
+            return fd.read()
+
+    def write_bytes(self, relative_path: str, data: bytes) -> None:
+        with self.open(relative_path, "wb") as fd:
+            fd.write(data)
+
+    def iter_bytes(self, relative_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        with self.open(relative_path, "rb") as fd:
+            while True:
+                chunk = fd.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def write_stream(self, relative_path: str, chunks: Iterable[bytes]) -> int:
+        written = 0
+        with self.open(relative_path, "wb") as fd:
+            for chunk in chunks:
+                fd.write(chunk)
+                written += len(chunk)
+        return written
+
+    def copy(self, src_relative_path: str, dst_relative_path: str) -> None:
+        """
+        Copy a file within the share, overwriting the destination.
+
+        The default streams the bytes through this host; backends override it with a
+        server-side copy where the protocol allows one.
+        """
+        self.write_stream(dst_relative_path, self.iter_bytes(src_relative_path))
+
+    def upload_file(self, local_path: str, relative_path: str) -> None:
+        """Copy a local file onto the share."""
+        with open(local_path, "rb") as src:
+            self.write_stream(relative_path, iter(lambda: src.read(DEFAULT_CHUNK_SIZE), b""))
+
+    def download_file(self, relative_path: str, local_path: str) -> None:
+        """Copy a file from the share to the local filesystem."""
+        with open(local_path, "wb") as dst:
+            for chunk in self.iter_bytes(relative_path):
+                dst.write(chunk)
+
+
+# -----------------------
+# Windows backend (pywin32)
+# -----------------------
+class Win32Backend(ShareBackend):
+    """pywin32 + native file I/O after establishing a UNC connection."""
+
+    name = "win32"
+
+    def __init__(self, cfg: SkillConfig):
+        self.cfg = cfg
+        # Only a connection this backend added is cancelled on close; others may share it
+        self._added = False
+
+    def _unc(self, rel: str = "") -> str:
+        rel = _norm_rel(rel)
+        path = f"\\\\{self.cfg.server}\\{self.cfg.share}"
+        if self.cfg.base_path:
+            path += "\\" + self.cfg.base_path.replace("/", "\\")
+        if rel:
+            path += "\\" + rel.replace("/", "\\")
+        return path
+
+    def connect(self) -> None:
+        import win32wnet
+        import win32netcon
+        unc_root = self._unc()
+        user = f"{self.cfg.domain}\\{self.cfg.username}" if self.cfg.domain else self.cfg.username
+        try:
+            win32wnet.WNetAddConnection2(
+                win32netcon.RESOURCETYPE_DISK,
+                None,
+                unc_root,
+                None,
+                user,
+                self.cfg.password,
+                0,
+            )
+            self._added = True
+        except Exception as e:
+            # The logon session already holds a connection to this server (another client,
+            # or the user's own mapping): use it rather than tearing it down
+            if getattr(e, "winerror", None) in _WIN_ALREADY_CONNECTED and os.path.isdir(unc_root):
+                return
+            raise RuntimeError(f"Failed to connect to {unc_root} as {user}: {e}")
+
+    def close(self) -> None:
+        import win32wnet
+        if not self._added:
+            return
+        self._added = False
+        try:
+            # Not forced: files still open through the connection keep working
+            win32wnet.WNetCancelConnection2(self._unc(), 0, False)
+        except Exception:
+            pass
+
+    def open(self, relative_path: str, mode: str = "rb") -> IO[bytes]:
+        return open(self._unc(relative_path), mode)
+
+    def list_dir(self, relative_dir: str = "") -> List[str]:
+        return sorted(os.listdir(self._unc(relative_dir)))
+
+    def stat(self, relative_path: str) -> FileStat:
+        st = os.stat(self._unc(relative_path))
+        return FileStat(size=st.st_size, mtime=st.st_mtime, is_dir=stat_mod.S_ISDIR(st.st_mode))
+
+    def exists(self, relative_path: str) -> bool:
+        return os.path.exists(self._unc(relative_path))
+
+    def makedirs(self, relative_dir: str) -> None:
+        os.makedirs(self._unc(relative_dir), exist_ok=True)
+
+    def rename(self, src_relative_path: str, dst_relative_path: str) -> None:
+        os.replace(self._unc(src_relative_path), self._unc(dst_relative_path))
+
+    def remove(self, relative_path: str) -> None:
+        os.remove(self._unc(relative_path))
+
+    # CopyFile2 lets the Windows SMB client offload same-share copies to the server
+    # (FSCTL_SRV_COPYCHUNK) and, with cfg.compression, request SMB 3.1.1 compression
+    # for uploads/downloads (Windows 11 / Server 2022 and later).
+    def copy(self, src_relative_path: str, dst_relative_path: str) -> None:
+        _copy_file2(self._unc(src_relative_path), self._unc(dst_relative_path), self.cfg.compression)
+
+    def upload_file(self, local_path: str, relative_path: str) -> None:
+        _copy_file2(os.path.abspath(local_path), self._unc(relative_path), self.cfg.compression)
+
+    def download_file(self, relative_path: str, local_path: str) -> None:
+        _copy_file2(self._unc(relative_path), os.path.abspath(local_path), self.cfg.compression)
+
+
+_COPY_FILE_REQUEST_COMPRESSED_TRAFFIC = 0x10000000
+# ERROR_ALREADY_ASSIGNED, ERROR_SESSION_CREDENTIAL_CONFLICT
+_WIN_ALREADY_CONNECTED = (85, 1219)
+
+
+def _copy_file2(src: str, dst: str, compressed: bool) -> None:
+    import ctypes
+    from ctypes import wintypes
+
+    class _CopyFile2ExtendedParameters(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("dwCopyFlags", wintypes.DWORD),
+            ("pfCancel", ctypes.POINTER(wintypes.BOOL)),
+            ("pProgressRoutine", ctypes.c_void_p),
+            ("pvCallbackContext", ctypes.c_void_p),
+        ]
+
+    copy_file2 = getattr(ctypes.windll.kernel32, "CopyFile2", None)  # type: ignore[attr-defined]
+    if copy_file2 is None:
+        # Pre-Windows 8: no CopyFile2, plain copy
+        shutil.copyfile(src, dst)
+        return
+    copy_file2.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.POINTER(_CopyFile2ExtendedParameters)]
+    copy_file2.restype = ctypes.HRESULT  # raises OSError on failure
+    params = _CopyFile2ExtendedParameters()
+    params.dwSize = ctypes.sizeof(params)
+    params.dwCopyFlags = _COPY_FILE_REQUEST_COMPRESSED_TRAFFIC if compressed else 0
+    copy_file2(src, dst, ctypes.byref(params))
+
+
+# -----------------------------
+# Cross-platform (smbprotocol)
+# -----------------------------
+class SmbProtocolBackend(ShareBackend):
+    """smbprotocol's high-level smbclient API (SMB 2/3)."""
+
+    name = "smbprotocol"
+
+    def __init__(self, cfg: SkillConfig):
+        self.cfg = cfg
+        # smbclient's default connection cache is process-global; a private one means closing
+        # this backend cannot drop the session other clients of the same server are using
+        self._connections: Dict[str, Any] = {}
+
+    def _url(self, rel: str = "") -> str:
+        rel = _join_base(self.cfg.base_path, rel)
+        # smbclient uses OS-style separators; we'll normalize to '/'
+        rel = rel.replace("\\", "/")
+        return f"//{self.cfg.server}/{self.cfg.share}/" + rel if rel else f"//{self.cfg.server}/{self.cfg.share}"
+
+    def connect(self) -> None:
+        import smbclient  # type: ignore
+        if self.cfg.compression:
+            logger.warning(
+                "smbprotocol does not implement SMB 3.1.1 compression; transfers to %s are uncompressed",
+                self.cfg.server,
+            )
+        user = f"{self.cfg.domain}\\{self.cfg.username}" if self.cfg.domain else self.cfg.username
+        smbclient.register_session(
+            self.cfg.server, username=user, password=self.cfg.password, connection_cache=self._connections
+        )
+
+    def close(self) -> None:
+        import smbclient  # type: ignore
+        try:
+            smbclient.reset_connection_cache(fail_on_error=False, connection_cache=self._connections)
+        except Exception:
+            pass
+
+    def open(self, relative_path: str, mode: str = "rb") -> IO[bytes]:
+        import smbclient  # type: ignore
+        return smbclient.open_file(self._url(relative_path), mode=mode, connection_cache=self._connections)
+
+    def list_dir(self, relative_dir: str = "") -> List[str]:
+        import smbclient  # type: ignore
+        return sorted(list(smbclient.listdir(self._url(relative_dir), connection_cache=self._connections)))
+
+    def stat(self, relative_path: str) -> FileStat:
+        import smbclient  # type: ignore
+        st = smbclient.stat(self._url(relative_path), connection_cache=self._connections)
+        return FileStat(size=st.st_size, mtime=st.st_mtime, is_dir=stat_mod.S_ISDIR(st.st_mode))
+
+    def exists(self, relative_path: str) -> bool:
+        import smbclient  # type: ignore
+        try:
+            return smbclient.path.exists(self._url(relative_path), connection_cache=self._connections)
+        except Exception:
+            return False
+
+    def makedirs(self, relative_dir: str) -> None:
+        import smbclient  # type: ignore
+        if not _join_base(self.cfg.base_path, relative_dir):
+            # The share root always exists (and makedirs on it fails)
+            return
+        smbclient.makedirs(self._url(relative_dir), exist_ok=True, connection_cache=self._connections)
+
+    def rename(self, src_relative_path: str, dst_relative_path: str) -> None:
+        import smbclient  # type: ignore
+        smbclient.replace(
+            self._url(src_relative_path), self._url(dst_relative_path), connection_cache=self._connections
+        )
+
+    def remove(self, relative_path: str) -> None:
+        import smbclient  # type: ignore
+        smbclient.remove(self._url(relative_path), connection_cache=self._connections)
+
+    def copy(self, src_relative_path: str, dst_relative_path: str) -> None:
+        # smbclient.copyfile is a server-side copy (FSCTL_SRV_COPYCHUNK_WRITE):
+        # no file data crosses the network.
+        import smbclient  # type: ignore
+        from smbprotocol.exceptions import SMBResponseException
+        try:
+            smbclient.copyfile(
+                self._url(src_relative_path), self._url(dst_relative_path), connection_cache=self._connections
+            )
+        except (OSError, ValueError, SMBResponseException) as e:
+            # ValueError: source and destination are on different servers
+            if getattr(e, "errno", None) in (errno.ENOENT, errno.EACCES, errno.EISDIR):
+                raise
+            logger.info("Server-side copy of %s rejected (%s); streaming it instead", src_relative_path, e)
+            super().copy(src_relative_path, dst_relative_path)
+
+
+# -----------------------------------------
+# Stand-ins for tests and benchmarks
+# -----------------------------------------
+class LocalBackend(ShareBackend):
+    """A plain local folder standing in for the share."""
+
+    name = "local"
+
+    def __init__(self, root: str, base_path: str = ""):
+        if not root:
+            raise ValueError("The local backend requires a root folder (cfg.local_root)")
+        self.root = root
+        self.base_path = base_path
+
+    def _path(self, rel: str = "") -> str:
+        rel = _join_base(self.base_path, rel)
+        return os.path.join(self.root, *rel.split("/")) if rel else self.root
+
+    def open(self, relative_path: str, mode: str = "rb") -> IO[bytes]:
+        return open(self._path(relative_path), mode)
+
+    def list_dir(self, relative_dir: str = "") -> List[str]:
+        return sorted(os.listdir(self._path(relative_dir)))
+
+    def stat(self, relative_path: str) -> FileStat:
+        st = os.stat(self._path(relative_path))
+        return FileStat(size=st.st_size, mtime=st.st_mtime, is_dir=stat_mod.S_ISDIR(st.st_mode))
+
+    def makedirs(self, relative_dir: str) -> None:
+        os.makedirs(self._path(relative_dir), exist_ok=True)
+
+    def rename(self, src_relative_path: str, dst_relative_path: str) -> None:
+        os.replace(self._path(src_relative_path), self._path(dst_relative_path))
+
+    def remove(self, relative_path: str) -> None:
+        os.remove(self._path(relative_path))
+
+    def copy(self, src_relative_path: str, dst_relative_path: str) -> None:
+        shutil.copyfile(self._path(src_relative_path), self._path(dst_relative_path))
+
+
+class _MemoryFile(io.BytesIO):
+    def __init__(self, on_close: Optional[Callable[[bytes], None]] = None, initial: bytes = b""):
+        super().__init__(initial)
+        self._on_close = on_close
+
+    def close(self) -> None:
+        if not self.closed and self._on_close is not None:
+            self._on_close(self.getvalue())
+        super().close()
+
+
+class MemoryBackend(ShareBackend):
+    """An in-process dict standing in for the share; thread-safe, and mimics filesystem errors."""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._files: Dict[str, bytes] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._dirs: Set[str] = {""}
+
+    def _require_dir(self, rel: str) -> None:
+        if rel not in self._dirs:
+            raise FileNotFoundError(errno.ENOENT, "No such directory", rel)
+
+    def _store(self, rel: str, data: bytes) -> None:
+        with self._lock:
+            self._require_dir(_parent(rel))
+            self._files[rel] = data
+            self._mtimes[rel] = time.time()
+
+    def open(self, relative_path: str, mode: str = "rb") -> IO[bytes]:
+        rel = _norm_rel(relative_path)
+        with self._lock:
+            if mode == "rb":
+                if rel not in self._files:
+                    raise FileNotFoundError(errno.ENOENT, "No such file", rel)
+                return _MemoryFile(initial=self._files[rel])
+            if mode not in ("wb", "ab"):
+                raise ValueError(f"Unsupported mode for the memory backend: {mode}")
+            self._require_dir(_parent(rel))
+            if rel in self._dirs:
+                raise IsADirectoryError(errno.EISDIR, "Is a directory", rel)
+            initial = self._files.get(rel, b"") if mode == "ab" else b""
+        fd = _MemoryFile(lambda data: self._store(rel, data), initial)
+        fd.seek(0, io.SEEK_END)
+        return fd
+
+    def list_dir(self, relative_dir: str = "") -> List[str]:
+        rel = _norm_rel(relative_dir)
+        with self._lock:
+            self._require_dir(rel)
+            names = {p for p in list(self._files) + list(self._dirs) if p and _parent(p) == rel}
+        return sorted(pathlib.PurePosixPath(p).name for p in names)
+
+    def stat(self, relative_path: str) -> FileStat:
+        rel = _norm_rel(relative_path)
+        with self._lock:
+            if rel in self._dirs:
+                return FileStat(size=0, mtime=0.0, is_dir=True)
+            if rel in self._files:
+                return FileStat(size=len(self._files[rel]), mtime=self._mtimes[rel], is_dir=False)
+        raise FileNotFoundError(errno.ENOENT, "No such file or directory", rel)
+
+    def makedirs(self, relative_dir: str) -> None:
+        rel = _norm_rel(relative_dir)
+        with self._lock:
+            while rel not in self._dirs:
+                if rel in self._files:
+                    raise FileExistsError(errno.EEXIST, "File exists", rel)
+                self._dirs.add(rel)
+                rel = _parent(rel)
+
+    def rename(self, src_relative_path: str, dst_relative_path: str) -> None:
+        src, dst = _norm_rel(src_relative_path), _norm_rel(dst_relative_path)
+        with self._lock:
+            if src not in self._files:
+                raise FileNotFoundError(errno.ENOENT, "No such file", src)
+            self._require_dir(_parent(dst))
+            self._files[dst] = self._files.pop(src)
+            self._mtimes[dst] = self._mtimes.pop(src)
+
+    def remove(self, relative_path: str) -> None:
+        rel = _norm_rel(relative_path)
+        with self._lock:
+            if rel not in self._files:
+                raise FileNotFoundError(errno.ENOENT, "No such file", rel)
+            del self._files[rel]
+            del self._mtimes[rel]
+
+    def copy(self, src_relative_path: str, dst_relative_path: str) -> None:
+        src, dst = _norm_rel(src_relative_path), _norm_rel(dst_relative_path)
+        with self._lock:
+            if src not in self._files:
+                raise FileNotFoundError(errno.ENOENT, "No such file", src)
+            self._require_dir(_parent(dst))
+            self._files[dst] = self._files[src]
+            self._mtimes[dst] = time.time()
+
+    def rmtree(self, relative_dir: str) -> None:
+        """Remove a folder and everything below it (handy for simulating external deletes)."""
+        rel = _norm_rel(relative_dir)
+        prefix = rel + "/"
+        with self._lock:
+            for path in [p for p in self._files if p.startswith(prefix)]:
+                del self._files[path]
+                del self._mtimes[path]
+            self._dirs = {d for d in self._dirs if d != rel and not d.startswith(prefix)}
+
+
+# -----------------------
+# Wrapper layer
+# -----------------------
+class BackendWrapper(ShareBackend):
+    """Delegates every operation to ``inner``; subclasses override what they add behaviour to."""
+
+    def __init__(self, inner: ShareBackend):
+        self.inner = inner
+
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return self.inner.name
+
+    def connect(self) -> None:
+        self.inner.connect()
+
+    def close(self) -> None:
+        self.inner.close()
+
+    def open(self, relative_path: str, mode: str = "rb") -> IO[bytes]:
+        return self.inner.open(relative_path, mode)
+
+    def list_dir(self, relative_dir: str = "") -> List[str]:
+        return self.inner.list_dir(relative_dir)
+
+    def stat(self, relative_path: str) -> FileStat:
+        return self.inner.stat(relative_path)
+
+    def exists(self, relative_path: str) -> bool:
+        return self.inner.exists(relative_path)
+
+    def makedirs(self, relative_dir: str) -> None:
+        self.inner.makedirs(relative_dir)
+
+    def rename(self, src_relative_path: str, dst_relative_path: str) -> None:
+        self.inner.rename(src_relative_path, dst_relative_path)
+
+    def remove(self, relative_path: str) -> None:
+        self.inner.remove(relative_path)
+
+    def read_bytes(self, relative_path: str) -> bytes:
+        return self.inner.read_bytes(relative_path)
+
+    def write_bytes(self, relative_path: str, data: bytes) -> None:
+        self.inner.write_bytes(relative_path, data)
+
+    def iter_bytes(self, relative_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        return self.inner.iter_bytes(relative_path, chunk_size)
+
+    def write_stream(self, relative_path: str, chunks: Iterable[bytes]) -> int:
+        return self.inner.write_stream(relative_path, chunks)
+
+    def copy(self, src_relative_path: str, dst_relative_path: str) -> None:
+        self.inner.copy(src_relative_path, dst_relative_path)
+
+    def upload_file(self, local_path: str, relative_path: str) -> None:
+        self.inner.upload_file(local_path, relative_path)
+
+    def download_file(self, relative_path: str, local_path: str) -> None:
+        self.inner.download_file(relative_path, local_path)
+
+
+class FolderMemoBackend(BackendWrapper):
+    """
+    Creates parent folders on write and remembers which folders exist, so bulk writes into the
+    same folders skip the makedirs round trip. If a remembered folder was deleted behind our
+    back, the write recreates it and retries once.
+    """
+
+    def __init__(self, inner: ShareBackend):
+        super().__init__(inner)
+        self._lock = threading.Lock()
+        self._known: Set[str] = set()
+
+    def forget(self) -> None:
+        with self._lock:
+            self._known.clear()
+
+    def _remember(self, rel: str) -> None:
+        rel = _norm_rel(rel)
+        with self._lock:
+            while rel not in self._known:
+                self._known.add(rel)
+                if not rel:
+                    break
+                rel = _parent(rel)
+
+    def _in_parent(self, relative_path: str, op: Callable[[], T], retryable: Callable[[], bool] = lambda: True) -> T:
+        parent = _parent(relative_path)
+        known = parent in self._known
+        if not known:
+            self.inner.makedirs(parent)
+            self._remember(parent)
+        try:
+            return op()
+        except OSError as e:
+            if not known or e.errno != errno.ENOENT or not retryable():
+                raise
+            with self._lock:
+                self._known.discard(parent)
+            self.inner.makedirs(parent)
+            self._remember(parent)
+            return op()
+
+    def close(self) -> None:
+        self.forget()
+        super().close()
+
+    def open(self, relative_path: str, mode: str = "rb") -> IO[bytes]:
+        if "r" in mode:
+            return self.inner.open(relative_path, mode)
+        return self._in_parent(relative_path, lambda: self.inner.open(relative_path, mode))
+
+    def write_bytes(self, relative_path: str, data: bytes) -> None:
+        self._in_parent(relative_path, lambda: self.inner.write_bytes(relative_path, data))
+
+    def write_stream(self, relative_path: str, chunks: Iterable[bytes]) -> int:
+        # A stream cannot be replayed, so a missing folder is only retried before the first chunk
+        source = iter(chunks)
+        started = False
+
+        def tracked() -> Iterator[bytes]:
+            nonlocal started
+            for chunk in source:
+                started = True
+                yield chunk
+
+        return self._in_parent(
+            relative_path, lambda: self.inner.write_stream(relative_path, tracked()), retryable=lambda: not started
+        )
+
+    def makedirs(self, relative_dir: str) -> None:
+        self.inner.makedirs(relative_dir)
+        self._remember(relative_dir)
+
+    def rename(self, src_relative_path: str, dst_relative_path: str) -> None:
+        self._in_parent(dst_relative_path, lambda: self.inner.rename(src_relative_path, dst_relative_path))
+
+    def copy(self, src_relative_path: str, dst_relative_path: str) -> None:
+        self._in_parent(dst_relative_path, lambda: self.inner.copy(src_relative_path, dst_relative_path))
+
+    def upload_file(self, local_path: str, relative_path: str) -> None:
+        self._in_parent(relative_path, lambda: self.inner.upload_file(local_path, relative_path))
+
+
+class InstrumentedBackend(BackendWrapper):
+    """
+    Records timings and byte counts in a TransferStats: whole operations (``read_bytes``,
+    ``write_bytes``, ``list_dir``, ...) and the phases inside them (``session``, ``open``,
+    ``read``, ``write``).
+    """
+
+    def __init__(self, inner: ShareBackend, stats: TransferStats):
+        super().__init__(inner)
+        self.stats = stats
+
+    def connect(self) -> None:
+        with self.stats.time("session"):
+            self.inner.connect()
+
+    def open(self, relative_path: str, mode: str = "rb") -> IO[bytes]:
+        with self.stats.time("open", relative_path):
+            return self.inner.open(relative_path, mode)
+
+    def list_dir(self, relative_dir: str = "") -> List[str]:
+        with self.stats.time("list_dir", relative_dir):
+            return self.inner.list_dir(relative_dir)
+
+    def stat(self, relative_path: str) -> FileStat:
+        with self.stats.time("stat", relative_path):
+            return self.inner.stat(relative_path)
+
+    def exists(self, relative_path: str) -> bool:
+        with self.stats.time("exists", relative_path):
+            return self.inner.exists(relative_path)
+
+    def makedirs(self, relative_dir: str) -> None:
+        with self.stats.time("makedirs", relative_dir):
+            self.inner.makedirs(relative_dir)
+
+    def rename(self, src_relative_path: str, dst_relative_path: str) -> None:
+        with self.stats.time("rename", src_relative_path):
+            self.inner.rename(src_relative_path, dst_relative_path)
+
+    def remove(self, relative_path: str) -> None:
+        with self.stats.time("remove", relative_path):
+            self.inner.remove(relative_path)
+
+    def copy(self, src_relative_path: str, dst_relative_path: str) -> None:
+        with self.stats.time("copy", src_relative_path):
+            self.inner.copy(src_relative_path, dst_relative_path)
+
+    def upload_file(self, local_path: str, relative_path: str) -> None:
+        with self.stats.time("upload", relative_path) as t:
+            self.inner.upload_file(local_path, relative_path)
+            t.bytes = os.path.getsize(local_path)
+
+    def download_file(self, relative_path: str, local_path: str) -> None:
+        with self.stats.time("download", relative_path) as t:
+            self.inner.download_file(relative_path, local_path)
+            t.bytes = os.path.getsize(local_path)
+
+    # When the inner backend uses the default open-based implementations, whole-file
+    # operations are composed here from open + read/write so the phases show up.
+    # Overridden implementations (e.g. a caching wrapper) are delegated to as a whole.
+    def _composable(self, method: str) -> bool:
+        return getattr(type(self.inner), method) is getattr(ShareBackend, method)
+
+    def read_bytes(self, relative_path: str) -> bytes:
+        with self.stats.time("read_bytes", relative_path) as op:
+            if not self._composable("read_bytes"):
+                data = self.inner.read_bytes(relative_path)
+                op.bytes = len(data)
+                return data
+            with self.open(relative_path, "rb") as fd:
+                with self.stats.time("read", relative_path) as t:
+                    data = fd.read()
+                    t.bytes = op.bytes = len(data)
+        return data
+
+    def write_bytes(self, relative_path: str, data: bytes) -> None:
+        with self.stats.time("write_bytes", relative_path) as op:
+            op.bytes = len(data)
+            if not self._composable("write_bytes"):
+                self.inner.write_bytes(relative_path, data)
+                return
+            with self.open(relative_path, "wb") as fd:
+                with self.stats.time("write", relative_path) as t:
+                    fd.write(data)
+                    t.bytes = len(data)
+
+    def iter_bytes(self, relative_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        if not self._composable("iter_bytes"):
+            for chunk in self.inner.iter_bytes(relative_path, chunk_size):
+                self.stats.record("read", 0.0, len(chunk))
+                yield chunk
+            return
+        with self.open(relative_path, "rb") as fd:
+            while True:
+                with self.stats.time("read", relative_path) as t:
+                    chunk = fd.read(chunk_size)
+                    t.bytes = len(chunk)
+                if not chunk:
+                    break
+                yield chunk
+
+    def write_stream(self, relative_path: str, chunks: Iterable[bytes]) -> int:
+        if not self._composable("write_stream"):
+            with self.stats.time("write", relative_path) as t:
+                t.bytes = self.inner.write_stream(relative_path, chunks)
+            return t.bytes
+        written = 0
+        with self.open(relative_path, "wb") as fd:
+            for chunk in chunks:
+                with self.stats.time("write", relative_path) as t:
+                    fd.write(chunk)
+                    t.bytes = len(chunk)
+                written += len(chunk)
+        return written
+
+
+BACKENDS = ("win32", "smbprotocol", "local", "memory")
+
+
+def create_backend(cfg: SkillConfig) -> ShareBackend:
+    """Build the raw backend named by ``cfg.backend`` ("auto" picks win32 on Windows, else smbprotocol)."""
+    name = cfg.backend
+    if name == "auto":
+        name = "win32" if os.name == "nt" else "smbprotocol"
+    if name == "win32":
+        return Win32Backend(cfg)
+    if name == "smbprotocol":
+        return SmbProtocolBackend(cfg)
+    if name == "local":
+        return LocalBackend(cfg.local_root, cfg.base_path)
+    if name == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Unknown backend: {cfg.backend}. Expected 'auto' or one of: {', '.join(BACKENDS)}")
@@ -8,6 +8,13 @@ def _getenv(name: str, default: Optional[str] = None) -> Optional[str]:
     return v if v is None or v.strip() != "" else default
 
 
+def _getbool(name: str, default: bool = False) -> bool:
+    v = _getenv(name)
+    if v is None:
+        return default
+    return v.strip().lower() in ("1", "true", "yes", "on")
+
+
 @dataclass
 class SkillConfig:
     domain: Optional[str]
@@ -17,6 +24,14 @@ class SkillConfig:
     share: str
     base_path: str = ""
     encoding: str = "utf-8"
+    atomic_writes: bool = False
+    # "auto" picks win32 on Windows, smbprotocol elsewhere; "local" uses local_root as the share,
+    # "memory" keeps files in-process (see skill.backends)
+    backend: str = "auto"
+    local_root: str = ""
+    trace: bool = False
+    # Request SMB 3.1.1 compression (win32 backend, Windows 11 / Server 2022+)
+    compression: bool = False
 
     @classmethod
     def from_env(cls) -> "SkillConfig":
@@ -40,4 +55,9 @@ class SkillConfig:
             share=share,
             base_path=_getenv("WSK_BASE_PATH", "") or "",
             encoding=_getenv("WSK_ENCODING", "utf-8") or "utf-8",
+            atomic_writes=_getbool("WSK_ATOMIC_WRITES"),
+            backend=_getenv("WSK_BACKEND", "auto") or "auto",
+            local_root=_getenv("WSK_LOCAL_ROOT", "") or "",
+            trace=_getbool("WSK_TRACE"),
+            compression=_getbool("WSK_COMPRESSION"),
         )
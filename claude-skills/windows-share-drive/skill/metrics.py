@@ -0,0 +1,100 @@
+import contextlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+trace_logger = logging.getLogger("skill.trace")
+
+
+@dataclass
+class OpStats:
+    count: int = 0
+    errors: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return (self.seconds / self.count * 1000.0) if self.count else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return (self.bytes / self.seconds / (1024 * 1024)) if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 6),
+            "avg_ms": round(self.avg_ms, 3),
+            "max_ms": round(self.max_seconds * 1000.0, 3),
+            "mb_per_s": round(self.mb_per_s, 3),
+        }
+
+
+class _Timer:
+    __slots__ = ("bytes",)
+
+    def __init__(self) -> None:
+        self.bytes = 0
+
+
+class TransferStats:
+    """
+    Thread-safe timing and byte counters for share operations.
+
+    Counters are keyed by name: public operations (``read_bytes``, ``write_bytes``, ...) and
+    the phases inside them (``session`` setup, ``open``, ``read``, ``write``), so you can
+    tell where the time goes. With ``trace=True`` every timed call is also logged to the
+    ``skill.trace`` logger at DEBUG level.
+    """
+
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self._lock = threading.Lock()
+        self._ops: Dict[str, OpStats] = {}
+
+    @contextlib.contextmanager
+    def time(self, name: str, target: str = "") -> Iterator[_Timer]:
+        timer = _Timer()
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield timer
+            ok = True
+        finally:
+            elapsed = time.perf_counter() - start
+            self.record(name, elapsed, timer.bytes, ok)
+            if self.trace:
+                trace_logger.debug(
+                    "%s %s bytes=%d %.3fms%s", name, target, timer.bytes, elapsed * 1000.0, "" if ok else " FAILED"
+                )
+
+    def record(self, name: str, seconds: float, nbytes: int = 0, ok: bool = True) -> None:
+        with self._lock:
+            op = self._ops.get(name)
+            if op is None:
+                op = self._ops[name] = OpStats()
+            op.count += 1
+            op.bytes += nbytes
+            op.seconds += seconds
+            op.max_seconds = max(op.max_seconds, seconds)
+            if not ok:
+                op.errors += 1
+
+    def get(self, name: str) -> Optional[OpStats]:
+        with self._lock:
+            op = self._ops.get(name)
+            return OpStats(**vars(op)) if op else None
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: op.as_dict() for name, op in sorted(self._ops.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._ops.clear()
@@ -1,44 +1,55 @@
-import os
-import sys
-import io
+import contextlib
+import errno
 import pathlib
-from typing import List, Optional, Tuple
-
+import threading
+import uuid
+from typing import IO, Iterable, Iterator, List, Optional
+
+from .backends import (
+    DEFAULT_CHUNK_SIZE,
+    FileStat,
+    FolderMemoBackend,
+    InstrumentedBackend,
+    ShareBackend,
+    _norm_rel,
+    create_backend,
+)
 from .config import SkillConfig
+from .metrics import TransferStats
 
 
-def _norm_rel(path: str) -> str:
-    p = pathlib.PurePosixPath(str(path).replace("\\", "/"))
-    return str(p).lstrip("/")
-
-
-def _join_base(base: str, rel: str) -> str:
-    rel = _norm_rel(rel)
-    return f"{base}/{rel}" if base else rel
+def _temp_sibling(rel: str) -> str:
+    p = pathlib.PurePosixPath(_norm_rel(rel))
+    return str(p.with_name(f".{p.name}.{uuid.uuid4().hex[:12]}.tmp"))
 
 
 class WindowsShareClient:
     """
     A simple client that supports reading/writing files on a Windows shared drive using a service account.
 
-    Backends:
+    Backends (see ``skill.backends``):
     - Windows (nt): pywin32 + native file I/O after establishing a UNC connection
     - Cross-platform: smbprotocol.smbclient
+    - Local / memory: stand-ins for the share, for tests and benchmarks
+
+    The raw backend is wrapped once in a folder memo and an instrumentation layer; per-operation
+    timings and byte counts are collected in ``client.stats``.
     """
 
-    def __init__(self, cfg: SkillConfig):
+    def __init__(self, cfg: SkillConfig, backend: Optional[ShareBackend] = None):
         self.cfg = cfg
-        self._backend = self._detect_backend()
+        self.backend = backend or create_backend(cfg)
+        self.stats = TransferStats(trace=cfg.trace)
+        self._folders = FolderMemoBackend(InstrumentedBackend(self.backend, self.stats))
+        self._ops: ShareBackend = self._folders
+        # One session per client (i.e. per share), shared by all calls and threads
+        self._session_lock = threading.Lock()
+        self._connected = False
 
     @classmethod
     def from_env(cls) -> "WindowsShareClient":
         return cls(SkillConfig.from_env())
 
-    def _detect_backend(self) -> str:
-        if os.name == "nt":
-            return "win32"
-        return "smbprotocol"
-
     # Public API
     def write_text(self, relative_path: str, text: str) -> None:
         data = text.encode(self.cfg.encoding)
@@ -48,156 +59,133 @@ class WindowsShareClient:
         data = self.read_bytes(relative_path)
         return data.decode(self.cfg.encoding)
 
-    def write_bytes(self, relative_path: str, data: bytes) -> None:
-        if self._backend == "win32":
-            self._win32_write_bytes(relative_path, data)
-        else:
-            self._smb_write_bytes(relative_path, data)
+    def write_bytes(self, relative_path: str, data: bytes, atomic: Optional[bool] = None) -> None:
+        """
+        Write bytes to a file, creating parent folders as needed.
+
+        With ``atomic=True`` (default: ``cfg.atomic_writes``) the data is written to a temp
+        file in the same folder and renamed over the target, so readers never see a partial file.
+        """
+        self._ensure_connected()
+        with self._write_target(relative_path, atomic) as target:
+            self._ops.write_bytes(target, data)
 
     def read_bytes(self, relative_path: str) -> bytes:
-        if self._backend == "win32":
-            return self._win32_read_bytes(relative_path)
-        else:
-            return self._smb_read_bytes(relative_path)
+        self._ensure_connected()
+        return self._ops.read_bytes(relative_path)
 
     def list_dir(self, relative_dir: str = "") -> List[str]:
-        if self._backend == "win32":
-            return self._win32_list_dir(relative_dir)
-        else:
-            return self._smb_list_dir(relative_dir)
+        self._ensure_connected()
+        return self._ops.list_dir(relative_dir)
 
     def exists(self, relative_path: str) -> bool:
-        if self._backend == "win32":
-            return self._win32_exists(relative_path)
-        else:
-            return self._smb_exists(relative_path)
+        self._ensure_connected()
+        return self._ops.exists(relative_path)
+
+    def stat(self, relative_path: str) -> FileStat:
+        self._ensure_connected()
+        return self._ops.stat(relative_path)
 
     def makedirs(self, relative_dir: str) -> None:
-        if self._backend == "win32":
-            self._win32_makedirs(relative_dir)
-        else:
-            self._smb_makedirs(relative_dir)
-
-    # -----------------------
-    # Windows backend (pywin32)
-    # -----------------------
-    def _win32_unc(self, rel: str = "") -> str:
-        rel = _norm_rel(rel)
-        path = f"\\\\{self.cfg.server}\\{self.cfg.share}"
-        if self.cfg.base_path:
-            path += "\\" + self.cfg.base_path.replace("/", "\\")
-        if rel:
-            path += "\\" + rel.replace("/", "\\")
-        return path
-
-    def _win32_connect(self) -> None:
-        import win32wnet
-        import win32netcon
-        unc_root = self._win32_unc()
-        user = f"{self.cfg.domain}\\{self.cfg.username}" if self.cfg.domain else self.cfg.username
+        self._ensure_connected()
+        self._ops.makedirs(relative_dir)
+
+    def replace(self, src_relative_path: str, dst_relative_path: str) -> None:
+        """Rename a file, overwriting the destination if it exists."""
+        self._ensure_connected()
+        self._ops.rename(src_relative_path, dst_relative_path)
+
+    def remove(self, relative_path: str) -> None:
+        self._ensure_connected()
+        self._ops.remove(relative_path)
+
+    def copy(self, src_relative_path: str, dst_relative_path: str) -> None:
+        """
+        Copy a file within the share, overwriting the destination.
+
+        Uses a server-side copy where the backend supports it (no data crosses the
+        network) and falls back to streaming the bytes through this host.
+        """
+        self._ensure_connected()
+        self._ops.copy(src_relative_path, dst_relative_path)
+
+    def move(self, src_relative_path: str, dst_relative_path: str) -> None:
+        """Move a file within the share by renaming it; falls back to copy + remove."""
+        self._ensure_connected()
+        try:
+            self._ops.rename(src_relative_path, dst_relative_path)
+        except OSError as e:
+            if e.errno in (errno.ENOENT, errno.EACCES):
+                raise
+            self._ops.copy(src_relative_path, dst_relative_path)
+            self._ops.remove(src_relative_path)
+
+    def upload_file(self, local_path: str, relative_path: str) -> None:
+        """Copy a local file onto the share (compressed on the wire when ``cfg.compression`` is supported)."""
+        self._ensure_connected()
+        self._ops.upload_file(local_path, relative_path)
+
+    def download_file(self, relative_path: str, local_path: str) -> None:
+        """Copy a file from the share to a local path (compressed on the wire when supported)."""
+        self._ensure_connected()
+        self._ops.download_file(relative_path, local_path)
+
+    def open(self, relative_path: str, mode: str = "rb") -> IO[bytes]:
+        """Open a remote file in binary mode; parent folders are created for writes."""
+        if "b" not in mode:
+            raise ValueError("Only binary modes are supported; use read_text/write_text for text")
+        self._ensure_connected()
+        return self._ops.open(relative_path, mode)
+
+    def iter_bytes(self, relative_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the file content in chunks without loading it all into memory."""
+        self._ensure_connected()
+        return self._ops.iter_bytes(relative_path, chunk_size)
+
+    def write_stream(self, relative_path: str, chunks: Iterable[bytes], atomic: Optional[bool] = None) -> int:
+        """Write an iterable of byte chunks to a file. Returns the number of bytes written."""
+        self._ensure_connected()
+        with self._write_target(relative_path, atomic) as target:
+            return self._ops.write_stream(target, chunks)
+
+    def close(self) -> None:
+        """Drop the share session; the next call reconnects."""
+        with self._session_lock:
+            if self._connected:
+                self._ops.close()
+                self._connected = False
+            self._folders.forget()
+
+    def __enter__(self) -> "WindowsShareClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def forget_known_dirs(self) -> None:
+        """Drop the memo of existing folders (e.g. after folders were removed by someone else)."""
+        self._folders.forget()
+
+    def _ensure_connected(self) -> None:
+        if self._connected:
+            return
+        with self._session_lock:
+            if not self._connected:
+                self._ops.connect()
+                self._connected = True
+
+    @contextlib.contextmanager
+    def _write_target(self, relative_path: str, atomic: Optional[bool]) -> Iterator[str]:
+        if not (self.cfg.atomic_writes if atomic is None else atomic):
+            yield relative_path
+            return
+        tmp = _temp_sibling(relative_path)
         try:
-            # First try to cancel any stale connection (ignore errors)
+            yield tmp
+            self._ops.rename(tmp, relative_path)
+        except BaseException:
             try:
-                win32wnet.WNetCancelConnection2(unc_root, 0, True)
+                self._ops.remove(tmp)
             except Exception:
                 pass
-            win32wnet.WNetAddConnection2(
-                win32netcon.RESOURCETYPE_DISK,
-                None,
-                unc_root,
-                None,
-                user,
-                self.cfg.password,
-                0,
-            )
-        except Exception as e:
-            raise RuntimeError(f"Failed to connect to {unc_root} as {user}: {e}")
-
-    def _win32_write_bytes(self, relative_path: str, data: bytes) -> None:
-        self._win32_connect()
-        full_path = self._win32_unc(relative_path)
-        dir_path = os.path.dirname(full_path)
-        os.makedirs(dir_path, exist_ok=True)
-        with open(full_path, "wb") as f:
-            f.write(data)
-
-    def _win32_read_bytes(self, relative_path: str) -> bytes:
-        self._win32_connect()
-        full_path = self._win32_unc(relative_path)
-        with open(full_path, "rb") as f:
-            return f.read()
-
-    def _win32_list_dir(self, relative_dir: str = "") -> List[str]:
-        self._win32_connect()
-        dir_path = self._win32_unc(relative_dir)
-        return sorted(os.listdir(dir_path))
-
-    def _win32_exists(self, relative_path: str) -> bool:
-        self._win32_connect()
-        return os.path.exists(self._win32_unc(relative_path))
-
-    def _win32_makedirs(self, relative_dir: str) -> None:
-        self._win32_connect()
-        os.makedirs(self._win32_unc(relative_dir), exist_ok=True)
-
-    # -----------------------------
-    # Cross-platform (smbprotocol)
-    # -----------------------------
-    def _smb_register(self) -> None:
-        from smbprotocol.connection import Connection
-        from smbprotocol.session import Session
-        from smbprotocol.tree import TreeConnect
-        from smbprotocol.open import Open
-        # Use high-level smbclient convenience APIs instead
-        import smbclient  # type: ignore
-
-        server = self.cfg.server
-        user = f"{self.cfg.domain}\\{self.cfg.username}" if self.cfg.domain else self.cfg.username
-        smbclient.register_session(server, username=user, password=self.cfg.password)
-
-    def _smb_url(self, rel: str = "") -> str:
-        rel = _join_base(self.cfg.base_path, rel)
-        # smbclient uses OS-style separators; we'll normalize to '/'
-        rel = rel.replace("\\", "/")
-        return f"//{self.cfg.server}/{self.cfg.share}/" + rel if rel else f"//{self.cfg.server}/{self.cfg.share}"
-
-    def _smb_write_bytes(self, relative_path: str, data: bytes) -> None:
-        import smbclient  # type: ignore
-        self._smb_register()
-        url = self._smb_url(relative_path)
-        parent = str(pathlib.PurePosixPath(url).parent)
-        try:
-            smbclient.makedirs(parent, exist_ok=True)
-        except Exception:
-            # If parent is share root, makedirs may fail; ignore
-            pass
-        with smbclient.open_file(url, mode="wb") as fd:
-            fd.write(data)
-
-    def _smb_read_bytes(self, relative_path: str) -> bytes:
-        import smbclient  # type: ignore
-        self._smb_register()
-        url = self._smb_url(relative_path)
-        with smbclient.open_file(url, mode="rb") as fd:
-            return fd.read()
-
-    def _smb_list_dir(self, relative_dir: str = "") -> List[str]:
-        import smbclient  # type: ignore
-        self._smb_register()
-        url = self._smb_url(relative_dir)
-        return sorted(list(smbclient.listdir(url)))
-
-    def _smb_exists(self, relative_path: str) -> bool:
-        import smbclient  # type: ignore
-        self._smb_register()
-        url = self._smb_url(relative_path)
-        try:
-            return smbclient.path.exists(url)
-        except Exception:
-            return False
-
-    def _smb_makedirs(self, relative_dir: str) -> None:
-        import smbclient  # type: ignore
-        self._smb_register()
-        url = self._smb_url(relative_dir)
-        smbclient.makedirs(url, exist_ok=True)
+            raise
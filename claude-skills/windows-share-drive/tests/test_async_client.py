@@ -0,0 +1,111 @@
+import asyncio
+import io
+import time
+
+import pytest
+
+from skill import AsyncWindowsShareClient, SkillConfig, WindowsShareClient
+
+
+class SlowShareClient(WindowsShareClient):
+    """Stands in for a real share: every call blocks its thread like an SMB round trip."""
+
+    def __init__(self, cfg, delay=0.02):
+        super().__init__(cfg)
+        self.delay = delay
+        self.files = {}
+        self.closed = False
+
+    def write_bytes(self, relative_path, data, atomic=None):
+        time.sleep(self.delay)
+        self.files[relative_path] = bytes(data)
+
+    def read_bytes(self, relative_path):
+        time.sleep(self.delay)
+        return self.files[relative_path]
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+    def open(self, relative_path, mode="rb"):
+        time.sleep(self.delay)
+        if "r" in mode:
+            return io.BytesIO(self.files[relative_path])
+        client = self
+
+        class _Writer(io.BytesIO):
+            def close(self):
+                client.files[relative_path] = self.getvalue()
+                super().close()
+
+        return _Writer()
+
+
+def _cfg():
+    return SkillConfig(domain=None, username="user", password="pass", server="server", share="share")
+
+
+def test_event_loop_stays_responsive_during_concurrent_transfers():
+    async def main():
+        client = AsyncWindowsShareClient(_cfg(), max_workers=8, client=SlowShareClient(_cfg()))
+        max_gap = 0.0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal max_gap
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                max_gap = max(max_gap, now - last)
+                last = now
+
+        async def transfer(i):
+            payload = f"file-{i}".encode()
+            await client.write_bytes(f"dir/{i}.bin", payload)
+            assert await client.read_bytes(f"dir/{i}.bin") == payload
+
+        tick = asyncio.ensure_future(ticker())
+        await asyncio.gather(*(transfer(i) for i in range(100)))
+        done.set()
+        await tick
+        await client.aclose()
+        return max_gap
+
+    max_gap = asyncio.run(main())
+    # 200 blocking calls of 20ms each would stall the loop for ~4s if run inline
+    assert max_gap < 0.1
+
+
+def test_timeout_and_streaming():
+    async def main():
+        async with AsyncWindowsShareClient(_cfg(), client=SlowShareClient(_cfg(), delay=0.2)) as client:
+            with pytest.raises(asyncio.TimeoutError):
+                await client.write_bytes("slow.bin", b"x", timeout=0.01)
+            client.sync_client.delay = 0
+            written = await client.write_stream("big.bin", [b"ab", b"cd", b"e"])
+            chunks = [c async for c in client.iter_bytes("big.bin", chunk_size=2)]
+        return written, chunks
+
+    written, chunks = asyncio.run(main())
+    assert written == 5
+    assert chunks == [b"ab", b"cd", b"e"]
+
+
+def test_closing_drains_calls_and_closes_the_share_client():
+    async def main():
+        inner = SlowShareClient(_cfg(), delay=0.1)
+        async with AsyncWindowsShareClient(_cfg(), client=inner) as client:
+            pending = asyncio.ensure_future(client.write_bytes("late.bin", b"x"))
+            await asyncio.sleep(0.01)
+        # aclose waited for the in-flight write before closing the session
+        assert inner.files == {"late.bin": b"x"}
+        assert inner.closed
+        await pending
+
+    asyncio.run(main())
+
+    inner = SlowShareClient(_cfg())
+    AsyncWindowsShareClient(_cfg(), client=inner).close()
+    assert inner.closed
@@ -0,0 +1,46 @@
+import pytest
+
+from skill import MemoryBackend, SkillConfig, WindowsShareClient
+
+
+@pytest.fixture
+def client():
+    cfg = SkillConfig(domain=None, username="user", password="pass", server="server", share="share")
+    backend = MemoryBackend()
+    return WindowsShareClient(cfg, backend=backend), backend
+
+
+def test_bulk_writes_create_each_folder_once(client):
+    c, backend = client
+    for i in range(20):
+        c.write_bytes(f"reports/2024/{i}.txt", b"x")
+    c.write_bytes("reports/summary.txt", b"y")
+    assert c.stats.get("makedirs").count == 1
+    assert len(backend.list_dir("reports/2024")) == 20
+
+
+def test_stale_folder_memo_is_recreated(client):
+    c, backend = client
+    c.write_bytes("a/one.txt", b"1")
+    backend.rmtree("a")
+    c.write_bytes("a/two.txt", b"2")
+    assert backend.read_bytes("a/two.txt") == b"2"
+    assert c.stats.get("makedirs").count == 2
+
+
+def test_atomic_write_leaves_no_partial_file(client):
+    c, backend = client
+    c.write_bytes("out/data.bin", b"old")
+
+    def chunks():
+        yield b"new-"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        c.write_stream("out/data.bin", chunks(), atomic=True)
+    assert backend.list_dir("out") == ["data.bin"]
+    assert backend.read_bytes("out/data.bin") == b"old"
+
+    c.write_bytes("out/data.bin", b"new", atomic=True)
+    assert backend.list_dir("out") == ["data.bin"]
+    assert backend.read_bytes("out/data.bin") == b"new"
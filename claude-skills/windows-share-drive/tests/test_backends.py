@@ -0,0 +1,120 @@
+import sys
+import types
+
+import pytest
+
+from skill import (
+    BackendWrapper,
+    LocalBackend,
+    MemoryBackend,
+    SkillConfig,
+    SmbProtocolBackend,
+    Win32Backend,
+    WindowsShareClient,
+)
+
+
+@pytest.fixture(params=["local", "memory"])
+def backend(request, tmp_path):
+    if request.param == "local":
+        return LocalBackend(str(tmp_path))
+    return MemoryBackend()
+
+
+def test_backend_contract(backend):
+    backend.connect()
+    backend.makedirs("a/b")
+    backend.write_bytes("a/b/one.bin", b"hello")
+    assert backend.write_stream("a/two.bin", [b"wor", b"ld"]) == 5
+    assert backend.read_bytes("a/b/one.bin") == b"hello"
+    assert list(backend.iter_bytes("a/two.bin", chunk_size=2)) == [b"wo", b"rl", b"d"]
+    assert backend.list_dir("a") == ["b", "two.bin"]
+
+    st = backend.stat("a/b/one.bin")
+    assert (st.size, st.is_dir) == (5, False)
+    assert backend.stat("a/b").is_dir
+    assert backend.exists("a/two.bin") and not backend.exists("a/nope.bin")
+
+    backend.rename("a/two.bin", "a/b/one.bin")
+    assert backend.read_bytes("a/b/one.bin") == b"world"
+    backend.remove("a/b/one.bin")
+    assert backend.list_dir("a/b") == []
+    with pytest.raises(FileNotFoundError):
+        backend.read_bytes("a/b/one.bin")
+    with pytest.raises(FileNotFoundError):
+        backend.write_bytes("missing/x.bin", b"")
+
+
+def test_wrapper_layer_applies_to_every_backend():
+    class ReadCache(BackendWrapper):
+        def __init__(self, inner):
+            super().__init__(inner)
+            self.cache = {}
+
+        def read_bytes(self, relative_path):
+            if relative_path not in self.cache:
+                self.cache[relative_path] = self.inner.read_bytes(relative_path)
+            return self.cache[relative_path]
+
+    cfg = SkillConfig(domain=None, username="", password="", server="s", share="x", backend="memory")
+    inner = MemoryBackend()
+    client = WindowsShareClient(cfg, backend=ReadCache(inner))
+    client.write_text("notes/a.txt", "hi")
+    assert client.read_text("notes/a.txt") == "hi"
+    inner.remove("notes/a.txt")
+    assert client.read_text("notes/a.txt") == "hi"
+    assert client.stats.get("read_bytes").count == 2
+
+
+def test_closing_one_smbprotocol_backend_leaves_other_sessions_alone(monkeypatch):
+    calls = []
+    fake = types.ModuleType("smbclient")
+    fake.register_session = lambda server, connection_cache, **kw: connection_cache.setdefault(server, "session")
+
+    def reset_connection_cache(connection_cache, **kw):
+        calls.append(dict(connection_cache))
+        connection_cache.clear()
+
+    fake.reset_connection_cache = reset_connection_cache
+    fake.delete_session = lambda *a, **kw: calls.append("delete_session")
+    monkeypatch.setitem(sys.modules, "smbclient", fake)
+
+    cfg = SkillConfig(domain=None, username="u", password="p", server="srv", share="x")
+    first, second = SmbProtocolBackend(cfg), SmbProtocolBackend(cfg)
+    first.connect()
+    second.connect()
+    first.close()
+    assert calls == [{"srv": "session"}]
+    assert second._connections == {"srv": "session"}
+
+
+def test_win32_backend_only_cancels_the_connection_it_added(monkeypatch):
+    class WinError(Exception):
+        winerror = 1219
+
+    cancelled = []
+    wnet = types.ModuleType("win32wnet")
+    wnet.WNetCancelConnection2 = lambda unc, flags, force: cancelled.append((unc, force))
+    wnet.WNetAddConnection2 = lambda *args: None
+    monkeypatch.setitem(sys.modules, "win32wnet", wnet)
+    monkeypatch.setitem(sys.modules, "win32netcon", types.SimpleNamespace(RESOURCETYPE_DISK=1))
+
+    cfg = SkillConfig(domain=None, username="u", password="p", server="srv", share="x")
+    owner = Win32Backend(cfg)
+    owner.connect()
+    never_connected = Win32Backend(cfg)
+    never_connected.close()
+    assert cancelled == []  # connect no longer tears down an existing connection either
+    owner.close()
+    owner.close()
+    assert cancelled == [("\\\\srv\\x", False)]
+
+    def conflict(*args):
+        raise WinError("credential conflict")
+
+    wnet.WNetAddConnection2 = conflict
+    monkeypatch.setattr("os.path.isdir", lambda path: True)
+    shared = Win32Backend(cfg)
+    shared.connect()  # reuses the session's existing connection
+    shared.close()
+    assert len(cancelled) == 1
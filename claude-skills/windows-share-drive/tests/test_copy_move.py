@@ -0,0 +1,63 @@
+import errno
+
+import pytest
+
+from skill import LocalBackend, MemoryBackend, ShareBackend, SkillConfig, WindowsShareClient
+
+
+def _cfg(**kw):
+    return SkillConfig(domain=None, username="", password="", server="local", share="test", **kw)
+
+
+@pytest.fixture(params=["local", "memory"])
+def client(request, tmp_path):
+    backend = LocalBackend(str(tmp_path)) if request.param == "local" else MemoryBackend()
+    return WindowsShareClient(_cfg(), backend=backend)
+
+
+def test_copy_creates_parent_and_keeps_source(client):
+    client.write_bytes("src/a.bin", b"payload")
+    client.copy("src/a.bin", "dst/deep/a.bin")
+    assert client.read_bytes("dst/deep/a.bin") == b"payload"
+    assert client.read_bytes("src/a.bin") == b"payload"
+    assert client.stats.get("copy").count == 1
+
+
+def test_move_renames(client):
+    client.write_bytes("src/a.bin", b"payload")
+    client.move("src/a.bin", "dst/a.bin")
+    assert client.read_bytes("dst/a.bin") == b"payload"
+    assert not client.exists("src/a.bin")
+    with pytest.raises(FileNotFoundError):
+        client.move("src/a.bin", "dst/b.bin")
+
+
+def test_upload_and_download(client, tmp_path):
+    local = tmp_path / "upload.bin"
+    local.write_bytes(b"x" * 3000)
+    client.upload_file(str(local), "in/upload.bin")
+    client.download_file("in/upload.bin", str(tmp_path / "back.bin"))
+    assert (tmp_path / "back.bin").read_bytes() == b"x" * 3000
+    assert client.stats.get("upload").bytes == 3000
+
+
+class NoRenameBackend(MemoryBackend):
+    """Simulates a rename the server refuses (e.g. across volumes)."""
+
+    def rename(self, src_relative_path: str, dst_relative_path: str) -> None:
+        raise OSError(errno.EXDEV, "Cross-device rename", src_relative_path)
+
+
+def test_move_falls_back_to_copy_and_remove():
+    client = WindowsShareClient(_cfg(), backend=NoRenameBackend())
+    client.write_bytes("a.bin", b"data")
+    client.move("a.bin", "b/a.bin")
+    assert client.read_bytes("b/a.bin") == b"data"
+    assert not client.exists("a.bin")
+
+
+def test_default_copy_streams_through_backend():
+    backend = MemoryBackend()
+    backend.write_bytes("a.bin", b"0123456789")
+    ShareBackend.copy(backend, "a.bin", "b.bin")
+    assert backend.read_bytes("b.bin") == b"0123456789"
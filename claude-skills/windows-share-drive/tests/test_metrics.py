@@ -0,0 +1,47 @@
+import logging
+
+from skill import SkillConfig, WindowsShareClient
+
+
+def _client(tmp_path, trace=False):
+    cfg = SkillConfig(
+        domain=None, username="", password="", server="local", share="bench",
+        backend="local", local_root=str(tmp_path), trace=trace,
+    )
+    return WindowsShareClient(cfg)
+
+
+def test_operations_and_phases_are_counted(tmp_path):
+    c = _client(tmp_path)
+    c.write_bytes("a/b.bin", b"12345")
+    assert c.read_bytes("a/b.bin") == b"12345"
+    assert list(c.iter_bytes("a/b.bin", chunk_size=2)) == [b"12", b"34", b"5"]
+
+    snap = c.stats.snapshot()
+    assert snap["write_bytes"]["count"] == 1
+    assert snap["write_bytes"]["bytes"] == 5
+    assert snap["read_bytes"]["bytes"] == 5
+    assert snap["open"]["count"] == 3
+    assert snap["read"]["bytes"] == 10
+    c.stats.reset()
+    assert c.stats.snapshot() == {}
+
+
+def test_failed_operations_are_counted_and_traced(tmp_path, caplog):
+    c = _client(tmp_path, trace=True)
+    with caplog.at_level(logging.DEBUG, logger="skill.trace"):
+        try:
+            c.read_bytes("missing.bin")
+        except FileNotFoundError:
+            pass
+    assert c.stats.get("read_bytes").errors == 1
+    assert any("read_bytes missing.bin" in r.getMessage() and "FAILED" in r.getMessage() for r in caplog.records)
+
+
+def test_streamed_writes_reach_the_instrumented_layer(tmp_path):
+    c = _client(tmp_path)
+    c.write_stream("x/y/big.bin", iter([b"abc", b"defg"]))
+    assert (tmp_path / "x" / "y" / "big.bin").read_bytes() == b"abcdefg"
+    snap = c.stats.snapshot()
+    assert snap["write"]["bytes"] == 7
+    assert snap["write"]["count"] >= 1